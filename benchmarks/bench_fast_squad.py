@@ -0,0 +1,133 @@
+"""
+Benchmark del camino rápido de plantillas (`FastSquadExtractor`) frente al camino normal
+(parseo del HTML + `PlayerManager.get_player_data`).
+
+Por defecto usa páginas sintéticas de `bench_squad`; con `--archive` usa las plantillas
+guardadas en un `PageArchive` (URLs con "/kader/verein/"). Comprueba además que los dos
+caminos devuelven los mismos jugadores.
+
+Uso:
+    python -m benchmarks.bench_fast_squad [--rows 30 500] [--archive cache/archive] [--limit 200] [--repeat 3]
+"""
+import argparse
+import logging
+from time import perf_counter
+from typing import List
+from scraping.ws_archive import PageArchive
+from scraping.ws_document import ParsedDocument
+from scraping.ws_engine import ScrapingEngine
+from scraping.ws_entities import Team
+from scraping.ws_players import PlayerManager
+from benchmarks.bench_squad import squad_page
+
+
+def archived_squads(directory: str, limit: int) -> List[bytes]:
+    """
+    Lee las últimas descargas de las plantillas archivadas.
+
+    Args:
+        directory (str): Directorio del archivo.
+        limit (int): Número máximo de páginas.
+
+    Return:
+        list[bytes]: HTML de las plantillas.
+    """
+    with PageArchive(directory) as archive:
+        urls = [url for url in archive.urls() if "/kader/verein/" in url][:limit]
+        return [archive.get(url) for url in urls]
+
+
+def dom_players(player_manager: PlayerManager, content: bytes, team: Team) -> list:
+    """
+    Camino normal: parseo del HTML y `get_player_data`.
+    """
+    table = ParsedDocument.parse(content, targets=("items",)).table
+    if not table:
+        return []
+
+    return player_manager.get_player_data(table, min_columns=5, fk_region="bench", fk_league="bench", team=team)
+
+
+def fast_players(player_manager: PlayerManager, content: bytes, team: Team) -> list:
+    """
+    Camino rápido, con el camino normal si la página no es aplicable (igual que `TeamManager`).
+    """
+    players = player_manager.get_player_data_from_content(
+        content, min_columns=5, fk_region="bench", fk_league="bench", team=team
+    )
+    return dom_players(player_manager, content, team) if players is None else players
+
+
+def measure(pages: List[bytes], repeat: int) -> dict:
+    """
+    Mide el mejor tiempo de los dos caminos sobre todas las páginas.
+
+    Args:
+        pages (list[bytes]): HTML de las plantillas.
+        repeat (int): Número de repeticiones (se toma la mejor).
+
+    Return:
+        dict: Tiempos (segundos), si los resultados coinciden y contadores del camino rápido.
+    """
+    team = Team(
+        id_team="1", fk_region="bench", fk_league="bench", season=2024,
+        team_name="Bench", url_team="", stats=None
+    )
+    dom_manager = PlayerManager(ScrapingEngine(http_client=None), fast_squad=False)
+    fast_manager = PlayerManager(ScrapingEngine(http_client=None), fast_squad=True)
+
+    # Primera pasada fuera de la medición: verifica cada estructura y compara los resultados
+    equal = all(
+        dom_players(dom_manager, page, team) == fast_players(fast_manager, page, team)
+        for page in pages
+    )
+
+    results = {"equal": equal}
+    for name, manager, extract in (("dom", dom_manager, dom_players), ("fast", fast_manager, fast_players)):
+        best = float("inf")
+        for _ in range(repeat):
+            start = perf_counter()
+            for page in pages:
+                extract(manager, page, team)
+
+            best = min(best, perf_counter() - start)
+
+        results[name] = best
+
+    results["stats"] = fast_manager.fast_squad.stats()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del camino rápido de plantillas.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[30, 500], help="Filas de las páginas sintéticas.")
+    parser.add_argument("--archive", default=None, help="Directorio de un PageArchive con plantillas grabadas.")
+    parser.add_argument("--limit", type=int, default=200, help="Máximo de plantillas archivadas.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones (se toma la mejor).")
+    args = parser.parse_args()
+
+    # Los logs por jugador dominarían la medición
+    logging.disable(logging.CRITICAL)
+
+    if args.archive:
+        suites = [("archivo", archived_squads(args.archive, args.limit))]
+    else:
+        suites = [(f"{rows} filas", [squad_page(rows, seed).encode("utf-8") for seed in range(20)]) for rows in args.rows]
+
+    print(f"{'páginas':>16} {'dom (ms/pág)':>14} {'rápido (ms/pág)':>16} {'x':>6} {'iguales':>8}  contadores")
+    for name, pages in suites:
+        if not pages:
+            print(f"{name:>16} sin plantillas")
+            continue
+
+        results = measure(pages, args.repeat)
+        dom_ms = results["dom"] / len(pages) * 1000
+        fast_ms = results["fast"] / len(pages) * 1000
+        print(
+            f"{name:>16} {dom_ms:>14.2f} {fast_ms:>16.2f} {dom_ms / fast_ms:>6.1f} "
+            f"{str(results['equal']):>8}  {results['stats']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark del parser de plantillas (`PlayerManager.get_player_data`) sobre tablas sintéticas.
+
+Mide el tiempo de extracción (sin contar el parseo del HTML) con 50, 500 y 5.000 filas.
+Con una sola pasada por las filas el tiempo por fila debe mantenerse constante al crecer la tabla.
+
+Uso:
+    python -m benchmarks.bench_squad [--rows 50 500 5000] [--repeat 3] [--legacy]
+
+Con `--legacy` se mide además el coste de volver a recorrer la tabla completa en cada fila
+(el antiguo `get_player_img_info(table)` dentro del bucle), que crece de forma cuadrática.
+"""
+import argparse
+import logging
+import random
+from time import perf_counter
+from scraping.ws_document import ParsedDocument
+from scraping.ws_engine import ScrapingEngine
+from scraping.ws_entities import Team
+from scraping.ws_players import PlayerManager
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+POSITIONS = [("Goalkeeper", "Goalkeeper"), ("Defender", "Centre-Back"), ("midfield", "Central Midfield"), ("Striker", "Centre-Forward")]
+
+HEADER = (
+    "<th>#</th><th>Player</th><th>Date of birth/Age</th><th>Nat.</th><th>Height</th><th>Foot</th>"
+    "<th>Joined</th><th>Signed from</th><th>Contract</th><th>Market value</th>"
+)
+
+
+def squad_row(id_player: int, rng: random.Random) -> str:
+    """
+    Genera una fila de plantilla con la misma estructura que Transfermarkt.
+
+    Args:
+        id_player (int): ID del jugador.
+        rng (random.Random): Generador de números aleatorios.
+
+    Return:
+        str: HTML de la fila.
+    """
+    general, position = rng.choice(POSITIONS)
+    month = rng.choice(MONTHS)
+
+    return (
+        f'<tr class="odd"><td class="zentriert rueckennummer" title="{general}"><div class="rn_nummer">{id_player % 99}</div></td>'
+        f'<td class="posrela"><table class="inline-table"><tr><td rowspan="2">'
+        f'<img data-src="https://img.a.transfermarkt.technology/portrait/medium/{id_player}-1{id_player % 9}.jpg" class="bilderrahmen-fixed"/></td>'
+        f'<td class="hauptlink"><a href="/player/profil/spieler/{id_player}">Player {id_player}</a></td></tr>'
+        f'<tr><td>{position}</td></tr></table></td>'
+        f'<td class="zentriert">{month} {rng.randrange(1, 28)}, {rng.randrange(1985, 2006)} ({rng.randrange(18, 38)})</td>'
+        f'<td class="zentriert"><img src="https://tmssl.akamaized.net/images/flagge/verysmall/{id_player % 200}.png" class="flaggenrahmen"/></td>'
+        f'<td class="zentriert">{rng.choice(["1,88m", "1,75m", ""])}</td><td class="zentriert">{rng.choice(["right", "left", "both"])}</td>'
+        f'<td class="zentriert">{month} {rng.randrange(1, 28)}, 20{rng.randrange(10, 24)}</td>'
+        f'<td class="zentriert"><a href="/club/startseite/verein/{id_player % 50}"><img src="https://tmssl.akamaized.net/images/wappen/verysmall/{id_player % 50}.png"/></a></td>'
+        f'<td class="zentriert">Jun 30, 20{rng.randrange(25, 30)}</td>'
+        f'<td class="rechts hauptlink"><a href="/player/marktwertverlauf/spieler/{id_player}">{rng.choice(["€1.50m", "€800k", "€12.00m", "-"])}</a></td></tr>'
+    )
+
+
+def squad_page(rows: int, seed: int = 0) -> str:
+    """
+    Genera una página de plantilla sintética.
+
+    Args:
+        rows (int): Número de jugadores.
+        seed (int, opcional): Semilla del generador.
+
+    Return:
+        str: HTML de la página.
+    """
+    rng = random.Random(seed)
+    body = "".join(squad_row(index + 1, rng) for index in range(rows))
+    return f'<html><body><table class="items"><thead><tr>{HEADER}</tr></thead><tbody>{body}</tbody></table></body></html>'
+
+
+def measure(page: str, repeat: int, legacy: bool = False) -> float:
+    """
+    Devuelve el mejor tiempo (segundos) de extracción de la plantilla.
+
+    Args:
+        page (str): HTML de la página.
+        repeat (int): Número de repeticiones.
+        legacy (bool, opcional): Si se mide el recorrido completo de la tabla por cada fila.
+
+    Return:
+        float: Mejor tiempo de las repeticiones.
+    """
+    engine = ScrapingEngine(http_client=None)
+    player_manager = PlayerManager(engine)
+    team = Team(
+        id_team="1", fk_region="bench", fk_league="bench", season=2024,
+        team_name="Bench", url_team="", stats=None
+    )
+
+    best = float("inf")
+    for _ in range(repeat):
+        # El parseo queda fuera de la medición: solo interesa el recorrido de las filas
+        table = ParsedDocument.parse(page, targets=("items",)).table
+
+        start = perf_counter()
+        if legacy:
+            for _row in table.rows:
+                engine.get_player_img_info(table)
+
+        else:
+            player_manager.get_player_data(table, min_columns=5, fk_region="bench", fk_league="bench", team=team)
+
+        best = min(best, perf_counter() - start)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del parser de plantillas.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[50, 500, 5000], help="Tamaños de tabla a medir.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por tamaño (se toma la mejor).")
+    parser.add_argument("--legacy", action="store_true", help="Mide también el recorrido completo por fila.")
+    args = parser.parse_args()
+
+    # Los logs por jugador dominarían la medición
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'filas':>8} {'modo':>8} {'total (ms)':>12} {'por fila (µs)':>14}")
+    for rows in args.rows:
+        page = squad_page(rows)
+        modes = ("fused", "legacy") if args.legacy else ("fused",)
+
+        for mode in modes:
+            seconds = measure(page, args.repeat, legacy=mode == "legacy")
+            print(f"{rows:>8} {mode:>8} {seconds * 1000:>12.2f} {seconds / rows * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
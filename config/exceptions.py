@@ -33,4 +33,14 @@ class HTTPResponseError(HTTPClientError):
     def __init__(self, status_code, message = "Error en la respuesta HTTP"):
         self. status_code = status_code
         self.message = message
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+class HTTPCircuitOpenError(HTTPClientError):
+    """
+    Excepción cuando el circuito de un host está abierto y la solicitud se aparca para más tarde.
+    """
+    def __init__(self, host, retry_at, message = "Circuito abierto para el host"):
+        self.host = host
+        self.retry_at = retry_at
+        self.message = f"{message}: {host}"
+        super().__init__(self.message)
@@ -161,6 +161,9 @@ class WebScrapingMenu(BaseMenu):
             else:
                 self.invalid_option()
 
+        # Liberamos las conexiones del pool HTTP al salir del menú
+        self.http_client.close()
+
     def create_region_schemas(self):
         """
         Crea los schemas en la base de datos para las regiones seleccionadas.
@@ -0,0 +1,463 @@
+import os
+import re
+import mmap
+import zlib
+import struct
+import hashlib
+import threading
+from time import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List
+from scraping.ws_cache import ResponseCache
+from config.exceptions import logging
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+# Códecs de compresión de los cuerpos (se guarda el código en cada entrada del índice)
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODECS = {CODEC_ZLIB: "zlib", CODEC_ZSTD: "zstd"}
+
+# Entrada del índice de ancho fijo: clave de la URL (blake2b de 16 bytes), segmento, offset y
+# longitud del cuerpo comprimido, tamaño sin comprimir, fecha de descarga, offset de la URL en
+# el fichero de URLs, sha256 del contenido y códec.
+INDEX_RECORD = struct.Struct("<16sIQIIdQ32sB7x")
+INDEX_FILE = "index.bin"
+URLS_FILE = "urls.bin"
+SEGMENT_FILE = "segment-{:05d}.dat"
+
+# Cabecera de cada URL del fichero de URLs (longitud en bytes)
+URL_HEADER = struct.Struct("<H")
+
+# Bloques que no aportan nada a los parsers y se pueden descartar antes de archivar
+BOILERPLATE_PATTERN = re.compile(rb"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
+
+@dataclass
+class ArchiveEntry:
+    """
+    Entrada del índice del archivo: dónde está el cuerpo de una descarga y cómo leerlo.
+    """
+    url: str
+    fetched_at: float
+    sha256: str
+    segment: int
+    offset: int
+    length: int
+    size: int
+    codec: int
+
+
+class PageArchive:
+    """
+    Archivo append-only del HTML descargado, para volver a parsear las páginas sin repetir el crawl.
+    Los cuerpos se guardan comprimidos (zstd si está instalado, zlib si no) en ficheros de segmento,
+    y un índice binario de ancho fijo los localiza por URL, fecha de descarga y hash del contenido.
+    El índice, las URLs y los segmentos se leen con mmap, de modo que el acceso aleatorio no copia
+    los ficheros en memoria. Las páginas idénticas (mismo sha256) se guardan una sola vez.
+    """
+    def __init__(
+            self,
+            directory: str = None,
+            strip_boilerplate: bool = False,
+            level: int = 3,
+            max_segment_bytes: int = 256 * 1024 * 1024
+        ):
+        """
+        Inicializa el archivo, creando el directorio si no existe y cargando el índice.
+
+        Args:
+            directory (str, opcional): Directorio del archivo. Por defecto `cache/archive`.
+            strip_boilerplate (bool, opcional): Si se eliminan los bloques <script> y <style> antes de archivar.
+            level (int, opcional): Nivel de compresión.
+            max_segment_bytes (int, opcional): Tamaño a partir del cual se empieza un segmento nuevo.
+        """
+        if directory is None:
+            directory = os.path.join(os.getcwd(), "cache", "archive")
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.strip_boilerplate = strip_boilerplate
+        self.level = level
+        self.max_segment_bytes = max_segment_bytes
+        self.codec = CODEC_ZSTD if ZSTD_AVAILABLE else CODEC_ZLIB
+        self.lock = threading.RLock()
+
+        if ZSTD_AVAILABLE:
+            self.compressor = zstandard.ZstdCompressor(level=level)
+            self.decompressor = zstandard.ZstdDecompressor()
+
+        else:
+            logging.info("zstandard no está instalado: el archivo se comprime con zlib.")
+
+        # Índice en memoria: clave de URL -> posiciones en el índice (por orden de descarga),
+        # clave de URL -> offset de la URL en el fichero de URLs y
+        # sha256 -> (segmento, offset, longitud, tamaño, códec) del primer cuerpo con ese contenido
+        self.by_url: Dict[bytes, List[int]] = {}
+        self.url_offsets: Dict[bytes, int] = {}
+        self.by_hash: Dict[bytes, tuple] = {}
+        self.count = 0
+        self.maps: Dict[str, tuple] = {}
+
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.urls_path = os.path.join(directory, URLS_FILE)
+        self.load_index()
+
+        self.segment = max((record[0] for record in self.by_hash.values()), default=0)
+        self.segment_file = open(self.segment_path(self.segment), "ab")
+        self.index_file = open(self.index_path, "ab")
+        self.urls_file = open(self.urls_path, "ab")
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    @staticmethod
+    def url_key(url: str) -> bytes:
+        """
+        Clave de 16 bytes de una URL normalizada.
+
+        Args:
+            url (str): URL original.
+
+        Return:
+            bytes: Digest blake2b de la URL.
+        """
+        return hashlib.blake2b(ResponseCache.normalize_url(url).encode("utf-8"), digest_size=16).digest()
+
+
+    def segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, SEGMENT_FILE.format(segment))
+
+
+    def load_index(self) -> None:
+        """
+        Recorre el índice (con mmap) y construye las tablas de búsqueda por URL y por hash.
+        """
+        view = self.view(self.index_path)
+        if view is not None:
+            # Un índice truncado por una interrupción se lee hasta la última entrada completa
+            self.count = len(view) // INDEX_RECORD.size
+            for position in range(self.count):
+                key, segment, offset, length, size, _, url_offset, digest, codec = INDEX_RECORD.unpack_from(
+                    view, position * INDEX_RECORD.size
+                )
+                self.by_url.setdefault(key, []).append(position)
+                self.url_offsets.setdefault(key, url_offset)
+                self.by_hash.setdefault(digest, (segment, offset, length, size, codec))
+
+        # Los bytes de una escritura interrumpida se descartan: las entradas nuevas se añaden
+        # a continuación y quedarían desalineadas
+        self.truncate(self.index_path, self.count * INDEX_RECORD.size)
+        self.truncate(self.urls_path, self.urls_end())
+
+
+    def urls_end(self) -> int:
+        """
+        Posición siguiente a la última URL completa del fichero de URLs.
+
+        Return:
+            int: Tamaño válido del fichero de URLs.
+        """
+        view = self.view(self.urls_path)
+        if view is None:
+            return 0
+
+        position = 0
+        while position + URL_HEADER.size <= len(view):
+            (url_length,) = URL_HEADER.unpack_from(view, position)
+            end = position + URL_HEADER.size + url_length
+            if end > len(view):
+                break
+
+            position = end
+
+        return position
+
+
+    def truncate(self, path: str, size: int) -> None:
+        """
+        Recorta el fichero al tamaño indicado si es mayor (restos de una escritura interrumpida).
+
+        Args:
+            path (str): Ruta del fichero.
+            size (int): Tamaño válido del fichero.
+        """
+        if not os.path.exists(path) or os.path.getsize(path) <= size:
+            return
+
+        logging.warning(f"Archivo de páginas: se descartan {os.path.getsize(path) - size} bytes incompletos de {path}.")
+
+        cached = self.maps.pop(path, None)
+        if cached is not None:
+            cached[1].close()
+
+        os.truncate(path, size)
+
+
+    def view(self, path: str):
+        """
+        Devuelve un mmap de solo lectura del fichero, rehaciéndolo si el fichero ha crecido.
+        Se llama con el lock tomado, así que la vista anterior se puede cerrar sin lecturas en curso.
+
+        Args:
+            path (str): Ruta del fichero.
+
+        Return:
+            mmap | None: Vista del fichero o None si está vacío o no existe.
+        """
+        try:
+            size = os.path.getsize(path)
+
+        except FileNotFoundError:
+            return None
+
+        if size == 0:
+            return None
+
+        cached = self.maps.get(path)
+        if cached is not None and cached[0] == size:
+            return cached[1]
+
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if cached is not None:
+            cached[1].close()
+
+        self.maps[path] = (size, mapped)
+        return mapped
+
+
+    def compress(self, content: bytes) -> bytes:
+        if self.codec == CODEC_ZSTD:
+            return self.compressor.compress(content)
+
+        return zlib.compress(content, self.level)
+
+
+    def decompress(self, payload: bytes, codec: int) -> bytes:
+        if codec == CODEC_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("La entrada está comprimida con zstd y zstandard no está instalado.")
+
+            return self.decompressor.decompress(payload)
+
+        return zlib.decompress(payload)
+
+
+    def put(self, url: str, content: bytes, fetched_at: float = None, if_changed: bool = False) -> ArchiveEntry:
+        """
+        Añade una descarga al archivo. Si el contenido ya está archivado, solo se añade la entrada al índice.
+
+        Args:
+            url (str): URL descargada.
+            content (bytes): Cuerpo de la respuesta.
+            fetched_at (float, opcional): Fecha de descarga (epoch). Por defecto, ahora.
+            if_changed (bool, opcional): Si no se añade nada cuando la última descarga archivada de la URL
+                tiene el mismo contenido (p. ej. páginas servidas desde la caché de respuestas).
+
+        Return:
+            ArchiveEntry: Entrada añadida (o la última de la URL si no ha cambiado).
+        """
+        if fetched_at is None:
+            fetched_at = time()
+
+        if self.strip_boilerplate:
+            content = BOILERPLATE_PATTERN.sub(b"", content)
+
+        digest = hashlib.sha256(content).digest()
+        key = self.url_key(url)
+
+        # Los compresores de zstandard no son seguros entre hilos: se comprime con el lock tomado
+        with self.lock:
+            positions = self.by_url.get(key)
+            if if_changed and positions:
+                latest = self.entry_at(positions[-1])
+                if latest.sha256 == digest.hex():
+                    return latest
+
+            stored = self.by_hash.get(digest)
+            if stored is None:
+                # Rotamos el segmento antes de superar el tamaño máximo
+                if self.segment_file.tell() >= self.max_segment_bytes:
+                    self.segment_file.close()
+                    self.segment += 1
+                    self.segment_file = open(self.segment_path(self.segment), "ab")
+
+                payload = self.compress(content)
+                offset = self.segment_file.tell()
+                self.segment_file.write(payload)
+                self.segment_file.flush()
+
+                stored = (self.segment, offset, len(payload), len(content), self.codec)
+                self.by_hash[digest] = stored
+
+            # Cada URL se guarda una sola vez en el fichero de URLs
+            url_offset = self.url_offsets.get(key)
+            if url_offset is None:
+                encoded_url = url.encode("utf-8")
+                url_offset = self.urls_file.tell()
+                self.urls_file.write(URL_HEADER.pack(len(encoded_url)) + encoded_url)
+                self.urls_file.flush()
+                self.url_offsets[key] = url_offset
+
+            segment, offset, length, size, codec = stored
+            self.index_file.write(
+                INDEX_RECORD.pack(key, segment, offset, length, size, fetched_at, url_offset, digest, codec)
+            )
+            self.index_file.flush()
+
+            self.by_url.setdefault(key, []).append(self.count)
+            self.count += 1
+
+        return ArchiveEntry(url, fetched_at, digest.hex(), segment, offset, length, size, codec)
+
+
+    def entry_at(self, position: int) -> ArchiveEntry:
+        """
+        Lee una entrada del índice por su posición.
+
+        Args:
+            position (int): Posición en el índice.
+
+        Return:
+            ArchiveEntry: Entrada del índice.
+        """
+        with self.lock:
+            _, segment, offset, length, size, fetched_at, url_offset, digest, codec = INDEX_RECORD.unpack_from(
+                self.view(self.index_path), position * INDEX_RECORD.size
+            )
+
+            urls_view = self.view(self.urls_path)
+            (url_length,) = URL_HEADER.unpack_from(urls_view, url_offset)
+            start = url_offset + URL_HEADER.size
+            url = urls_view[start:start + url_length].decode("utf-8")
+
+        return ArchiveEntry(url, fetched_at, digest.hex(), segment, offset, length, size, codec)
+
+
+    def history(self, url: str) -> List[ArchiveEntry]:
+        """
+        Todas las descargas archivadas de una URL, de la más antigua a la más reciente.
+
+        Args:
+            url (str): URL buscada.
+
+        Return:
+            list: Entradas de la URL.
+        """
+        return [self.entry_at(position) for position in self.by_url.get(self.url_key(url), [])]
+
+
+    def latest(self, url: str) -> ArchiveEntry | None:
+        """
+        Última descarga archivada de una URL.
+
+        Args:
+            url (str): URL buscada.
+
+        Return:
+            ArchiveEntry | None: Entrada o None si la URL no está archivada.
+        """
+        positions = self.by_url.get(self.url_key(url))
+        return self.entry_at(positions[-1]) if positions else None
+
+
+    def read(self, entry: ArchiveEntry) -> bytes:
+        """
+        Lee y descomprime el cuerpo de una entrada.
+
+        Args:
+            entry (ArchiveEntry): Entrada del índice.
+
+        Return:
+            bytes: Contenido archivado.
+        """
+        with self.lock:
+            payload = self.view(self.segment_path(entry.segment))[entry.offset:entry.offset + entry.length]
+            return self.decompress(payload, entry.codec)
+
+
+    def get(self, url: str) -> bytes | None:
+        """
+        Contenido de la última descarga archivada de una URL.
+
+        Args:
+            url (str): URL buscada.
+
+        Return:
+            bytes | None: Contenido o None si la URL no está archivada.
+        """
+        entry = self.latest(url)
+        return self.read(entry) if entry is not None else None
+
+
+    def entries(self) -> Iterator[ArchiveEntry]:
+        """
+        Recorre todas las entradas del índice en orden de descarga.
+
+        Return:
+            Iterator[ArchiveEntry]: Entradas del archivo.
+        """
+        for position in range(self.count):
+            yield self.entry_at(position)
+
+
+    def urls(self) -> List[str]:
+        """
+        URLs archivadas, en orden de primera descarga.
+
+        Return:
+            list: URLs del archivo.
+        """
+        return [self.entry_at(positions[-1]).url for positions in self.by_url.values()]
+
+
+    def stats(self) -> dict:
+        """
+        Devuelve el número de entradas, URLs y cuerpos, y el tamaño comprimido frente al original.
+
+        Return:
+            dict: Estadísticas del archivo.
+        """
+        with self.lock:
+            stored_bytes = sum(record[2] for record in self.by_hash.values())
+            raw_bytes = sum(record[3] for record in self.by_hash.values())
+
+            return {
+                "entries": self.count,
+                "urls": len(self.by_url),
+                "bodies": len(self.by_hash),
+                "stored_bytes": stored_bytes,
+                "raw_bytes": raw_bytes,
+                "ratio": round(raw_bytes / stored_bytes, 2) if stored_bytes else 0.0,
+                "codec": CODECS[self.codec],
+            }
+
+
+    def close(self) -> None:
+        """
+        Cierra los ficheros y las vistas mmap del archivo.
+        """
+        with self.lock:
+            self.segment_file.close()
+            self.index_file.close()
+            self.urls_file.close()
+
+            for _, mapped in self.maps.values():
+                mapped.close()
+
+            self.maps.clear()
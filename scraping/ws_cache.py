@@ -0,0 +1,352 @@
+import os
+import re
+import json
+import zlib
+import sqlite3
+import threading
+from time import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from config.exceptions import logging
+
+# TTL por patrón de URL (segundos). Se aplica la primera regla que coincida.
+DEFAULT_TTL_RULES = [
+    (r"/wettbewerbe/[^/]+/wettbewerbe", 3 * 24 * 3600),  # Listados de regiones
+    (r"/kader/verein/", 6 * 3600),                        # Plantillas de equipos
+    (r"/plus/\?saison_id=", 24 * 3600),                   # Tablas de equipos por temporada
+    (r"/wettbewerb/", 24 * 3600),                         # Páginas de ligas
+]
+
+
+@dataclass
+class CacheEntry:
+    """
+    Entrada de la caché junto con su estado de frescura y sus validadores HTTP.
+    """
+    response: requests.Response
+    is_fresh: bool
+    etag: str | None
+    last_modified: str | None
+
+    def conditional_headers(self) -> dict:
+        """
+        Cabeceras para revalidar la entrada con un GET condicional.
+
+        Return:
+            dict: Cabeceras If-None-Match / If-Modified-Since disponibles.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+class ResponseCache:
+    """
+    Caché persistente en disco (SQLite) de respuestas HTTP.
+    Guarda los cuerpos comprimidos con zlib, indexados por la URL normalizada,
+    con TTL por patrón de URL, límite de tamaño con expulsión LRU y contadores de aciertos/fallos.
+    Las entradas caducadas se conservan para revalidarlas con ETag / Last-Modified.
+    """
+    def __init__(
+            self,
+            path: str = None,
+            ttl_rules = None,
+            default_ttl: float = 24 * 3600,
+            max_bytes: int = 512 * 1024 * 1024
+        ):
+        """
+        Inicializa la caché, creando la base de datos si no existe.
+
+        Args:
+            path (str, opcional): Ruta del fichero SQLite. Por defecto `cache/http_cache.sqlite`.
+            ttl_rules (list, opcional): Lista de (regex, segundos) evaluada en orden.
+            default_ttl (float, opcional): TTL para URLs que no coinciden con ninguna regla.
+            max_bytes (int, opcional): Tamaño máximo (comprimido) de los cuerpos almacenados.
+        """
+        if path is None:
+            path = os.path.join(os.getcwd(), "cache", "http_cache.sqlite")
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.path = path
+        self.ttl_rules = [
+            (re.compile(pattern), ttl)
+            for pattern, ttl in (DEFAULT_TTL_RULES if ttl_rules is None else ttl_rules)
+        ]
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status_code INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """
+        Normaliza una URL para usarla como clave: esquema y host en minúsculas,
+        sin fragmento, sin puerto por defecto y con los parámetros de la query ordenados.
+
+        Args:
+            url (str): URL original.
+
+        Return:
+            str: URL normalizada.
+        """
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        netloc = parts.netloc.lower()
+
+        if (scheme, netloc.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+            netloc = netloc.rsplit(":", 1)[0]
+
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+    def get_ttl(self, url: str) -> float:
+        """
+        Devuelve el TTL aplicable a una URL según las reglas configuradas.
+
+        Args:
+            url (str): URL de la respuesta.
+
+        Return:
+            float: TTL en segundos.
+        """
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+
+        return self.default_ttl
+
+
+    def get(self, url: str) -> requests.Response | None:
+        """
+        Devuelve la respuesta cacheada de una URL si existe y no ha expirado.
+
+        Args:
+            url (str): URL solicitada.
+
+        Return:
+            Response | None: Respuesta reconstruida o None si no hay entrada válida.
+        """
+        entry = self.get_entry(url)
+        return entry.response if entry and entry.is_fresh else None
+
+
+    def get_entry(self, url: str) -> CacheEntry | None:
+        """
+        Devuelve la entrada cacheada de una URL, esté fresca o caducada.
+
+        Args:
+            url (str): URL solicitada.
+
+        Return:
+            CacheEntry | None: Entrada con la respuesta y sus validadores, o None si no existe.
+        """
+        key = self.normalize_url(url)
+
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT status_code, headers, body, stored_at FROM responses WHERE url = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            is_fresh = row[3] + self.get_ttl(key) >= time()
+            if is_fresh:
+                # Actualizamos el último acceso para la política LRU
+                self.conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time(), key))
+                self.conn.commit()
+                self.hits += 1
+
+            else:
+                self.stale += 1
+
+        status_code, headers, body, _ = row
+        headers = json.loads(headers)
+        response = self.build_response(url, status_code, headers, zlib.decompress(body))
+
+        return CacheEntry(
+            response=response,
+            is_fresh=is_fresh,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+
+    def refresh(self, url: str, not_modified: requests.Response = None) -> None:
+        """
+        Marca como fresca una entrada revalidada con un 304 Not Modified,
+        actualizando sus validadores con los que envíe el servidor.
+
+        Args:
+            url (str): URL solicitada.
+            not_modified (Response, opcional): Respuesta 304 recibida.
+        """
+        key = self.normalize_url(url)
+        now = time()
+
+        with self.lock:
+            row = self.conn.execute("SELECT headers FROM responses WHERE url = ?", (key,)).fetchone()
+            if row is None:
+                return
+
+            headers = CaseInsensitiveDict(json.loads(row[0]))
+            if not_modified is not None:
+                for name in ("ETag", "Last-Modified", "Cache-Control", "Expires", "Date"):
+                    if name in not_modified.headers:
+                        headers[name] = not_modified.headers[name]
+
+            self.conn.execute(
+                "UPDATE responses SET headers = ?, stored_at = ?, last_access = ? WHERE url = ?",
+                (json.dumps(dict(headers)), now, now, key)
+            )
+            self.conn.commit()
+            self.revalidated += 1
+
+
+    def set(self, url: str, response: requests.Response) -> None:
+        """
+        Almacena una respuesta en la caché y expulsa las entradas menos usadas si se supera el tamaño máximo.
+
+        Args:
+            url (str): URL solicitada.
+            response (Response): Respuesta a almacenar.
+        """
+        key = self.normalize_url(url)
+        body = zlib.compress(response.content, 6)
+        headers = json.dumps(dict(response.headers))
+        now = time()
+
+        with self.lock:
+            previous = self.conn.execute("SELECT size FROM responses WHERE url = ?", (key,)).fetchone()
+            if previous:
+                self.total_bytes -= previous[0]
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (url, status_code, headers, body, size, stored_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, response.status_code, headers, body, len(body), now, now)
+            )
+            self.total_bytes += len(body)
+            self.evict()
+            self.conn.commit()
+
+
+    def evict(self) -> None:
+        """
+        Elimina las entradas con el acceso más antiguo hasta quedar por debajo del tamaño máximo.
+        Debe llamarse con el lock adquirido.
+        """
+        while self.total_bytes > self.max_bytes:
+            row = self.conn.execute(
+                "SELECT url, size FROM responses ORDER BY last_access ASC LIMIT 1"
+            ).fetchone()
+
+            if row is None:
+                self.total_bytes = 0
+                break
+
+            self.conn.execute("DELETE FROM responses WHERE url = ?", (row[0],))
+            self.total_bytes -= row[1]
+            self.evictions += 1
+            logging.debug(f"Caché: expulsada la entrada {row[0]}")
+
+
+    def stats(self) -> dict:
+        """
+        Devuelve los contadores de la caché.
+
+        Return:
+            dict: Aciertos, fallos, entradas caducadas y revalidadas (304), ratios, expulsiones, entradas y bytes.
+        """
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+        lookups = self.hits + self.stale + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "revalidated": self.revalidated,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "revalidated_ratio": round(self.revalidated / self.stale, 4) if self.stale else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self.total_bytes,
+        }
+
+
+    def clear(self) -> None:
+        """
+        Elimina todas las entradas de la caché.
+        """
+        with self.lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+            self.total_bytes = 0
+
+
+    def close(self) -> None:
+        """
+        Cierra la conexión con la base de datos de la caché.
+        """
+        with self.lock:
+            self.conn.close()
+
+
+    @staticmethod
+    def build_response(url: str, status_code: int, headers: dict, content: bytes) -> requests.Response:
+        """
+        Reconstruye un objeto Response de requests a partir de los datos almacenados.
+
+        Args:
+            url (str): URL de la respuesta.
+            status_code (int): Código de estado.
+            headers (dict): Cabeceras de la respuesta.
+            content (bytes): Cuerpo descomprimido.
+
+        Return:
+            Response: Respuesta equivalente a la original.
+        """
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = content
+        response.url = url
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
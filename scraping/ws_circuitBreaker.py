@@ -0,0 +1,257 @@
+import threading
+from time import monotonic, time
+from collections import deque
+from urllib.parse import urlparse
+from config.exceptions import logging, HTTPCircuitOpenError
+
+
+class HostCircuit:
+    """
+    Estado del circuito de un único host.
+    """
+    def __init__(self, host: str):
+        """
+        Inicializa el circuito cerrado y con la ventana vacía.
+
+        Args:
+            host (str): Host al que pertenece el circuito.
+        """
+        self.host = host
+        self.state = CircuitBreaker.CLOSED
+        self.outcomes = deque() # (instante, éxito)
+        self.opened_at = 0.0
+        self.half_open_calls = 0
+        self.times_opened = 0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por host para HTTPClient, con estados cerrado, abierto y semiabierto.
+    El circuito se abre cuando la tasa de errores en una ventana deslizante de tiempo supera el umbral.
+    Mientras está abierto, las solicitudes esperan a que termine el enfriamiento (modo "wait")
+    o se aparcan lanzando HTTPCircuitOpenError (modo "raise"), en lugar de agotar sus reintentos.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Respuestas que indican que el host está bloqueando o caído
+    FAILURE_STATUSES = frozenset({403, 429, 500, 502, 503, 504})
+
+    def __init__(
+            self,
+            failure_threshold: float = 0.5,
+            window_seconds: float = 60.0,
+            min_requests: int = 10,
+            open_timeout: float = 120.0,
+            half_open_max_calls: int = 1,
+            on_open: str = "wait"
+        ):
+        """
+        Inicializa el circuit breaker.
+
+        Args:
+            failure_threshold (float, opcional): Tasa de errores (0-1) que abre el circuito.
+            window_seconds (float, opcional): Duración de la ventana deslizante.
+            min_requests (int, opcional): Solicitudes mínimas en la ventana antes de evaluar la tasa.
+            open_timeout (float, opcional): Segundos que el circuito permanece abierto antes de probar de nuevo.
+            half_open_max_calls (int, opcional): Solicitudes de prueba simultáneas en estado semiabierto.
+            on_open (str, opcional): "wait" para pausar las solicitudes o "raise" para aparcarlas con una excepción.
+        """
+        if on_open not in ("wait", "raise"):
+            raise ValueError("on_open debe ser 'wait' o 'raise'.")
+
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.min_requests = min_requests
+        self.open_timeout = open_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.on_open = on_open
+        self.circuits = {}
+        self.condition = threading.Condition()
+
+
+    @staticmethod
+    def get_host(url: str) -> str:
+        """
+        Extrae el host de una URL.
+
+        Args:
+            url (str): URL de la solicitud.
+
+        Return:
+            str: Host en minúsculas.
+        """
+        return urlparse(url).netloc.lower()
+
+
+    def get_circuit(self, host: str) -> HostCircuit:
+        """
+        Devuelve el circuito de un host, creándolo si no existe. Debe llamarse con el lock adquirido.
+
+        Args:
+            host (str): Host.
+
+        Return:
+            HostCircuit: Circuito del host.
+        """
+        if host not in self.circuits:
+            self.circuits[host] = HostCircuit(host)
+
+        return self.circuits[host]
+
+
+    def before_request(self, url: str) -> None:
+        """
+        Comprueba el circuito antes de un intento. Si está abierto espera al enfriamiento
+        o lanza HTTPCircuitOpenError, según el modo configurado.
+
+        Args:
+            url (str): URL de la solicitud.
+        """
+        host = self.get_host(url)
+
+        with self.condition:
+            while True:
+                circuit = self.get_circuit(host)
+
+                if circuit.state == self.CLOSED:
+                    return
+
+                remaining = circuit.opened_at + self.open_timeout - monotonic()
+
+                # Fin del enfriamiento: dejamos pasar solicitudes de prueba
+                if circuit.state == self.OPEN and remaining <= 0:
+                    circuit.state = self.HALF_OPEN
+                    circuit.half_open_calls = 0
+                    logging.info(f"Circuito semiabierto para el host {host}: probando de nuevo.")
+
+                if circuit.state == self.HALF_OPEN and circuit.half_open_calls < self.half_open_max_calls:
+                    circuit.half_open_calls += 1
+                    return
+
+                if self.on_open == "raise":
+                    raise HTTPCircuitOpenError(host, time() + max(remaining, 0))
+
+                # Pausamos hasta el fin del enfriamiento o hasta que cambie el estado
+                self.condition.wait(timeout=max(remaining, 0.1))
+
+
+    def record_success(self, url: str) -> None:
+        """
+        Registra un intento correcto (el host respondió con normalidad).
+
+        Args:
+            url (str): URL de la solicitud.
+        """
+        self.record(url, success=True)
+
+
+    def record_failure(self, url: str) -> None:
+        """
+        Registra un intento fallido (bloqueo, error del servidor, timeout o error de conexión).
+
+        Args:
+            url (str): URL de la solicitud.
+        """
+        self.record(url, success=False)
+
+
+    def record_status(self, url: str, status_code: int) -> None:
+        """
+        Registra el resultado de un intento según su código de estado.
+
+        Args:
+            url (str): URL de la solicitud.
+            status_code (int): Código de estado de la respuesta.
+        """
+        self.record(url, success=status_code not in self.FAILURE_STATUSES)
+
+
+    def record(self, url: str, success: bool) -> None:
+        """
+        Registra el resultado de un intento y actualiza el estado del circuito.
+
+        Args:
+            url (str): URL de la solicitud.
+            success (bool): Si el intento fue correcto.
+        """
+        host = self.get_host(url)
+        now = monotonic()
+
+        with self.condition:
+            circuit = self.get_circuit(host)
+
+            if circuit.state == self.HALF_OPEN:
+                circuit.half_open_calls = max(0, circuit.half_open_calls - 1)
+
+                if success:
+                    circuit.state = self.CLOSED
+                    circuit.outcomes.clear()
+                    logging.info(f"Circuito cerrado para el host {host}.")
+
+                else:
+                    self.open(circuit, now)
+
+                self.condition.notify_all()
+                return
+
+            if circuit.state == self.OPEN:
+                return
+
+            # Ventana deslizante de resultados
+            circuit.outcomes.append((now, success))
+            while circuit.outcomes and circuit.outcomes[0][0] < now - self.window_seconds:
+                circuit.outcomes.popleft()
+
+            total = len(circuit.outcomes)
+            if total < self.min_requests:
+                return
+
+            failures = sum(1 for _, ok in circuit.outcomes if not ok)
+            if failures / total >= self.failure_threshold:
+                self.open(circuit, now)
+                self.condition.notify_all()
+
+
+    def open(self, circuit: HostCircuit, now: float) -> None:
+        """
+        Abre el circuito de un host. Debe llamarse con el lock adquirido.
+
+        Args:
+            circuit (HostCircuit): Circuito a abrir.
+            now (float): Instante actual (monotonic).
+        """
+        circuit.state = self.OPEN
+        circuit.opened_at = now
+        circuit.outcomes.clear()
+        circuit.times_opened += 1
+        logging.warning(f"Circuito abierto para el host {circuit.host}: pausa de {self.open_timeout} segundos.")
+
+
+    def get_state(self, url: str) -> str:
+        """
+        Devuelve el estado del circuito del host de una URL.
+
+        Args:
+            url (str): URL de la solicitud.
+
+        Return:
+            str: "closed", "open" o "half_open".
+        """
+        with self.condition:
+            return self.get_circuit(self.get_host(url)).state
+
+
+    def stats(self) -> dict:
+        """
+        Devuelve el estado y el número de aperturas de cada host.
+
+        Return:
+            dict: {host: {"state": str, "times_opened": int}}
+        """
+        with self.condition:
+            return {
+                host: {"state": circuit.state, "times_opened": circuit.times_opened}
+                for host, circuit in self.circuits.items()
+            }
@@ -0,0 +1,102 @@
+import threading
+from time import monotonic
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class RequestCoalescer:
+    """
+    Agrupa solicitudes duplicadas a una misma URL.
+    Si una URL ya se está descargando, el resto de llamadas esperan a esa descarga y comparten
+    su respuesta; si se descargó hace menos de `window` segundos, se reutiliza la respuesta reciente.
+    """
+    def __init__(self, window: float = 60.0, max_recent: int = 64):
+        """
+        Inicializa el agrupador.
+
+        Args:
+            window (float, opcional): Segundos durante los que se reutiliza una respuesta reciente (0 para desactivarlo).
+            max_recent (int, opcional): Número máximo de respuestas recientes en memoria.
+        """
+        self.window = window
+        self.max_recent = max_recent
+        self.in_flight = {}
+        self.recent = OrderedDict()
+        self.lock = threading.Lock()
+        self.coalesced = 0 # Llamadas que esperaron a una descarga en curso
+        self.reused = 0 # Llamadas servidas con una respuesta reciente
+
+
+    def fetch(self, key: str, loader):
+        """
+        Devuelve la respuesta para `key`, llamando a `loader` solo si no hay otra descarga en curso
+        ni una respuesta reciente para la misma clave.
+
+        Args:
+            key (str): Clave de la solicitud (URL normalizada).
+            loader (Callable): Función sin argumentos que descarga la respuesta.
+
+        Return:
+            Response: Respuesta compartida.
+        """
+        with self.lock:
+            recent = self.recent.get(key)
+            if recent is not None:
+                expires_at, response = recent
+
+                if expires_at >= monotonic():
+                    self.recent.move_to_end(key)
+                    self.reused += 1
+                    return response
+
+                del self.recent[key]
+
+            future = self.in_flight.get(key)
+            is_owner = future is None
+
+            if is_owner:
+                future = Future()
+                self.in_flight[key] = future
+
+            else:
+                self.coalesced += 1
+
+        # Otra llamada ya está descargando la URL: esperamos su resultado (o su excepción)
+        if not is_owner:
+            return future.result()
+
+        try:
+            response = loader()
+
+        except BaseException as e:
+            with self.lock:
+                del self.in_flight[key]
+
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            del self.in_flight[key]
+
+            if self.window > 0:
+                self.recent[key] = (monotonic() + self.window, response)
+                self.recent.move_to_end(key)
+
+                while len(self.recent) > self.max_recent:
+                    self.recent.popitem(last=False)
+
+        future.set_result(response)
+        return response
+
+
+    def stats(self) -> dict:
+        """
+        Devuelve los contadores del agrupador.
+
+        Return:
+            dict: Llamadas agrupadas con una descarga en curso y llamadas servidas con una respuesta reciente.
+        """
+        return {
+            "coalesced": self.coalesced,
+            "reused": self.reused,
+        }
@@ -0,0 +1,194 @@
+import threading
+from time import monotonic
+from contextlib import contextmanager
+from config.exceptions import logging
+
+
+class ConcurrencyController:
+    """
+    Controlador adaptativo (AIMD) del número de solicitudes HTTP simultáneas.
+    Mientras las respuestas son correctas y la latencia está por debajo del objetivo, el límite
+    crece de forma aditiva (una unidad por cada "ronda" de solicitudes correctas); ante un 429, un 503
+    o un timeout se reduce de forma multiplicativa. Así un crawl largo se estabiliza en el mayor
+    ritmo sostenible sin ajustes manuales.
+    """
+
+    # Respuestas que indican que estamos saturando al servidor
+    BACKOFF_STATUSES = frozenset({429, 503})
+
+    def __init__(
+            self,
+            initial_limit: int = 4,
+            min_limit: int = 1,
+            max_limit: int = 32,
+            increase: int = 1,
+            decrease_factor: float = 0.5,
+            latency_target: float = 2.0,
+            cooldown: float = 5.0,
+            metrics = None
+        ):
+        """
+        Inicializa el controlador.
+
+        Args:
+            initial_limit (int, opcional): Solicitudes simultáneas iniciales.
+            min_limit (int, opcional): Límite mínimo.
+            max_limit (int, opcional): Límite máximo.
+            increase (int, opcional): Incremento aditivo tras una ronda de solicitudes correctas.
+            decrease_factor (float, opcional): Factor multiplicativo aplicado al límite ante una señal de saturación.
+            latency_target (float, opcional): Latencia media (segundos) por encima de la cual no se aumenta el límite.
+            cooldown (float, opcional): Segundos mínimos entre dos reducciones, para no encadenar recortes por una misma ráfaga.
+            metrics (HTTPMetrics, opcional): Métricas donde se publica el límite actual y las solicitudes en curso.
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Se requiere 1 <= min_limit <= initial_limit <= max_limit.")
+
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor debe estar entre 0 y 1.")
+
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.metrics = metrics
+
+        self.in_flight = 0
+        self.successes = 0 # Solicitudes correctas desde el último cambio del límite
+        self.latency_sum = 0.0
+        self.last_decrease = float("-inf")
+        self.increases = 0
+        self.decreases = 0
+        self.condition = threading.Condition()
+        self.publish()
+
+
+    def acquire(self) -> None:
+        """
+        Espera hasta que haya una plaza libre por debajo del límite actual y la ocupa.
+        """
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+
+            self.in_flight += 1
+            self.publish()
+
+
+    def release(self) -> None:
+        """
+        Libera una plaza ocupada con `acquire`.
+        """
+        with self.condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.publish()
+            self.condition.notify()
+
+
+    @contextmanager
+    def slot(self):
+        """
+        Ocupa una plaza durante el bloque `with`.
+        """
+        self.acquire()
+        try:
+            yield
+
+        finally:
+            self.release()
+
+
+    def record_response(self, status_code: int, seconds: float) -> None:
+        """
+        Ajusta el límite según la respuesta de un intento.
+
+        Args:
+            status_code (int): Código de estado recibido.
+            seconds (float): Duración del intento.
+        """
+        if status_code in self.BACKOFF_STATUSES:
+            self.decrease(f"HTTP {status_code}")
+            return
+
+        if status_code >= 400:
+            return
+
+        with self.condition:
+            self.successes += 1
+            self.latency_sum += seconds
+
+            # Una ronda completa de solicitudes correctas: aumentamos si la latencia es sana
+            if self.successes < self.limit:
+                return
+
+            average = self.latency_sum / self.successes
+            self.successes = 0
+            self.latency_sum = 0.0
+
+            if average > self.latency_target or self.limit >= self.max_limit:
+                return
+
+            self.limit = min(self.max_limit, self.limit + self.increase)
+            self.increases += 1
+            self.publish()
+            self.condition.notify_all()
+
+        logging.debug(f"Concurrencia aumentada a {self.limit} (latencia media {average:.2f}s).")
+
+
+    def record_timeout(self) -> None:
+        """
+        Reduce el límite tras un timeout.
+        """
+        self.decrease("timeout")
+
+
+    def decrease(self, reason: str) -> None:
+        """
+        Reduce el límite de forma multiplicativa, como mucho una vez por periodo de enfriamiento.
+
+        Args:
+            reason (str): Motivo de la reducción, para los logs.
+        """
+        now = monotonic()
+
+        with self.condition:
+            self.successes = 0
+            self.latency_sum = 0.0
+
+            if now - self.last_decrease < self.cooldown:
+                return
+
+            self.last_decrease = now
+            self.limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+            self.decreases += 1
+            self.publish()
+
+        logging.warning(f"Concurrencia reducida a {self.limit} ({reason}).")
+
+
+    def publish(self) -> None:
+        """
+        Publica el límite actual y las solicitudes en curso en las métricas.
+        """
+        if self.metrics is not None:
+            self.metrics.set_gauge("http_concurrency_limit", self.limit)
+            self.metrics.set_gauge("http_in_flight", self.in_flight)
+
+
+    def stats(self) -> dict:
+        """
+        Devuelve el estado del controlador.
+
+        Return:
+            dict: Límite actual, solicitudes en curso y número de aumentos y reducciones.
+        """
+        with self.condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "increases": self.increases,
+                "decreases": self.decreases,
+            }
@@ -0,0 +1,352 @@
+import re
+from functools import cached_property
+from scraping.ws_parser import parse_html
+
+# Contenedores de paginación de Transfermarkt (mismo orden de búsqueda que get_total_pages)
+PAGINATION_SELECTOR = "ul.tm-pagination, div.pagination, ul.pagination, nav[role='navigation']"
+
+# Aperturas y cierres de <table> y clase "items" en el HTML original (sin parsear)
+TABLE_TAG_PATTERN = re.compile(rb"<(/?)table\b((?:\"[^\"]*\"|'[^']*'|[^'\">])*)>", re.IGNORECASE)
+ITEMS_CLASS_PATTERN = re.compile(
+    rb"\bclass\s*=\s*(?:\"[^\"]*(?<![\w-])items(?![\w-])[^\"]*\"|'[^']*(?<![\w-])items(?![\w-])[^']*'|items(?![\w-]))",
+    re.IGNORECASE
+)
+
+
+def table_source(content) -> bytes | None:
+    """
+    HTML original (bytes) de la primera tabla `table.items` de la página, desde su apertura
+    hasta su cierre (contando las tablas anidadas), sin pasar por el parser.
+
+    Args:
+        content (bytes | str): HTML de la página.
+
+    Return:
+        bytes | None: HTML de la tabla o None si no existe o no está cerrada.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    start = None
+    depth = 0
+
+    for match in TABLE_TAG_PATTERN.finditer(content):
+        closing = match.group(1)
+
+        if start is None:
+            if not closing and ITEMS_CLASS_PATTERN.search(match.group(2)):
+                start = match.start()
+                depth = 1
+
+            continue
+
+        depth += -1 if closing else 1
+        if depth == 0:
+            return content[start:match.end()]
+
+    return None
+
+
+class ParsedTable:
+    """
+    Tabla HTML ya parseada cuyos recorridos se calculan una única vez y se memorizan:
+    fila de encabezados, filas del cuerpo, celdas de cada fila y longitudes de fila.
+    ScrapingEngine y los gestores comparten la misma instancia para no recorrer la tabla varias veces.
+    El resto de atributos se delegan en la etiqueta original, por lo que se puede usar como un Tag.
+    """
+    def __init__(self, tag, content = None):
+        """
+        Envuelve una tabla HTML.
+
+        Args:
+            tag (Tag): Etiqueta <table> parseada.
+            content (bytes | str, opcional): HTML original de la página (para `source`).
+        """
+        self.tag = tag
+        self.content = content
+        self.memo = {}
+
+
+    @classmethod
+    def of(cls, table) -> "ParsedTable":
+        """
+        Devuelve la tabla envuelta, reutilizando la instancia si ya lo está.
+
+        Args:
+            table (Tag | ParsedTable): Tabla HTML.
+
+        Return:
+            ParsedTable: Tabla con recorridos memorizados.
+        """
+        return table if isinstance(table, ParsedTable) else cls(table)
+
+
+    def __getattr__(self, name):
+        # Solo se llama para atributos que no existen en la instancia. Solo se delegan los atributos y
+        # métodos reales de la etiqueta: los de ParsedTable (p. ej. una cached_property cuyo cuerpo lanzó
+        # AttributeError) o un nombre mal escrito los convertiría Tag.__getattr__ en find(name) y
+        # devolvería None en silencio
+        tag = self.__dict__.get("tag")
+        if tag is not None and not hasattr(type(self), name):
+            if name in getattr(tag, "__dict__", ()) or hasattr(type(tag), name):
+                return getattr(tag, name)
+
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+
+    @cached_property
+    def source(self) -> bytes | None:
+        """
+        HTML original de la tabla (ver `table_source`) o None si no se conoce la página.
+        """
+        return table_source(self.content) if self.content is not None else None
+
+
+    @cached_property
+    def header_row(self):
+        """
+        Fila de encabezados: la primera fila del thead o, si no hay thead, la primera fila de la tabla.
+        """
+        thead = self.tag.find("thead")
+        return thead.find("tr") if thead else self.tag.find_all("tr")[0]
+
+
+    @cached_property
+    def header_cells(self) -> list:
+        """
+        Celdas (th y td) de la fila de encabezados.
+        """
+        return self.header_row.find_all(["th", "td"])
+
+
+    @cached_property
+    def header_texts(self) -> tuple:
+        """
+        Texto (sin espacios) de cada celda de la fila de encabezados.
+        """
+        return tuple(th.get_text(strip=True) for th in self.header_cells)
+
+
+    @cached_property
+    def rows(self) -> list:
+        """
+        Filas del tbody (incluidas las de tablas anidadas, como en `find_all("tr")`).
+        Una tabla sin tbody no tiene filas de cuerpo: se devuelve una lista vacía.
+        """
+        tbody = self.tag.find("tbody")
+        return tbody.find_all("tr") if tbody else []
+
+
+    @cached_property
+    def cells(self) -> list:
+        """
+        Celdas td de cada fila del tbody, en el mismo orden que `rows`.
+        """
+        return [row.find_all("td") for row in self.rows]
+
+
+    @cached_property
+    def row_lengths(self) -> list:
+        """
+        Número de celdas td de cada fila del tbody.
+        """
+        return [len(cells) for cells in self.cells]
+
+
+    def memoize(self, key, factory):
+        """
+        Devuelve el valor memorizado para `key`, calculándolo con `factory` la primera vez.
+
+        Args:
+            key (Hashable): Clave del valor (p. ej. ("headers", "region")).
+            factory (Callable): Función sin argumentos que calcula el valor.
+
+        Return:
+            Valor memorizado.
+        """
+        if key not in self.memo:
+            self.memo[key] = factory()
+
+        return self.memo[key]
+
+
+class HeaderLayout:
+    """
+    Estructura de columnas de una tabla, compartida por todas las tablas con los mismos encabezados.
+    Guarda el diccionario de encabezados ya normalizado, el número de columnas y los planes de extracción
+    compilados para esos encabezados (por tipo de plan y ancho de fila), de modo que miles de plantillas
+    idénticas no repiten el trabajo.
+    """
+    def __init__(self, header_type: str, texts: tuple, headers: dict):
+        """
+        Inicializa la estructura.
+
+        Args:
+            header_type (str): Tipo de encabezado ("default", "region" o "league").
+            texts (tuple[str]): Texto de cada celda de encabezado (la firma de la estructura).
+            headers (dict): Encabezados normalizados y su índice.
+        """
+        self.header_type = header_type
+        self.texts = texts
+        self.headers = headers
+        self.column_count = len(texts)
+        # (tipo de plan, ancho de fila) -> ExtractionPlan
+        self.plans = {}
+
+
+    @staticmethod
+    def row_width(row_lengths) -> int | None:
+        """
+        Ancho de fila de una tabla: el mayor número de celdas td de sus filas.
+
+        Args:
+            row_lengths (Iterable[int]): Número de celdas de cada fila.
+
+        Return:
+            int | None: Ancho de fila o None si la tabla no tiene filas.
+        """
+        return max(row_lengths, default=None)
+
+
+    def plan_widths(self, kind: str) -> list:
+        """
+        Anchos de fila para los que ya hay un plan de este tipo.
+
+        Args:
+            kind (str): Tipo de plan.
+
+        Return:
+            list[int]: Anchos de fila conocidos.
+        """
+        return [width for plan_kind, width in self.plans if plan_kind == kind and width is not None]
+
+
+    @staticmethod
+    def signature(header_type: str, texts: tuple) -> tuple:
+        """
+        Firma de una fila de encabezados: el tipo de encabezado y el texto crudo de sus celdas concatenado.
+
+        Args:
+            header_type (str): Tipo de encabezado.
+            texts (tuple[str]): Texto de cada celda de encabezado.
+
+        Return:
+            tuple: Clave de la estructura.
+        """
+        return header_type, "\x1f".join(texts)
+
+
+    def describe_changes(self, previous: "HeaderLayout") -> str:
+        """
+        Describe las diferencias de columnas con otra estructura (para los avisos de cambio de estructura).
+
+        Args:
+            previous (HeaderLayout): Estructura anterior.
+
+        Return:
+            str: Número de columnas y columnas añadidas y eliminadas.
+        """
+        added = [text for text in self.texts if text and text not in previous.texts]
+        removed = [text for text in previous.texts if text and text not in self.texts]
+
+        return (
+            f"{previous.column_count} -> {self.column_count} columnas. "
+            f"Nuevas: {added or '-'}. Eliminadas: {removed or '-'}."
+        )
+
+
+class ParsedDocument:
+    """
+    Página HTML parseada una sola vez, con acceso memorizado a la tabla principal (`table.items`),
+    al bloque de paginación y al selector de temporadas.
+    """
+    def __init__(self, soup, content = None):
+        """
+        Envuelve un documento ya parseado.
+
+        Args:
+            soup (BeautifulSoup | SelectolaxNode): Documento parseado.
+            content (bytes | str, opcional): HTML original de la página.
+        """
+        self.soup = soup
+        self.content = content
+        self.memo = {}
+
+
+    @classmethod
+    def parse(cls, content, targets = None) -> "ParsedDocument":
+        """
+        Parsea una página con el backend configurado.
+
+        Args:
+            content (bytes | str): HTML de la página.
+            targets (tuple[str], opcional): Nodos a materializar (parseo parcial).
+
+        Return:
+            ParsedDocument: Documento parseado.
+        """
+        return cls(parse_html(content, targets), content)
+
+
+    @classmethod
+    def of(cls, html) -> "ParsedDocument":
+        """
+        Devuelve el documento envuelto, reutilizando la instancia si ya lo está.
+
+        Args:
+            html (BeautifulSoup | ParsedDocument): Documento parseado.
+
+        Return:
+            ParsedDocument: Documento con accesos memorizados.
+        """
+        return html if isinstance(html, ParsedDocument) else cls(html)
+
+
+    def __getattr__(self, name):
+        # Solo se llama para atributos que no existen en ParsedDocument
+        if name == "soup":
+            raise AttributeError(name)
+
+        return getattr(self.soup, name)
+
+
+    @cached_property
+    def table(self) -> ParsedTable | None:
+        """
+        Tabla principal de la página (`table.items`) o None si no existe.
+        """
+        table = self.soup.find("table", {"class": "items"})
+        return ParsedTable(table, self.content) if table else None
+
+
+    @cached_property
+    def pagination(self):
+        """
+        Contenedor de la paginación o None si la página no está paginada.
+        """
+        return self.soup.select_one(PAGINATION_SELECTOR)
+
+
+    @cached_property
+    def seasons_select(self):
+        """
+        Selector de temporadas (`select[name=saison_id]`) o None si no existe.
+        """
+        return self.soup.find("select", {"name": "saison_id"})
+
+
+    def memoize(self, key, factory):
+        """
+        Devuelve el valor memorizado para `key`, calculándolo con `factory` la primera vez.
+
+        Args:
+            key (Hashable): Clave del valor (p. ej. "total_pages").
+            factory (Callable): Función sin argumentos que calcula el valor.
+
+        Return:
+            Valor memorizado.
+        """
+        if key not in self.memo:
+            self.memo[key] = factory()
+
+        return self.memo[key]
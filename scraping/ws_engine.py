@@ -1,12 +1,23 @@
 import os
 import re
 import logging
+import threading
 from typing import Dict
-from datetime import datetime, date
+from datetime import date
 from bs4 import BeautifulSoup, Tag
+from scraping.ws_document import ParsedDocument, ParsedTable, HeaderLayout
 from scraping.ws_httpClient import HTTPClient
-from config.exceptions import HTTPClientError
+from config.exceptions import HTTPClientError, HTTPCircuitOpenError
 from scraping.ws_entities import League, LeagueStats, RegionStats, TransferMarket, Player
+from scraping.ws_values import (
+    IMG_ID_PATTERN,
+    PORTRAIT_ID_PATTERN,
+    PLAYER_ID_PATTERN,
+    parse_date,
+    parse_date_string,
+    parse_height,
+    parse_currency
+)
 from pprint import pprint
 
 def clear_terminal():
@@ -21,14 +32,41 @@ class ScrapingEngine:
     Motor principal para realizar operaciones de scraping sobre Transfermarkt.
     Proporciona utilidades para procesar tablas, extraer datos y limpiar HTML.
     """
-    def __init__(self, http_client: HTTPClient):
+    def __init__(self, http_client: HTTPClient, parse_cache = None):
         """
         Inicializa el motor de scraping con un cliente HTTP.
 
         Args:
             http_client (HTTPClient): Cliente HTTP para realizar peticiones web.
+            parse_cache (ParseCache, opcional): Caché de registros extraídos por hash de tabla, compartida por los gestores.
         """
         self.http_client = http_client
+        self.parse_cache = parse_cache
+
+        # Estructuras de tabla por firma de encabezados y última estructura usada por cada tipo de plan
+        self.header_layouts = {}
+        self.plan_layouts = {}
+        self.layout_lock = threading.Lock()
+
+
+    def get_table_records(self, kind: str, table, min_columns: int, extract) -> list:
+        """
+        Registros extraídos de una tabla. Con `parse_cache`, una tabla idéntica a otra ya extraída
+        (mismo HTML y misma versión del parser) devuelve los registros guardados sin recorrer sus filas.
+
+        Args:
+            kind (str): Tipo de tabla ("league", "team" o "player").
+            table (ParsedTable | bytes): Tabla HTML o su HTML original (camino rápido de plantillas).
+            min_columns (int): Número mínimo de columnas requeridas por fila.
+            extract (Callable): Función sin argumentos que extrae los registros de la tabla.
+
+        Return:
+            list[dict]: Registros de la tabla.
+        """
+        if self.parse_cache is None:
+            return extract()
+
+        return self.parse_cache.get_or_extract(kind, table, min_columns, extract)
 
 
     def expand_collpased_cells(self, table: BeautifulSoup):
@@ -70,40 +108,60 @@ class ScrapingEngine:
                 logging.error(f"No se pudo obtener el HTML de la URL: '{url}'.")
                 raise HTTPClientError(f"No se pudo obtener el HTML de la URL: {url}")
 
-            # Convertimos el contenido del Response en un objeto BeautifulSoup:
-            html = BeautifulSoup(response.content, "html.parser")
+            # Parseamos solo el bloque de paginación:
+            document = ParsedDocument.parse(response.content, targets=("pagination",))
+            return self.parse_total_pages(document, url)
 
-            # Extraemos el número total de páginas del HTML:
-            pagination = html.select_one(
-                "ul.tm-pagination," \
-                "div.pagination," \
-                "ul.pagination," \
-                "nav[role='navigation']"
-            )
+        except Exception as e:
+            logging.error(f"Error al calcular el número de páginas para la URL: {url}. \nDetalle: {e}")
+            raise HTTPClientError(f"Error al calcular el número de páginas para la URL: {url}. \nDetalle: {e}")
 
-            if not pagination:
-                logging.warning(f"No se encontró el elemento de paginación en el HTML de la URL: {url}")
-                return 1  # Asignamos 1 página por defecto
 
-            page_numbers = set()
+    def parse_total_pages(self, html: BeautifulSoup, url: str) -> int:
+        """
+        Obtiene el número total de páginas a partir del HTML ya descargado.
 
-            # Recorremos todos los enlaces dentro del contenedor:
-            for a in pagination.find_all("a"):
-                page_numbers.update(
-                    int(n) for n in re.findall(r"\d+", a.get_text(strip=True))
-                )
+        Args:
+            html (BeautifulSoup | ParsedDocument): HTML de la página.
+            url (str): URL de origen (solo para los mensajes de log).
 
-                # Buscamos los números de página en el texto del enlace:
-                href = a.get("href", "")
-                page_numbers.update(
-                    int(n) for n in re.findall(r"page=(\d+)", href)
-                )
+        Return:
+            int: Número total de páginas.
+        """
+        document = ParsedDocument.of(html)
+        return document.memoize("total_pages", lambda: self.count_pages(document.pagination, url))
 
-            return max(page_numbers) if page_numbers else 1
 
-        except Exception as e:
-            logging.error(f"Error al calcular el número de páginas para la URL: {url}. \nDetalle: {e}")
-            raise HTTPClientError(f"Error al calcular el número de páginas para la URL: {url}. \nDetalle: {e}")
+    def count_pages(self, pagination, url: str) -> int:
+        """
+        Calcula el número total de páginas a partir del contenedor de paginación.
+
+        Args:
+            pagination (Tag | None): Contenedor de la paginación.
+            url (str): URL de origen (solo para los mensajes de log).
+
+        Return:
+            int: Número total de páginas.
+        """
+        if not pagination:
+            logging.warning(f"No se encontró el elemento de paginación en el HTML de la URL: {url}")
+            return 1  # Asignamos 1 página por defecto
+
+        page_numbers = set()
+
+        # Recorremos todos los enlaces dentro del contenedor:
+        for a in pagination.find_all("a"):
+            page_numbers.update(
+                int(n) for n in re.findall(r"\d+", a.get_text(strip=True))
+            )
+
+            # Buscamos los números de página en el texto del enlace:
+            href = a.get("href", "")
+            page_numbers.update(
+                int(n) for n in re.findall(r"page=(\d+)", href)
+            )
+
+        return max(page_numbers) if page_numbers else 1
 
 
     def get_table_headers(self, table: BeautifulSoup, header_type: str = "default") -> dict:
@@ -111,29 +169,95 @@ class ScrapingEngine:
         Extrae los encabezados de una tabla HTML y los formatea según el tipo de tabla.
 
         Args:
-            table (BeautifulSoup): Tabla HTML a analizar.
+            table (BeautifulSoup | ParsedTable): Tabla HTML a analizar.
             header_type (str): Tipo de encabezado para personalizar el nombre.
 
         Return:
-            dict: Diccionario con los encabezados y su índice.
+            dict: Diccionario con los encabezados y su índice (memorizado en la tabla).
         """
-        try:
-            headers = {}
+        layout = self.get_table_layout(table, header_type)
+        return layout.headers if layout else {}
 
-            # Buscamos encabezado en thead o en la primera fila de la tabla:
-            header_row = (
-                table.find("thead").find("tr")
-                if table.find("thead")
-                else table.find_all("tr")[0]
-            )
 
-            if not header_row:
+    def get_table_layout(self, table: BeautifulSoup, header_type: str = "default") -> HeaderLayout | None:
+        """
+        Estructura de columnas de la tabla. Las tablas con los mismos encabezados (misma firma)
+        comparten la estructura, así que la normalización se hace una vez por tipo de tabla.
+
+        Args:
+            table (BeautifulSoup | ParsedTable): Tabla HTML a analizar.
+            header_type (str): Tipo de encabezado para personalizar el nombre.
+
+        Return:
+            HeaderLayout | None: Estructura de la tabla (memorizada en la tabla) o None si no tiene encabezados.
+        """
+        table = ParsedTable.of(table)
+        return table.memoize(("layout", header_type), lambda: self.find_table_layout(table, header_type))
+
+
+    def find_table_layout(self, table: ParsedTable, header_type: str) -> HeaderLayout | None:
+        """
+        Busca la estructura de la tabla por la firma de su fila de encabezados y la crea si es nueva.
+
+        Args:
+            table (ParsedTable): Tabla HTML a analizar.
+            header_type (str): Tipo de encabezado para personalizar el nombre.
+
+        Return:
+            HeaderLayout | None: Estructura de la tabla o None si no tiene encabezados.
+        """
+        try:
+            # Buscamos encabezado en thead o en la primera fila de la tabla:
+            if not table.header_row:
                 logging.error("No se encontró encabezado en la tabla.")
-                return {}
+                return None
+
+            texts = table.header_texts
+
+        except Exception as e:
+            logging.error(f"Error al extraer encabezados de la tabla: {e}")
+            return None
+
+        return self.get_header_layout(texts, header_type)
+
+
+    def get_header_layout(self, texts: tuple, header_type: str = "default") -> HeaderLayout:
+        """
+        Estructura correspondiente al texto de una fila de encabezados, creándola si es nueva.
+
+        Args:
+            texts (tuple[str]): Texto de cada celda de encabezado.
+            header_type (str): Tipo de encabezado para personalizar el nombre.
+
+        Return:
+            HeaderLayout: Estructura compartida por las tablas con esos encabezados.
+        """
+        signature = HeaderLayout.signature(header_type, texts)
+        layout = self.header_layouts.get(signature)
+
+        if layout is None:
+            layout = HeaderLayout(header_type, texts, self.build_table_headers(texts, header_type))
+            self.header_layouts[signature] = layout
+
+        return layout
+
+
+    @staticmethod
+    def build_table_headers(texts: tuple, header_type: str) -> dict:
+        """
+        Construye el diccionario de encabezados a partir del texto de cada celda (ver get_table_headers).
+
+        Args:
+            texts (tuple[str]): Texto de cada celda de encabezado.
+            header_type (str): Tipo de encabezado para personalizar el nombre.
+
+        Return:
+            dict: Diccionario con los encabezados y su índice.
+        """
+        try:
+            headers = {}
 
-            th_elements = header_row.find_all(["th", "td"])
-            for idx, th in enumerate(th_elements):
-                text = th.get_text(strip=True)
+            for idx, text in enumerate(texts):
                 if text:  # Ignorar columnas vacías
                     formatted_text = text.replace(" ", "_").replace(".", "").replace("ø", "avg").lower()
 
@@ -153,6 +277,74 @@ class ScrapingEngine:
             return {}
 
 
+    def get_table_plan(self, table: BeautifulSoup, kind: str, compile_plan, header_type: str = "default"):
+        """
+        Plan de extracción de la tabla, compilado una vez por estructura de encabezados, tipo de plan y ancho de fila.
+        Al compilar el plan de una estructura nueva se comprueba si la tabla ha cambiado de formato:
+        columnas añadidas o eliminadas respecto a la última estructura de ese tipo y campos sin columna.
+        Si las filas no tienen el número de celdas con el que se compiló el plan de la estructura, el plan
+        no se reutiliza: se recompila para ese ancho de fila con un aviso de cambio de estructura.
+
+        Args:
+            table (BeautifulSoup | ParsedTable): Tabla HTML.
+            kind (str): Tipo de plan ("league", "team" o "player").
+            compile_plan (Callable): Función que recibe los encabezados y devuelve el ExtractionPlan.
+            header_type (str): Tipo de encabezado para personalizar el nombre.
+
+        Return:
+            ExtractionPlan | None: Plan compilado o None si la tabla no tiene encabezados.
+        """
+        layout = self.get_table_layout(table, header_type)
+        if layout is None:
+            return None
+
+        row_width = HeaderLayout.row_width(ParsedTable.of(table).row_lengths)
+        return self.get_layout_plan(layout, kind, compile_plan, row_width)
+
+
+    def get_layout_plan(self, layout: HeaderLayout, kind: str, compile_plan, row_width: int = None):
+        """
+        Plan de extracción de una estructura de encabezados (ver get_table_plan).
+
+        Args:
+            layout (HeaderLayout): Estructura de la tabla.
+            kind (str): Tipo de plan ("league", "team" o "player").
+            compile_plan (Callable): Función que recibe los encabezados y devuelve el ExtractionPlan.
+            row_width (int, opcional): Ancho de fila de la tabla (ver `HeaderLayout.row_width`).
+
+        Return:
+            ExtractionPlan: Plan compilado.
+        """
+        plan = layout.plans.get((kind, row_width))
+        if plan is not None:
+            return plan
+
+        plan = compile_plan(layout.headers)
+
+        with self.layout_lock:
+            widths = layout.plan_widths(kind)
+            layout.plans[(kind, row_width)] = plan
+            previous = self.plan_layouts.get(kind)
+            self.plan_layouts[kind] = layout
+
+        if widths and row_width is not None:
+            # Mismos encabezados, pero las filas no tienen las celdas con las que se compiló el plan
+            logging.warning(
+                f"Cambio de estructura en las tablas de '{kind}': filas de {row_width} celdas en lugar de "
+                f"{', '.join(map(str, widths))} con los mismos {layout.column_count} encabezados. Se recompila el plan."
+            )
+            return plan
+
+        if previous is not None and previous is not layout:
+            logging.warning(f"Cambio de estructura en las tablas de '{kind}': {layout.describe_changes(previous)}")
+
+        missing = plan.missing_fields()
+        if missing:
+            logging.warning(f"Las tablas de '{kind}' no tienen columna para los campos: {', '.join(missing)}")
+
+        return plan
+
+
     def measure_row_lengths(self, table: BeautifulSoup) -> tuple:
         """
         Calcula la frecuencia de longitudes de filas en una tabla y la longitud máxima.
@@ -165,13 +357,13 @@ class ScrapingEngine:
         """
         try:
             # Extraer las filas de la tabla
-            rows = table.find("tbody").find_all("tr")
-            if not rows:
+            table = ParsedTable.of(table)
+            if not table.rows:
                 logging.warning("No se encontraron filas en la tabla.")
                 return {}, 0
 
             # Calculamos la longitud de cada fila
-            row_lengths = [len(row.find_all("td")) for row in rows]
+            row_lengths = table.row_lengths
 
             # Count de la frecuencia de cada longitud
             length_summary = {}
@@ -200,7 +392,7 @@ class ScrapingEngine:
         """
         try:
             country_info = {}
-            rows = table.find("tbody").find_all("tr")
+            rows = ParsedTable.of(table).rows
 
             if not rows:
                 logging.warning("No se encontraron filas en la tabla.")
@@ -244,6 +436,47 @@ class ScrapingEngine:
             raise ValueError(f"Error al obtener la información del país: {e}")
 
 
+    @staticmethod
+    def get_row_img_info(row: Tag) -> dict | None:
+        """
+        Extrae la información de imagen de una fila de la tabla de plantilla.
+
+        Args:
+            row (Tag): Fila de la tabla.
+
+        Return:
+            dict | None: Diccionario con "id_img" e "img_player", o None si la fila no tiene imagen.
+        """
+        player_cell = row.find("td", {"class": "posrela"})
+        if not player_cell:
+            return None
+
+        inline_table = player_cell.find("table", class_="inline-table")
+        if not inline_table:
+            return None
+
+        first_tr = inline_table.find("tr")
+        if not first_tr:
+            return None
+
+        first_td = first_tr.find("td")
+        if not first_td:
+            return None
+
+        img_tag = first_td.find("img")
+        img_player = (img_tag.get("data-src") or img_tag.get("src") or None) if img_tag else None
+
+        id_img = None
+        if img_player:
+            match = PORTRAIT_ID_PATTERN.search(img_player)
+            id_img = match.group(1) if match else None
+
+        return {
+            "id_img": id_img,
+            "img_player": img_player
+        }
+
+
     def get_player_img_info(self, table: BeautifulSoup) -> dict:
         """
         Extrae información de imágenes de jugadores de una tabla HTML.
@@ -256,48 +489,24 @@ class ScrapingEngine:
         """
         try:
             player_info = {}
-            rows = table.find("tbody").find_all("tr")
+            rows = ParsedTable.of(table).rows
 
             if not rows:
                 logging.warning("No se encontraron filas en la tabla.")
                 return player_info
 
             for row in rows:
-                player_cell = row.find("td", {"class": "posrela"})
-                if not player_cell:
-                    continue
-
-                inline_table = player_cell.find("table", class_="inline-table")
-                if not inline_table:
+                img_info = self.get_row_img_info(row)
+                if img_info is None:
                     continue
 
-                first_tr = inline_table.find("tr")
-                if not first_tr:
-                    continue
-
-                first_td = first_tr.find("td")
-                if not first_td:
-                    continue
-
-                img_tag = first_td.find("img")
-                img_player = img_tag.get("data-src") or img_tag.get("src") or None
-
-                id_img = None
-                if img_player:
-                    match = re.search(r"/medium/(\d+-\d+)", img_player)
-                    id_img = match.group(1) if match else None
-
                 id_cell = row.find("td", {"class": "hauptlink"})
                 if id_cell:
                     player_url = id_cell.find("a")["href"]
-                    player_id_match = re.search(r"spieler/(\d+)", player_url)
+                    player_id_match = PLAYER_ID_PATTERN.search(player_url)
 
                     if player_id_match:
-                        player_id = player_id_match.group(1)
-                        player_info[player_id] = {
-                            "id_img": id_img,
-                            "img_player": img_player
-                        }
+                        player_info[player_id_match.group(1)] = img_info
 
             return player_info
 
@@ -317,14 +526,8 @@ class ScrapingEngine:
             str: Fecha en formato SQL o None.
         """
         if element:
-            text = element.get_text(strip=True)
-
-            # Extraemos solo la fecha antes del paréntesis
-            match = re.search(r"([A-Za-z]+\s\d{1,2},\s\d{4})|(\d{1,2}\s[A-Za-z]+\s\d{4})", text)
-
-            if match:
-                raw_date = match.group(0)
-                return self.format_date_to_sql(raw_date)
+            # Patrones precompilados y resultado memorizado por texto (ws_values)
+            return parse_date(element.get_text(strip=True))
 
         return None
 
@@ -344,7 +547,7 @@ class ScrapingEngine:
 
             if img:
                 src = img.get("src", "")
-                match = re.search(r"verysmall/(\d+)", src)
+                match = IMG_ID_PATTERN.search(src)
 
                 if match:
                     return match.group(1)
@@ -366,7 +569,7 @@ class ScrapingEngine:
 
             if img:
                 src = img.get("src", "")
-                match = re.search(r"verysmall/(\d+)", src)
+                match = IMG_ID_PATTERN.search(src)
 
                 if match:
                     return match.group(1)
@@ -389,11 +592,7 @@ class ScrapingEngine:
         else:
             text = cell.get_text(strip=True)
 
-        match = re.search(r"(\d{1,2},\d{1,2})\s*m", text)
-        if match:
-            return self.float_validation(match.group(1))
-
-        return 0.0
+        return parse_height(text)
 
 
     def get_league_tier(self, table: BeautifulSoup) -> Dict[str, str]:
@@ -408,7 +607,7 @@ class ScrapingEngine:
         """
         try:
             competition_to_tier = {}
-            rows = table.find("tbody").find_all("tr")
+            rows = ParsedTable.of(table).rows
 
             if not rows:
                 logging.warning("No se encontraron filas en la tabla.")
@@ -451,28 +650,43 @@ class ScrapingEngine:
                 logging.error(f"No se pudo obtener el HTML de la URL: '{url}'.")
                 raise HTTPClientError(f"No se pudo obtener el HTML de la URL: {url}")
 
-            # Parseamos:
-            soup = BeautifulSoup(respponse.content, "html.parser")
-
-            select_element = soup.find("select", {"name": "saison_id"})
-            if not select_element:
-                logging.error(f"No se encontró el elemento select para las temporadas en la URL: {url}")
-                return []
-
-            # Extraemos las seasons:
-            seasons = [
-                int(option.get("value"))
-                for option in select_element.find_all("option")
-                if option.get("value")
-            ]
+            return self.parse_seasons(respponse.content, url)
 
-            # logging.info(f"Seasons extraídas: {seasons}")
-            return seasons
+        except HTTPCircuitOpenError:
+            raise
 
         except Exception as e:
             logging.error(f"Error al obtener las temporadas de la URL: {url}. \nDetalle: {e}")
             raise HTTPClientError(f"Error al obtener las temporadas de la URL: {url}. \nDetalle: {e}")
 
+
+    def parse_seasons(self, content: bytes, url: str) -> list[int]:
+        """
+        Extrae la lista de temporadas del HTML ya descargado de una liga.
+
+        Args:
+            content (bytes): Contenido HTML de la página.
+            url (str): URL de origen (solo para los mensajes de log).
+
+        Return:
+            list[int]: Lista de temporadas disponibles.
+        """
+        # Parseamos solo el selector de temporadas:
+        select_element = ParsedDocument.parse(content, targets=("seasons",)).seasons_select
+        if not select_element:
+            logging.error(f"No se encontró el elemento select para las temporadas en la URL: {url}")
+            return []
+
+        # Extraemos las seasons:
+        seasons = [
+            int(option.get("value"))
+            for option in select_element.find_all("option")
+            if option.get("value")
+        ]
+
+        # logging.info(f"Seasons extraídas: {seasons}")
+        return seasons
+
     @staticmethod
     def int_validation(value, default) -> int:
         """
@@ -524,35 +738,7 @@ class ScrapingEngine:
         Return:
             float: Valor numérico convertido.
         """
-        try:
-            value = value.replace("€", "").replace(" ", "").strip().lower()
-
-            if value.endswith("bn"):
-                value = value.replace("bn", "")
-                multiplier = 1e9  # Un billón
-
-            elif value.endswith("m"):
-                value = value.replace("m", "")
-                multiplier = 1e6  # Un millón
-
-            elif value.endswith("k"):
-                value = value.replace("k", "")
-                multiplier = 1e3  # Mil
-
-            elif value == "-":
-                return 0.0
-
-            # Si no hay unidades, el multiplicador es 1
-            else:
-                multiplier = 1
-
-            value = value.replace(".", "").replace(",", ".")
-
-            return float(value) * multiplier
-
-        except ValueError:
-            logging.warning(f"No se pudo convertir el valor: {value}")
-            return 0.0
+        return parse_currency(value)
 
     @staticmethod
     def calculate_avg_value(
@@ -618,18 +804,4 @@ class ScrapingEngine:
         Return:
             date | None: Fecha en formato date o None si falla.
         """
-        try:
-            # Detectamos el formato de fecha:
-            date_formats = ["%b %d, %Y", "%d %b %Y", "%Y-%m-%d"]
-            for fmt in date_formats:
-                try:
-                    return datetime.strptime(date_str, fmt).date() # Formateamos a SQL
-
-                except ValueError:
-                    continue
-
-            return None
-
-        except Exception as e:
-            logging.error(f"Error al formatear la fecha '{date_str}' al formato SQL: {e}")
-            return None
+        return parse_date_string(date_str)
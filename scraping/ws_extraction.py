@@ -0,0 +1,247 @@
+import logging
+from typing import Callable, Dict
+from scraping.ws_engine import ScrapingEngine
+from scraping.ws_values import parse_currency
+
+
+class ExtractionPlan:
+    """
+    Plan de extracción compilado a partir de los encabezados de una tabla y de una configuración
+    de campos (`*_field_config`). Cada campo queda resuelto a un índice de columna directo y a su
+    función extractora, de modo que las filas se procesan en un bucle sin búsquedas en el diccionario
+    de encabezados ni cálculos de desplazamiento por celda.
+    """
+    def __init__(self, steps: tuple):
+        """
+        Inicializa el plan.
+
+        Args:
+            steps (tuple): Tupla de (campo, índice de columna | None, extractor, valor por defecto).
+        """
+        self.steps = steps
+
+
+    @classmethod
+    def compile(cls, headers: Dict[str, int], field_config: Dict[str, dict], skip = ()) -> "ExtractionPlan":
+        """
+        Compila el plan de una tabla.
+
+        Args:
+            headers (dict): Encabezados de la tabla y su índice.
+            field_config (dict): Configuración de campos (key, offset, default, transform).
+            skip (Iterable[str], opcional): Campos que no se extraen por columna.
+
+        Return:
+            ExtractionPlan: Plan compilado.
+        """
+        steps = []
+        for field, config in field_config.items():
+            if field in skip:
+                continue
+
+            column = headers.get(config["key"])
+            index = column + config.get("offset", 0) if column is not None else None
+            steps.append((field, index, config["transform"], config.get("default", None)))
+
+        return cls(tuple(steps))
+
+
+    def missing_fields(self) -> list:
+        """
+        Campos cuya columna no existe en los encabezados de la tabla (siempre toman el valor por defecto).
+
+        Return:
+            list[str]: Nombres de los campos.
+        """
+        return [field for field, index, _, _ in self.steps if index is None]
+
+
+    def extract(self, col: list) -> dict:
+        """
+        Extrae todos los campos de una fila.
+
+        Args:
+            col (list): Celdas de la fila.
+
+        Return:
+            dict: Valores extraídos por campo (el valor por defecto si la columna no existe o falla).
+        """
+        values = {}
+        size = len(col)
+
+        for field, index, extractor, default in self.steps:
+            if index is None or index >= size:
+                values[field] = default
+                continue
+
+            try:
+                values[field] = extractor(col[index])
+
+            except (IndexError, AttributeError) as e:
+                logging.warning(f"Error al extraer el valor de la celda: {e}")
+                values[field] = default
+
+        return values
+
+
+    def extract_rows(self, cells: list, min_columns: int) -> list:
+        """
+        Extrae los campos de todas las filas con al menos `min_columns` celdas.
+
+        Args:
+            cells (list): Celdas de cada fila de la tabla.
+            min_columns (int): Número mínimo de columnas requeridas por fila.
+
+        Return:
+            list[dict]: Valores extraídos de cada fila válida, en orden.
+        """
+        records = []
+        for col in cells:
+            if not col or len(col) < min_columns:
+                continue
+
+            try:
+                records.append(self.extract(col))
+
+            except Exception as e:
+                logging.warning(f"No se ha podido extraer los campos de la fila: {e}")
+
+        return records
+
+
+# Extractores especializados de celdas. Cada uno hace una sola búsqueda en la celda.
+
+def cell_text(cell) -> str:
+    """
+    Texto de la celda sin espacios.
+    """
+    return cell.get_text(strip=True)
+
+
+def cell_text_or_none(cell) -> str | None:
+    """
+    Texto de la celda o None si está vacía.
+    """
+    text = cell.get_text(strip=True)
+    return text if text else None
+
+
+def cell_link(base_url: str, suffix: str = "") -> Callable:
+    """
+    Crea un extractor del enlace de la celda.
+
+    Args:
+        base_url (str): URL base que se antepone al href.
+        suffix (str, opcional): Texto que se añade al final de la URL.
+
+    Return:
+        Callable: Extractor que devuelve la URL completa o None si no hay enlace.
+    """
+    def extract(cell):
+        link = cell.find("a")
+        if link is None or "href" not in link.attrs:
+            return None
+
+        return base_url + link["href"] + suffix
+
+    return extract
+
+
+def cell_link_text(cell) -> str | None:
+    """
+    Texto del enlace de la celda o None si no hay enlace.
+    """
+    link = cell.find("a")
+    return link.get_text(strip=True) if link else None
+
+
+def cell_parent_title(cell) -> str | None:
+    """
+    Atributo title del elemento padre de la celda (p. ej. la posición general de la fila).
+    """
+    parent = cell.parent
+    return parent["title"] if parent and "title" in parent.attrs else None
+
+
+def cell_nested_text(row_index: int, cell_index: int) -> Callable:
+    """
+    Crea un extractor del texto de una celda de la tabla anidada en la celda.
+
+    Args:
+        row_index (int): Fila de la tabla anidada.
+        cell_index (int): Celda dentro de esa fila.
+
+    Return:
+        Callable: Extractor que devuelve el texto o None si la tabla anidada no tiene esa celda.
+    """
+    def extract(cell):
+        nested = cell.find("table")
+        if not nested:
+            return None
+
+        rows = nested.find_all("tr")
+        if len(rows) <= row_index:
+            return None
+
+        cells = rows[row_index].find_all("td")
+        if len(cells) <= cell_index:
+            return None
+
+        return cells[cell_index].get_text(strip=True)
+
+    return extract
+
+
+def cell_flag_title(cell) -> str | None:
+    """
+    Título de la bandera (nombre del país) de la celda.
+    """
+    flag = cell.find("img", {"class": "flaggenrahmen"})
+    return flag["title"] if flag else None
+
+
+def cell_int(*removals: str) -> Callable:
+    """
+    Crea un extractor de enteros.
+
+    Args:
+        *removals (str): Caracteres que se eliminan del texto antes de convertirlo (p. ej. "." o "-").
+
+    Return:
+        Callable: Extractor que devuelve el entero o 0 si no se puede convertir.
+    """
+    def extract(cell):
+        text = cell.get_text(strip=True)
+        for removal in removals:
+            text = text.replace(removal, "")
+
+        return ScrapingEngine.int_validation(text, default=0)
+
+    return extract
+
+
+def cell_float(*removals: str) -> Callable:
+    """
+    Crea un extractor de decimales con coma europea.
+
+    Args:
+        *removals (str): Textos que se eliminan antes de convertirlo (p. ej. " %").
+
+    Return:
+        Callable: Extractor que devuelve el decimal o 0.0 si no se puede convertir.
+    """
+    def extract(cell):
+        text = cell.get_text(strip=True).replace(",", ".")
+        for removal in removals:
+            text = text.replace(removal, "")
+
+        return ScrapingEngine.float_validation(text)
+
+    return extract
+
+
+def cell_currency(cell) -> float:
+    """
+    Valor de mercado de la celda convertido a float.
+    """
+    return parse_currency(cell.get_text(strip=True))
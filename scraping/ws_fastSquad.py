@@ -0,0 +1,509 @@
+import os
+import re
+import threading
+from functools import lru_cache
+from html import unescape
+from typing import Dict, List
+from scraping.ws_document import HeaderLayout, ParsedDocument, table_source
+from scraping.ws_values import (
+    IMG_ID_PATTERN,
+    PLAYER_ID_PATTERN,
+    PORTRAIT_ID_PATTERN,
+    parse_date,
+    parse_height,
+    parse_currency
+)
+from config.exceptions import logging
+
+# Variable de entorno con la que se activa el camino rápido ("1")
+FAST_SQUAD_ENV_VAR = "TM_FAST_SQUAD"
+
+# Etiqueta HTML con atributos entre comillas (un ">" dentro de un atributo no cierra la etiqueta)
+TAG_PATTERN = re.compile(
+    r"<(/?)([A-Za-z][A-Za-z0-9]*)((?:\s+[^\s\"'>/=]+(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'>]+))?)*)\s*/?>"
+)
+# Solo las etiquetas estructurales de la tabla: el resto del HTML no se recorre desde Python
+STRUCTURE_PATTERN = re.compile(
+    r"<(/?)(table|thead|tbody|tr|td|th)\b((?:\s+[^\s\"'>/=]+(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'>]+))?)*)\s*/?>",
+    re.IGNORECASE
+)
+# Valor de atributo entre comillas con un "<": podría contener una etiqueta estructural falsa
+QUOTED_LT_PATTERN = re.compile(r"=\s*(?:\"[^\"<]*<|'[^'<]*<)")
+ATTR_PATTERN = re.compile(r"([^\s\"'>/=]+)(?:\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s\"'>]+)))?")
+IMG_PATTERN = re.compile(r"<img\b((?:\s+[^\s\"'>/=]+(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'>]+))?)*)\s*/?>", re.IGNORECASE)
+LINK_PATTERN = re.compile(
+    r"<a\b((?:\s+[^\s\"'>/=]+(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'>]+))?)*)\s*>(.*?)</a\s*>",
+    re.IGNORECASE | re.DOTALL
+)
+LINK_OPEN_PATTERN = re.compile(r"<a\b", re.IGNORECASE)
+
+# Contenido que el camino rápido no reproduce fielmente (comentarios, CDATA, scripts, "<" sueltos...)
+UNSAFE_PATTERN = re.compile(r"<(?![A-Za-z/])|<!|<(?:script|style|template|textarea)\b|</(?![A-Za-z])", re.IGNORECASE)
+
+class FastPathMiss(Exception):
+    """
+    La fila (o la página) no tiene la estructura esperada y se extrae con el parser HTML.
+    """
+    pass
+
+
+class Element:
+    """
+    Elemento estructural de la tabla (table, thead, tbody, tr, td o th) localizado en el HTML.
+    """
+    __slots__ = ("index", "tag", "attrs", "start", "inner_start", "inner_end", "end")
+
+    def __init__(self, index: int, tag: str, attrs: str, start: int, inner_start: int):
+        self.index = index
+        self.tag = tag
+        self.attrs = attrs
+        self.start = start
+        self.inner_start = inner_start
+        self.inner_end = None
+        self.end = None
+
+
+@lru_cache(maxsize=4096)
+def parse_attrs(attrs: str) -> Dict[str, str]:
+    """
+    Atributos de una etiqueta (con las entidades HTML decodificadas, como los parsers).
+    Memorizado: las celdas repiten los mismos atributos en todas las filas (no modificar el resultado).
+
+    Args:
+        attrs (str): Texto de los atributos.
+
+    Return:
+        dict: Atributo -> valor.
+    """
+    values = {}
+    for match in ATTR_PATTERN.finditer(attrs):
+        name = match.group(1).lower()
+        if name in values:
+            continue
+
+        value = next((group for group in match.groups()[1:] if group is not None), "")
+        values[name] = unescape(value)
+
+    return values
+
+
+def has_class(attrs: Dict[str, str], name: str) -> bool:
+    return name in attrs.get("class", "").split()
+
+
+def html_text(html: str) -> str:
+    """
+    Equivalente a `get_text(strip=True)`: texto de cada nodo sin espacios, concatenado.
+
+    Args:
+        html (str): HTML del elemento.
+
+    Return:
+        str: Texto del elemento.
+    """
+    if UNSAFE_PATTERN.search(html):
+        raise FastPathMiss("Contenido no soportado en la celda.")
+
+    return "".join(text for text in (unescape(part).strip() for part in TAG_PATTERN.split(html)[::4]) if text)
+
+
+class SquadScan:
+    """
+    Tabla de plantilla (`table.items`) localizada en el HTML crudo con sus elementos estructurales
+    en orden de documento, sin construir el DOM.
+    """
+    def __init__(self, html: str, elements: List[Element]):
+        self.html = html
+        self.elements = elements
+
+
+    @classmethod
+    def scan(cls, html: str) -> "SquadScan":
+        """
+        Localiza la primera tabla con clase `items` y sus elementos estructurales.
+
+        Args:
+            html (str): HTML de la página.
+
+        Return:
+            SquadScan: Tabla localizada.
+
+        Raises:
+            FastPathMiss: Si no hay tabla o su estructura no está bien cerrada.
+        """
+        elements = []
+        stack = []
+
+        for match in STRUCTURE_PATTERN.finditer(html):
+            closing, tag, attrs = match.groups()
+            tag = tag.lower()
+
+            if not stack:
+                # Antes de la tabla principal solo buscamos su apertura
+                if closing or tag != "table" or not has_class(parse_attrs(attrs), "items"):
+                    continue
+
+            if not closing:
+                element = Element(len(elements), tag, attrs, match.start(), match.end())
+                elements.append(element)
+                stack.append(element)
+                continue
+
+            # Cierres omitidos o cruzados: el parser HTML los corrige, aquí no se intenta
+            if stack[-1].tag != tag:
+                raise FastPathMiss(f"Estructura no cerrada: </{tag}> tras <{stack[-1].tag}>.")
+
+            element = stack.pop()
+            element.inner_end = match.start()
+            element.end = match.end()
+
+            if not stack:
+                table = html[elements[0].start:element.end]
+                if QUOTED_LT_PATTERN.search(table):
+                    raise FastPathMiss("Atributo con '<' en la tabla.")
+
+                return cls(table, cls.rebase(elements, elements[0].start))
+
+        raise FastPathMiss("No se encontró la tabla de jugadores o no está cerrada.")
+
+
+    @staticmethod
+    def rebase(elements: List[Element], offset: int) -> List[Element]:
+        for element in elements:
+            element.start -= offset
+            element.inner_start -= offset
+            element.inner_end -= offset
+            element.end -= offset
+
+        return elements
+
+
+    def inner(self, element: Element) -> str:
+        return self.html[element.inner_start:element.inner_end]
+
+
+    def outer(self, element: Element) -> str:
+        return self.html[element.start:element.end]
+
+
+    def descendants(self, element: Element, tags) -> List[Element]:
+        """
+        Elementos estructurales dentro de `element` (a cualquier profundidad), en orden de documento.
+
+        Args:
+            element (Element): Elemento contenedor.
+            tags (str | tuple): Etiqueta o etiquetas buscadas.
+
+        Return:
+            list[Element]: Elementos encontrados.
+        """
+        tags = (tags,) if isinstance(tags, str) else tags
+        elements = self.elements
+
+        found = []
+        for position in range(element.index + 1, len(elements)):
+            candidate = elements[position]
+            if candidate.start >= element.inner_end:
+                break
+
+            if candidate.tag in tags:
+                found.append(candidate)
+
+        return found
+
+
+    def first(self, element: Element, tag: str, css_class: str = None) -> Element | None:
+        for candidate in self.descendants(element, tag):
+            if css_class is None or has_class(parse_attrs(candidate.attrs), css_class):
+                return candidate
+
+        return None
+
+
+class FastSquadExtractor:
+    """
+    Extracción de plantillas directamente de los bytes de la respuesta con patrones precompilados,
+    sin construir el DOM. Produce los mismos registros que `PlayerManager.extract_player_records`:
+
+    - Cada fila se comprueba antes de extraerla; si tiene contenido que el camino rápido no reproduce
+      fielmente, solo esa fila se parsea con el parser HTML.
+    - Si la página no tiene la estructura esperada (tabla sin thead/tbody, cierres omitidos...),
+      se devuelve None y la plantilla se extrae por el camino normal.
+    - La primera tabla de cada estructura de encabezados se extrae por los dos caminos y se comparan
+      los resultados: si difieren, el camino rápido se desactiva para esa estructura.
+    """
+    def __init__(self, player_manager):
+        """
+        Inicializa el extractor.
+
+        Args:
+            player_manager (PlayerManager): Gestor de jugadores (plan de extracción y camino normal).
+        """
+        self.player_manager = player_manager
+        self.scraping_engine = player_manager.scraping_engine
+        self.verified = {}
+        self.lock = threading.Lock()
+        self.counters = {"fast_pages": 0, "dom_pages": 0, "fast_rows": 0, "fallback_rows": 0}
+
+        # Extractores de bytes por campo del plan (los mismos valores que los extractores de celdas)
+        self.field_extractors = {
+            "player_position": self.nested_text,
+            "birth_date": self.cell_date,
+            "fk_country": self.flag_id,
+            "player_height": lambda scan, cell: parse_height(html_text(scan.inner(cell))),
+            "player_foot": lambda scan, cell: html_text(scan.inner(cell)) or None,
+            "player_joined": self.cell_date,
+            "player_contract": self.cell_date,
+            "fk_team_signed_from": self.first_img_id,
+            "market_value": lambda scan, cell: parse_currency(html_text(scan.inner(cell))),
+        }
+
+
+    @staticmethod
+    def enabled() -> bool:
+        """
+        Indica si el camino rápido está activado con la variable de entorno TM_FAST_SQUAD.
+        """
+        return os.environ.get(FAST_SQUAD_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+    def count(self, key: str, amount: int = 1) -> None:
+        with self.lock:
+            self.counters[key] += amount
+
+
+    def stats(self) -> dict:
+        """
+        Devuelve las páginas y filas extraídas por el camino rápido y por el parser HTML.
+
+        Return:
+            dict: Contadores del extractor.
+        """
+        with self.lock:
+            return dict(self.counters)
+
+
+    def extract(self, content: bytes, min_columns: int) -> List[dict] | None:
+        """
+        Extrae los registros de los jugadores de una página de plantilla.
+
+        Args:
+            content (bytes): Contenido HTML de la página.
+            min_columns (int): Número mínimo de columnas requeridas por fila.
+
+        Return:
+            list[dict] | None: Registros, o None si la página se debe extraer por el camino normal.
+        """
+        try:
+            html = content.decode("utf-8") if isinstance(content, bytes) else content
+            scan = SquadScan.scan(html)
+
+            thead = scan.first(scan.elements[0], "thead")
+            tbody = scan.first(scan.elements[0], "tbody")
+            header_row = scan.first(thead, "tr") if thead else None
+            if header_row is None or tbody is None:
+                raise FastPathMiss("Tabla sin thead o sin tbody.")
+
+            texts = tuple(html_text(scan.inner(cell)) for cell in scan.descendants(header_row, ("th", "td")))
+            rows = [(row, scan.descendants(row, "td")) for row in scan.descendants(tbody, "tr")]
+
+        except (FastPathMiss, UnicodeDecodeError) as e:
+            logging.debug(f"Camino rápido no aplicable a la plantilla: {e}")
+            self.count("dom_pages")
+            return None
+
+        # La estructura es la fila de encabezados y el ancho de fila (como los planes de ScrapingEngine)
+        layout = self.scraping_engine.get_header_layout(texts)
+        row_width = HeaderLayout.row_width(len(cells) for _, cells in rows)
+        structure = (layout, row_width)
+
+        if not layout.headers or not rows or self.verified.get(structure) is False:
+            # Tablas vacías o estructuras ya descartadas: el camino normal se encarga (y de sus avisos)
+            self.count("dom_pages")
+            return None
+
+        plan = self.scraping_engine.get_layout_plan(layout, "player", self.player_manager.compile_plan, row_width)
+        if any(field not in self.field_extractors for field, _, _, _ in plan.steps):
+            self.verified[structure] = False
+            self.count("dom_pages")
+            return None
+
+        return self.scraping_engine.get_table_records(
+            "player", table_source(content) or scan.html, min_columns,
+            lambda: self.extract_rows(scan, thead, rows, structure, plan, min_columns, content)
+        )
+
+
+    def extract_rows(self, scan: SquadScan, thead: Element, rows: List[tuple], structure: tuple, plan, min_columns: int, content) -> List[dict]:
+        """
+        Extrae las filas de la tabla y, la primera vez que aparece la estructura, lo verifica con el camino normal.
+
+        Return:
+            list[dict]: Registros de los jugadores.
+        """
+        records = []
+        fallback_rows = 0
+
+        for row, cells in rows:
+            if not cells or len(cells) < min_columns:
+                continue
+
+            try:
+                records.append(self.extract_row(scan, row, cells, plan))
+
+            except Exception:
+                # Solo esta fila pasa por el parser HTML
+                fallback_rows += 1
+                records.extend(self.extract_row_dom(scan, thead, row, plan, min_columns))
+
+        self.count("fast_rows", len(records) - fallback_rows)
+        self.count("fallback_rows", fallback_rows)
+        self.count("fast_pages")
+
+        if structure not in self.verified:
+            table = ParsedDocument.parse(content, targets=("items",)).table
+            expected = self.player_manager.extract_player_records(table, plan, min_columns) if table else None
+
+            self.verified[structure] = records == expected
+            if not self.verified[structure]:
+                logging.warning("El camino rápido de plantillas no coincide con el parser HTML: se desactiva para esta estructura.")
+                return expected or []
+
+        return records
+
+
+    def extract_row(self, scan: SquadScan, row: Element, cells: List[Element], plan) -> dict:
+        """
+        Extrae una fila con los extractores de bytes (mismos campos que `extract_player_records`).
+
+        Raises:
+            FastPathMiss: Si la fila tiene contenido no soportado.
+        """
+        if UNSAFE_PATTERN.search(scan.inner(row)):
+            raise FastPathMiss("Contenido no soportado en la fila.")
+
+        values = {}
+        size = len(cells)
+        for field, index, _, default in plan.steps:
+            values[field] = default if index is None or index >= size else self.field_extractors[field](scan, cells[index])
+
+        values["general_position"] = None
+        for cell in cells:
+            attrs = parse_attrs(cell.attrs)
+            if "title" in attrs:
+                if not attrs["title"]:
+                    raise FastPathMiss("Atributo title vacío.")
+
+                values["general_position"] = attrs["title"]
+                break
+
+        player_cell = next((cell for cell in cells if has_class(parse_attrs(cell.attrs), "hauptlink")), None)
+        player_link = LINK_PATTERN.search(scan.inner(player_cell)) if player_cell else None
+        if player_cell and not player_link and LINK_OPEN_PATTERN.search(scan.inner(player_cell)):
+            raise FastPathMiss("Enlace del jugador sin cerrar.")
+
+        if player_link:
+            href = parse_attrs(player_link.group(1)).get("href")
+            if href is None:
+                raise FastPathMiss("Enlace del jugador sin href.")
+
+            values["url_player"] = self.player_manager.base_url + href
+            values["player_name"] = html_text(player_link.group(2))
+
+        else:
+            values["url_player"] = None
+            values["player_name"] = None
+
+        id_match = PLAYER_ID_PATTERN.search(values["url_player"]) if player_link else None
+        values["id_player"] = id_match.group(1) if id_match else None
+        values["img_info"] = self.img_info(scan, cells) if values["id_player"] else None
+
+        return values
+
+
+    def extract_row_dom(self, scan: SquadScan, thead: Element, row: Element, plan, min_columns: int) -> List[dict]:
+        """
+        Extrae una sola fila con el parser HTML, envolviéndola en una tabla con los mismos encabezados.
+
+        Return:
+            list[dict]: Registro de la fila (vacío si la fila no se pudo extraer).
+        """
+        fragment = (
+            f'<table class="items"><thead>{scan.inner(thead)}</thead>'
+            f"<tbody>{scan.outer(row)}</tbody></table>"
+        )
+        table = ParsedDocument.parse(fragment, targets=("items",)).table
+        records = self.player_manager.extract_player_records(table, plan, min_columns)
+
+        # Las filas anidadas de esta fila ya se recorren por separado
+        return records[:1]
+
+
+    @staticmethod
+    def cell_date(scan: SquadScan, cell: Element) -> str | None:
+        value = parse_date(html_text(scan.inner(cell)))
+        return value.strftime("%Y-%m-%d") if value else None
+
+
+    @staticmethod
+    def nested_text(scan: SquadScan, cell: Element) -> str | None:
+        # Igual que cell_nested_text(1, 0): primera celda de la segunda fila de la tabla anidada
+        nested = scan.first(cell, "table")
+        if not nested:
+            return None
+
+        rows = scan.descendants(nested, "tr")
+        if len(rows) <= 1:
+            return None
+
+        cells = scan.descendants(rows[1], "td")
+        return html_text(scan.inner(cells[0])) if cells else None
+
+
+    @staticmethod
+    def flag_id(scan: SquadScan, cell: Element) -> str | None:
+        for match in IMG_PATTERN.finditer(scan.inner(cell)):
+            attrs = parse_attrs(match.group(1))
+            if has_class(attrs, "flaggenrahmen"):
+                id_match = IMG_ID_PATTERN.search(attrs.get("src", ""))
+                return id_match.group(1) if id_match else None
+
+        return None
+
+
+    @staticmethod
+    def first_img_id(scan: SquadScan, cell: Element) -> str | None:
+        match = IMG_PATTERN.search(scan.inner(cell))
+        if not match:
+            return None
+
+        id_match = IMG_ID_PATTERN.search(parse_attrs(match.group(1)).get("src", ""))
+        return id_match.group(1) if id_match else None
+
+
+    @staticmethod
+    def img_info(scan: SquadScan, cells: List[Element]) -> dict | None:
+        # Igual que ScrapingEngine.get_row_img_info
+        player_cell = next((cell for cell in cells if has_class(parse_attrs(cell.attrs), "posrela")), None)
+        if not player_cell:
+            return None
+
+        inline_table = scan.first(player_cell, "table", "inline-table")
+        first_tr = scan.first(inline_table, "tr") if inline_table else None
+        first_td = scan.first(first_tr, "td") if first_tr else None
+        if not first_td:
+            return None
+
+        img_tag = IMG_PATTERN.search(scan.inner(first_td))
+        attrs = parse_attrs(img_tag.group(1)) if img_tag else {}
+        img_player = (attrs.get("data-src") or attrs.get("src") or None) if img_tag else None
+
+        id_img = None
+        if img_player:
+            match = PORTRAIT_ID_PATTERN.search(img_player)
+            id_img = match.group(1) if match else None
+
+        return {
+            "id_img": id_img,
+            "img_player": img_player
+        }
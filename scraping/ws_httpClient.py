@@ -1,8 +1,17 @@
+import asyncio
+import functools
 import requests
-from bs4 import BeautifulSoup
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from scraping.ws_parser import parse_html
+from time import sleep, perf_counter
 import validators
 from config.headers import get_headers
+from scraping.ws_rateLimiter import TokenBucket
+from scraping.ws_retryPolicy import RetryPolicy
+from scraping.ws_coalescer import RequestCoalescer
+from scraping.ws_cache import ResponseCache
 from config.exceptions import (
     logging,
     HTTPConnectionError,
@@ -21,7 +30,20 @@ class HTTPClient:
             base_headers = None,
             timeout = 10,
             retries = 10,
-            delay = 6
+            delay = 6,
+            pool_connections = 10,
+            pool_maxsize = 10,
+            host_pool_sizes = None,
+            rate_limiter = None,
+            requests_per_second = None,
+            burst = 1,
+            retry_policy = None,
+            cache = None,
+            coalesce_window = 60,
+            circuit_breaker = None,
+            metrics = None,
+            concurrency = None,
+            archive = None
         ):
         """
         Inicializa el cliente HTTP con parámetros de conexión y reintentos.
@@ -31,12 +53,97 @@ class HTTPClient:
             timeout (int, opcional): Tiempo de espera para la conexión.
             retries (int, opcional): Número de reintentos.
             delay (int, opcional): Segundos entre reintentos.
+            pool_connections (int, opcional): Número de pools de host que se mantienen en caché.
+            pool_maxsize (int, opcional): Conexiones reutilizables por host.
+            host_pool_sizes (dict, opcional): Tamaño de pool específico por host, p. ej. {"www.transfermarkt.com": 20}.
+            rate_limiter (TokenBucket, opcional): Limitador compartido con otros clientes o hilos.
+            requests_per_second (float, opcional): Crea un limitador propio con esta tasa si no se pasa rate_limiter.
+            burst (int, opcional): Tamaño de ráfaga del limitador propio.
+            retry_policy (RetryPolicy, opcional): Política de reintentos. Por defecto se construye con `retries` y `delay`.
+            cache (ResponseCache, opcional): Caché persistente de respuestas para solicitudes GET.
+            coalesce_window (float, opcional): Segundos durante los que se reutiliza la respuesta de un GET reciente.
+                Con 0 solo se agrupan las descargas simultáneas; con None se desactiva el agrupado.
+            circuit_breaker (CircuitBreaker, opcional): Circuit breaker por host compartido por los hilos del crawl.
+            metrics (HTTPMetrics, opcional): Registro de latencias, códigos, reintentos, bytes y aciertos de caché.
+            concurrency (ConcurrencyController, opcional): Controlador adaptativo (AIMD) de solicitudes simultáneas.
+                Si no tiene métricas propias, publica su límite en `metrics`.
+            archive (PageArchive, opcional): Archivo append-only donde se guarda el HTML de cada página descargada.
         """
         self.headers = base_headers
         self.timeout = timeout # Tiempo de espera para la conexión
         self.retries = retries # Número de reintentos
         self.delay = delay # Segundos entre reintentos
         self.url_manager = None # Inicializa el gestor de URL (opcional)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_sizes = host_pool_sizes or {}
+        self.session = self.create_session() # Sesión con conexiones keep-alive reutilizables
+
+        # Limitador de tasa compartido por todos los hilos que usan el cliente (opcional)
+        if rate_limiter is None and requests_per_second:
+            rate_limiter = TokenBucket(requests_per_second, burst)
+
+        self.rate_limiter = rate_limiter
+
+        # Política de reintentos: backoff exponencial con jitter y presupuesto global opcional
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=retries, base_delay=delay)
+        self.cache = cache
+
+        # Agrupado de GET duplicados (simultáneos o recientes) en una única descarga
+        self.coalescer = RequestCoalescer(coalesce_window) if coalesce_window is not None else None
+        self.circuit_breaker = circuit_breaker
+        self.metrics = metrics
+        self.concurrency = concurrency
+        self.archive = archive
+
+        # El límite de concurrencia se publica en las métricas del cliente si el controlador no tiene otras
+        if concurrency is not None and metrics is not None and concurrency.metrics is None:
+            concurrency.metrics = metrics
+            concurrency.publish()
+
+
+    def create_session(self) -> requests.Session:
+        """
+        Crea una sesión de requests con pools de conexiones persistentes (keep-alive).
+        Cada host reutiliza sus conexiones TCP/TLS entre solicitudes.
+
+        Return:
+            requests.Session: Sesión configurada.
+        """
+        session = requests.Session()
+
+        # Adaptador por defecto para cualquier host:
+        default_adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize
+        )
+        session.mount("https://", default_adapter)
+        session.mount("http://", default_adapter)
+
+        # Adaptadores con tamaño de pool específico por host:
+        for host, pool_size in self.host_pool_sizes.items():
+            host_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount(f"https://{host}", host_adapter)
+            session.mount(f"http://{host}", host_adapter)
+
+        return session
+
+
+    def close(self):
+        """
+        Cierra la sesión y libera todas las conexiones del pool.
+        """
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
     def set_url_manager(self, url_manager):
@@ -70,41 +177,193 @@ class HTTPClient:
         if not validators.url(url):
             raise ValueError(f"URL no válida: {url}")
 
-        for attempt in range(self.retries):
+        # Los GET simples a una misma URL comparten una única descarga
+        if self.coalescer is not None and method.upper() == "GET" and not kwargs:
+            return self.coalescer.fetch(
+                ResponseCache.normalize_url(url),
+                lambda: self.load_response(url, method)
+            )
+
+        return self.load_response(url, method, **kwargs)
+
+
+    def load_response(self, url, method="GET", **kwargs):
+        """
+        Obtiene la respuesta de la caché (revalidándola si ha caducado) o de la red.
+
+        Args:
+            url (str): URL a la que se realiza la solicitud.
+            method (str): Método HTTP (por defecto "GET").
+            **kwargs: Argumentos adicionales para requests.
+
+        Return:
+            Response: Objeto de respuesta de requests si es exitosa.
+        """
+        # Solo se cachean los GET simples (sin parámetros extra que cambien la respuesta)
+        use_cache = self.cache is not None and method.upper() == "GET" and not kwargs
+        entry = None
+
+        if use_cache:
+            entry = self.cache.get_entry(url)
+            if entry is not None and entry.is_fresh:
+                if self.metrics is not None:
+                    self.metrics.observe_cache(url, "hit")
+
+                # El archivo debe tener también las páginas servidas desde la caché
+                if self.archive is not None:
+                    self.archive.put(url, entry.response.content, if_changed=True)
+
+                return entry.response
+
+        # Si hay una copia caducada, la revalidamos con un GET condicional
+        conditional_headers = entry.conditional_headers() if entry is not None else None
+        response = self.fetch(url, method, extra_headers=conditional_headers, **kwargs)
+
+        # Archivamos el HTML descargado para poder volver a parsearlo sin repetir el crawl
+        if self.archive is not None and response.status_code == 200:
+            self.archive.put(url, response.content)
+
+        if use_cache:
+            if response.status_code == 304 and entry is not None:
+                self.cache.refresh(url, response)
+                if self.metrics is not None:
+                    self.metrics.observe_cache(url, "revalidated")
+
+                if self.archive is not None:
+                    self.archive.put(url, entry.response.content, if_changed=True)
+
+                return entry.response
+
+            self.cache.set(url, response)
+            if self.metrics is not None:
+                self.metrics.observe_cache(url, "miss")
+
+        return response
+
+
+    def fetch(self, url, method="GET", extra_headers=None, **kwargs):
+        """
+        Descarga una URL de la red aplicando el limitador de tasa y la política de reintentos.
+
+        Args:
+            url (str): URL a la que se realiza la solicitud.
+            method (str): Método HTTP (por defecto "GET").
+            extra_headers (dict, opcional): Cabeceras adicionales, p. ej. las de un GET condicional.
+            **kwargs: Argumentos adicionales para requests.
+
+        Return:
+            Response: Objeto de respuesta de requests si es exitosa (200, o 304 en un GET condicional).
+        """
+        policy = self.retry_policy
+        breaker = self.circuit_breaker
+        metrics = self.metrics
+        concurrency = self.concurrency
+        last_error = None
+
+        for attempt in range(policy.max_attempts):
+            response = None
+            started = None
+
             try:
-                # Headers dinámicos para cada solicitud
-                self.headers = get_headers()
-
-                # Realizamos la solicitud HTTP
-                response = requests.request(
-                    method=method,
-                    url=url,
-                    headers=self.headers,
-                    timeout=self.timeout,
-                    **kwargs,
-                )
+                # Headers dinámicos para cada solicitud (locales: el cliente se comparte entre hilos)
+                headers = {**get_headers(), **(extra_headers or {})}
+
+                # Si el circuito del host está abierto, pausamos (o aparcamos) sin gastar intentos
+                if breaker is not None:
+                    breaker.before_request(url)
+
+                # Esperamos turno en el limitador antes de cada intento
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire()
+
+                # Reabrimos la sesión si se cerró previamente
+                if self.session is None:
+                    self.session = self.create_session()
+
+                # Ocupamos una plaza del control adaptativo de concurrencia
+                if concurrency is not None:
+                    concurrency.acquire()
+
+                # Realizamos la solicitud HTTP reutilizando las conexiones del pool
+                started = perf_counter()
+                try:
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        timeout=self.timeout,
+                        **kwargs,
+                    )
+                    elapsed = perf_counter() - started
+
+                finally:
+                    if concurrency is not None:
+                        concurrency.release()
+
+                if concurrency is not None:
+                    concurrency.record_response(response.status_code, elapsed)
+
+                if metrics is not None:
+                    metrics.observe_response(url, response.status_code, elapsed, len(response.content))
+
+                if breaker is not None:
+                    breaker.record_status(url, response.status_code)
 
                 if response.status_code == 200:
                     return response
-                else:
-                    logging.warning(f"HTTP: {response.status_code} para {url}")
+
+                # La copia local sigue siendo válida
+                if response.status_code == 304 and extra_headers:
+                    return response
+
+                # Errores permanentes (404, 410...): no tiene sentido reintentar
+                if not policy.is_retryable_status(response.status_code):
+                    logging.warning(f"HTTP: {response.status_code} para {url} (no se reintenta)")
+                    raise HTTPResponseError(
+                        response.status_code,
+                        f"Error: HTTP {response.status_code} al acceder a la URL {url}."
+                    )
+
+                logging.warning(f"HTTP: {response.status_code} para {url}")
+                last_error = HTTPResponseError(
+                    response.status_code,
+                    f"Error: HTTP {response.status_code} al acceder a la URL {url} después de {attempt + 1} intentos."
+                )
 
             except requests.Timeout:
-                logging.warning(f"Timeout: Fallo en intento {attempt + 1}/{self.retries}")
+                if concurrency is not None:
+                    concurrency.record_timeout()
 
-                if attempt == self.retries - 1:
-                    raise HTTPTimeoutError(f"Error: Timeout al acceder a la URL {url} después de {self.retries} intentos.")
+                if metrics is not None and started is not None:
+                    metrics.observe_error(url, "timeout", perf_counter() - started)
+
+                if breaker is not None:
+                    breaker.record_failure(url)
+
+                logging.warning(f"Timeout: Fallo en intento {attempt + 1}/{policy.max_attempts}")
+                last_error = HTTPTimeoutError(f"Error: Timeout al acceder a la URL {url} después de {attempt + 1} intentos.")
 
             except requests.RequestException as e:
-                logging.warning(f"Timeout: Fallo en intento {attempt + 1}/{self.retries}")
+                if metrics is not None and started is not None:
+                    metrics.observe_error(url, "connection", perf_counter() - started)
+
+                if breaker is not None:
+                    breaker.record_failure(url)
+
+                logging.warning(f"Conexión: Fallo en intento {attempt + 1}/{policy.max_attempts}: {e}")
+                last_error = HTTPConnectionError(f"Error: No se puede acceder a la URL {url} después de {attempt + 1} intentos.")
+
+            # Sin intentos o sin presupuesto global de reintentos: abandonamos la URL
+            if not policy.can_retry(attempt):
+                break
 
-                if attempt == self.retries - 1:
-                    raise HTTPConnectionError(f"Error: No se puede acceder a la URL {url} después de {self.retries} intentos.")
+            if metrics is not None:
+                metrics.observe_retry(url)
 
-            # Pausamos antes de reintento
-            sleep(self.delay * 2)
+            # Pausamos antes de reintento (backoff exponencial con jitter o Retry-After)
+            sleep(policy.get_delay(attempt, response))
 
-        raise Exception(f"Error: No se puede acceder a la URL {url} después de {self.retries} intentos.")
+        raise last_error
 
 
     def retry_request(self, func, *args, **kwargs):
@@ -119,15 +378,21 @@ class HTTPClient:
         Return:
             Resultado de la función si es exitosa.
         """
-        for attempt in range(self.retries):
+        policy = self.retry_policy
+
+        for attempt in range(policy.max_attempts):
             try:
                 return func(*args, **kwargs)
 
             except requests.RequestException as e:
-                logging.warning(f"Intento {attempt + 1}/{self.retries} fallido: {e}")
-                sleep(self.delay * 2)
+                logging.warning(f"Intento {attempt + 1}/{policy.max_attempts} fallido: {e}")
+
+                if not policy.can_retry(attempt):
+                    break
+
+                sleep(policy.get_delay(attempt, getattr(e, "response", None)))
 
-        raise Exception(f"Error: No se puede completar la solicitud después de {self.retries} intentos.")
+        raise HTTPClientError(f"Error: No se puede completar la solicitud después de {attempt + 1} intentos.")
 
 
     def get_html(self, url: str, **kwargs):
@@ -147,7 +412,7 @@ class HTTPClient:
         try:
             # Realizar la solicitud HTTP
             response = self.make_request(url, **kwargs)
-            return BeautifulSoup(response.content, "html.parser")
+            return parse_html(response.content)
 
         except requests.RequestException as e:
             logging.error(f"Error de conexión al obtener el HTML de la URL: {url}. \nDetalle: {e}")
@@ -175,4 +440,144 @@ class HTTPClient:
         except Exception as e:
             logging.error(f"Error al obtener el JSON de la URL: {url}: {e}")
 
-        return None
\ No newline at end of file
+        return None
+
+
+class AsyncHTTPClient:
+    """
+    Cliente HTTP asíncrono construido sobre HTTPClient.
+    Mantiene la misma semántica de reintentos y validación que HTTPClient, limitando
+    el número de solicitudes simultáneas de forma global y por host.
+    """
+    def __init__(
+            self,
+            http_client: HTTPClient = None,
+            max_concurrency = 10,
+            per_host_limit = 4
+        ):
+        """
+        Inicializa el cliente asíncrono.
+
+        Args:
+            http_client (HTTPClient, opcional): Cliente síncrono que ejecuta las solicitudes.
+            max_concurrency (int, opcional): Máximo de solicitudes simultáneas en total.
+            per_host_limit (int, opcional): Máximo de solicitudes simultáneas por host.
+        """
+        self.http_client = http_client or HTTPClient(
+            pool_maxsize=max(max_concurrency, per_host_limit)
+        )
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+
+        # Hilos dedicados: cada solicitud en curso ocupa uno mientras espera la red
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="async-http"
+        )
+        self.global_semaphore = asyncio.Semaphore(max_concurrency)
+        self.host_semaphores = {}
+
+
+    def get_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """
+        Devuelve el semáforo asociado al host de la URL, creándolo si no existe.
+
+        Args:
+            url (str): URL de la solicitud.
+
+        Return:
+            asyncio.Semaphore: Semáforo del host.
+        """
+        host = urlparse(url).netloc.lower()
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+
+        return self.host_semaphores[host]
+
+
+    async def make_request(self, url, method="GET", **kwargs):
+        """
+        Realiza una solicitud HTTP asíncrona con los mismos reintentos y errores que HTTPClient.make_request.
+
+        Args:
+            url (str): URL a la que se realiza la solicitud.
+            method (str): Método HTTP (por defecto "GET").
+            **kwargs: Argumentos adicionales para requests.
+
+        Return:
+            Response: Objeto de respuesta de requests si es exitosa.
+        """
+        if not validators.url(url):
+            raise ValueError(f"URL no válida: {url}")
+
+        # Primero el límite por host, para no ocupar plazas globales mientras se espera a un host saturado
+        async with self.get_host_semaphore(url):
+            async with self.global_semaphore:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self.executor,
+                    functools.partial(self.http_client.make_request, url, method, **kwargs)
+                )
+
+
+    async def get_html(self, url: str, **kwargs):
+        """
+        Realiza una solicitud GET asíncrona y devuelve el HTML como un objeto BeautifulSoup.
+
+        Args:
+            url (str): URL de la página a obtener.
+
+        Return:
+            BeautifulSoup | None: Objeto BeautifulSoup con el HTML o None si falla.
+        """
+        if not validators.url(url):
+            logging.error(f"URL no válida: {url}")
+            return None
+
+        try:
+            response = await self.make_request(url, **kwargs)
+            return parse_html(response.content)
+
+        except requests.RequestException as e:
+            logging.error(f"Error de conexión al obtener el HTML de la URL: {url}. \nDetalle: {e}")
+
+        except Exception as e:
+            logging.error(f"Error al obtener el HTML de la URL: {url}. \nDetalle: {e}")
+
+        return None
+
+
+    async def get_json(self, url, **kwargs):
+        """
+        Realiza una solicitud GET asíncrona y devuelve la respuesta en formato JSON.
+
+        Args:
+            url (str): URL de la API o recurso JSON.
+
+        Return:
+            dict | None: Diccionario con la respuesta JSON o None si falla.
+        """
+        try:
+            response = await self.make_request(url, **kwargs)
+            return response.json()
+
+        except Exception as e:
+            logging.error(f"Error al obtener el JSON de la URL: {url}: {e}")
+
+        return None
+
+
+    def close(self):
+        """
+        Detiene los hilos de trabajo y cierra la sesión del cliente síncrono.
+        """
+        self.executor.shutdown(wait=True)
+        self.http_client.close()
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
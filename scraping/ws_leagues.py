@@ -1,12 +1,21 @@
+import os
 import logging
 import json
+import asyncio
 from bs4 import BeautifulSoup
+from scraping.ws_document import ParsedDocument, ParsedTable
+from scraping.ws_extraction import ExtractionPlan, cell_text, cell_link, cell_flag_title, cell_int, cell_float, cell_currency
 from scraping.ws_engine import ScrapingEngine
 from scraping.ws_entities import League, LeagueStats, Team, Country, Region
 from scraping.ws_teams import TeamManager
 from scraping.ws_dataManager import DataManager
+from scraping.ws_scheduler import CrawlScheduler
+from config.exceptions import HTTPCircuitOpenError
 from typing import List, Dict
 
+# Variable de entorno con el número de plantillas que se descargan a la vez por temporada
+SQUAD_WORKERS_ENV_VAR = "TM_SQUAD_WORKERS"
+
 class LeagueManager:
     """
     Clase para gestionar la extracción y procesamiento de datos de ligas desde Transfermarkt.
@@ -21,127 +30,91 @@ class LeagueManager:
         "transform": lambda x: x
     }
 
-    # Configuración de campos para extraer datos de la tabla
+    # Configuración de campos para extraer datos de la tabla. Se compila a un ExtractionPlan por tabla.
     league_field_config = {
         "competition_name": {
             **base_config,
             "key": "competition",
-            "transform": lambda x: x.get_text(strip=True) if x else None
+            "transform": cell_text
         },
         "competition_url": {
             **base_config,
             "key": "competition",
-            "transform": lambda x: (
-                LeagueManager.base_url + x.find("a")["href"]
-
-                if x and x.find("a") and "href" in x.find("a").attrs
-                else None
-            )
+            "transform": cell_link(base_url)
         },
         "country_name": {
             **base_config,
             "key": "country",
-            "transform": lambda x: (
-                x.find("img", {"class": "flaggenrahmen"})["title"]
-                if x and x.find("img", {"class": "flaggenrahmen"})
-                else None
-            )
+            "transform": cell_flag_title
         },
         "total_clubs": {
             **base_config,
             "key": "clubs",
-            "transform": lambda x: ScrapingEngine.int_validation(
-                x.get_text(strip=True)
-                .replace(".", "")
-                .replace("-", ""),
-                default=0
-                )
-                if x else 0
+            "transform": cell_int(".", "-")
         },
         "total_players": {
             **base_config,
             "key": "player",
-            "transform": lambda x: ScrapingEngine.int_validation(
-                x.get_text(strip=True)
-                .replace(".", "")
-                .replace("-", ""),
-                default=0
-                )
-                if x else 0
+            "transform": cell_int(".", "-")
         },
         "avg_age": {
             **base_config,
             "key": "avg_age",
-            "transform": lambda x: ScrapingEngine.float_validation(
-                x.get_text(strip=True)
-                .replace(",", ".")
-                )
-                if x else 0.0
+            "transform": cell_float()
         },
         "foreigners": {
             **base_config,
             "key": "foreigners",
-            "transform": lambda x: ScrapingEngine.float_validation(
-                x.get_text(strip=True)
-                .replace(",", ".")
-                .replace(" %", "")
-                )
-                if x else 0.0
+            "transform": cell_float(" %")
         },
         "game_ratio_of_foreign_players": {
             **base_config,
             "key": "game_ratio_of_foreign_players",
-            "transform": lambda x: ScrapingEngine.float_validation(
-                x.get_text(strip=True)
-                .replace(",", ".")
-                .replace(" %", "")
-                )
-                if x else 0.0
+            "transform": cell_float(" %")
         },
         "goals_per_match": {
             **base_config,
             "key": "goals_per_match",
-            "transform": lambda x: ScrapingEngine.float_validation(
-                x.get_text(strip=True)
-                .replace(",", ".")
-                )
-                if x else 0.0
+            "transform": cell_float()
         },
         "avg_market_value": {
             **base_config,
             "key": "avg_market_value",
-            "transform": lambda x: ScrapingEngine.parse_currency_to_float(
-                x.get_text(strip=True)
-                )
-                if x else 0.0
+            "transform": cell_currency
         },
         "total_value": {
             **base_config,
             "key": "total_value",
-            "transform": lambda x: ScrapingEngine.parse_currency_to_float(
-                x.get_text(strip=True)
-                )
-                if x else 0.0
+            "transform": cell_currency
         }
     }
 
-    def __init__(self, scraping_engine: ScrapingEngine, data_manager: DataManager):
+    def __init__(self, scraping_engine: ScrapingEngine, data_manager: DataManager, squad_workers: int = None):
         """
         Inicializa el LeagueManager con el motor de scraping y el gestor de datos.
 
         Args:
             scraping_engine (ScrapingEngine): Motor de scraping.
             data_manager (DataManager): Gestor de datos.
+            squad_workers (int, opcional): Plantillas que se descargan a la vez en cada temporada.
+                Por defecto la variable de entorno TM_SQUAD_WORKERS o 1 (una tras otra).
         """
         self.scraping_engine = scraping_engine
         self.data_manager = DataManager(http_client=scraping_engine.http_client)
 
+        if squad_workers is None:
+            squad_workers = int(os.environ.get(SQUAD_WORKERS_ENV_VAR) or 1)
+
+        self.squad_workers = max(1, squad_workers)
+
 
     def process_league_season(
             self,
             league: League,
             region: Region,
-            team_manager: TeamManager
+            team_manager: TeamManager,
+            scheduler: CrawlScheduler = None,
+            tier: str = None
 
         ) -> None:
         """
@@ -151,6 +124,8 @@ class LeagueManager:
             league (League): Liga a procesar.
             region (Region): Región a la que pertenece la liga.
             team_manager (TeamManager): Gestor de equipos.
+            scheduler (CrawlScheduler, opcional): Planificador al que se envían las temporadas como tareas.
+            tier (str, opcional): Tier de la liga, usado para la prioridad de las tareas.
         """
 
         # logging.info(f"Iniciando el procesamiento de temporadas para la liga: {league.competition}")
@@ -163,42 +138,135 @@ class LeagueManager:
         seasons = [season for season in seasons if season == 2024]
 
         for season in seasons:
-            season_key = f"{season}/{season + 1}"
-            # logging.info(f"Procesando temporada: {season_key} para la liga: {league.competition}")
+            if scheduler is not None:
+                scheduler.submit(
+                    self.process_season,
+                    league, region, team_manager, season, scheduler, tier,
+                    priority=scheduler.get_priority(tier, season, depth=1),
+                    name=f"{league.competition} {season}"
+                )
 
-            try:
-                league.season = season
+            else:
+                self.process_season(league, region, team_manager, season)
 
-                # Construimos la URL dinámica para la temporada
-                season_url = f"{league.url_league}/plus/?saison_id={season}"
-                team_response = self.scraping_engine.http_client.make_request(season_url)
 
-                if not team_response:
-                    logging.warning(f"No se pudo obtener el HTML de la liga: {season_url}")
-                    continue
+    def process_season(
+            self,
+            league: League,
+            region: Region,
+            team_manager: TeamManager,
+            season: int,
+            scheduler: CrawlScheduler = None,
+            tier: str = None
 
-                team_soup = BeautifulSoup(team_response.content, "html.parser")
-                team_table = team_soup.find("table", {"class": "items"})
+        ) -> None:
+        """
+        Procesa una temporada de una liga: extrae sus equipos y los jugadores de cada equipo.
 
-                if not team_table:
-                    logging.warning(f"No se encontró la tabla de equipos en la liga: {season_url}")
-                    continue
+        Args:
+            league (League): Liga a procesar.
+            region (Region): Región a la que pertenece la liga.
+            team_manager (TeamManager): Gestor de equipos.
+            season (int): Año de inicio de la temporada.
+            scheduler (CrawlScheduler, opcional): Planificador al que se envían los equipos como tareas.
+            tier (str, opcional): Tier de la liga, usado para la prioridad de las tareas.
+        """
+        season_key = f"{season}/{season + 1}"
+        # logging.info(f"Procesando temporada: {season_key} para la liga: {league.competition}")
 
-                # Llamamos a get_team_data en el objeto correcto (TeamManager)
-                teams = team_manager.get_team_data(
-                    table=team_table,
-                    min_columns=5,
-                    region=region,
-                    league=league
-                )
+        try:
+            league.season = season
+
+            # Construimos la URL dinámica para la temporada
+            season_url = self.build_season_url(league, season)
+            team_response = self.scraping_engine.http_client.make_request(season_url)
+
+            if not team_response:
+                logging.warning(f"No se pudo obtener el HTML de la liga: {season_url}")
+                return
+
+            teams = self.add_season_teams(league, region, team_manager, season_key, team_response.content, season_url)
+            if teams is None:
+                return
+
+            if scheduler is None and self.squad_workers > 1:
+                # Plantillas de la temporada con un pool acotado; los jugadores se agregan en orden
+                team_manager.process_teams_players(teams, self.squad_workers)
 
-                # Agregamos los equipos a la temporada correspondiente
+            else:
                 for team in teams:
-                    league.add_team_to_season(
-                        season_key=season_key,
-                        team=team
-                    )
-                    team_manager.process_team_players(team)
+                    if scheduler is not None:
+                        scheduler.submit(
+                            team_manager.process_team_players,
+                            team,
+                            priority=scheduler.get_priority(tier, season, depth=2),
+                            name=team.team_name
+                        )
+
+                    else:
+                        team_manager.process_team_players(team)
+
+            logging.info(f"Se procesaron {len(teams)} equipos para la temporada: {season_key}")
+
+        except HTTPCircuitOpenError:
+            # El planificador aparca la tarea hasta que se cierre el circuito
+            raise
+
+        except Exception as e:
+            logging.error(f"Error al procesar la temporada {season_key} para la liga {league.competition}: {e}")
+
+
+    async def process_league_season_async(
+            self,
+            league: League,
+            region: Region,
+            team_manager: TeamManager,
+            async_client
+
+        ) -> None:
+        """
+        Versión asíncrona de process_league_season: las plantillas de los equipos
+        de cada temporada se descargan de forma concurrente.
+
+        Args:
+            league (League): Liga a procesar.
+            region (Region): Región a la que pertenece la liga.
+            team_manager (TeamManager): Gestor de equipos.
+            async_client (AsyncHTTPClient): Cliente HTTP asíncrono.
+        """
+        try:
+            response = await async_client.make_request(league.url_league)
+            seasons = self.scraping_engine.parse_seasons(response.content, league.url_league)
+
+        except Exception as e:
+            logging.error(f"Error al obtener las temporadas de la liga {league.competition}: {e}")
+            return
+
+        if not seasons:
+            logging.warning(f"No se encontraron temporadas para la liga: {league.competition}")
+            return
+
+        # Filtro TEMPORAL para solo procesar la temporada 2024
+        seasons = [season for season in seasons if season == 2024]
+
+        for season in seasons:
+            season_key = f"{season}/{season + 1}"
+
+            try:
+                league.season = season
+
+                season_url = self.build_season_url(league, season)
+                team_response = await async_client.make_request(season_url)
+
+                teams = self.add_season_teams(league, region, team_manager, season_key, team_response.content, season_url)
+                if teams is None:
+                    continue
+
+                # Descargamos las plantillas de todos los equipos de la temporada a la vez
+                await asyncio.gather(*(
+                    team_manager.process_team_players_async(team, async_client)
+                    for team in teams
+                ))
 
                 logging.info(f"Se procesaron {len(teams)} equipos para la temporada: {season_key}")
 
@@ -206,37 +274,66 @@ class LeagueManager:
                 logging.error(f"Error al procesar la temporada {season_key} para la liga {league.competition}: {e}")
 
 
-    def extract_cell_value(
-            self,
-            headers,
-            col,
-            key,
-            offset: int = 2,
-            default=None,
-            transform=lambda x: x
-        ):
+    def build_season_url(self, league: League, season: int) -> str:
         """
-        Extrae y transforma el valor de una celda de la tabla según la configuración.
+        Construye la URL de la tabla de equipos de una liga para una temporada.
 
         Args:
-            headers (dict): Diccionario de encabezados de la tabla.
-            col (list): Lista de celdas de la fila.
-            key (str): Clave del encabezado.
-            offset (int): Desplazamiento para la columna.
-            default: Valor por defecto si falla la extracción.
-            transform (callable): Función de transformación para el valor.
+            league (League): Liga.
+            season (int): Año de inicio de la temporada.
 
         Return:
-            Valor extraído y transformado, o el valor por defecto.
+            str: URL de la temporada.
         """
+        return f"{league.url_league}/plus/?saison_id={season}"
 
-        try:
-            cell = col[headers[key] + offset] if headers.get(key) is not None else None
-            return transform(cell) if cell else default
 
-        except (IndexError, AttributeError) as e:
-            logging.warning(f"Error al extraer el valor de la celda: {e}")
-            return default
+    def add_season_teams(
+            self,
+            league: League,
+            region: Region,
+            team_manager: TeamManager,
+            season_key: str,
+            content: bytes,
+            season_url: str
+
+        ) -> List[Team] | None:
+        """
+        Parsea la tabla de equipos de una temporada y los agrega a la liga.
+
+        Args:
+            league (League): Liga a la que pertenecen los equipos.
+            region (Region): Región de la liga.
+            team_manager (TeamManager): Gestor de equipos.
+            season_key (str): Clave de la temporada (p. ej. "2024/2025").
+            content (bytes): Contenido HTML de la página de la temporada.
+            season_url (str): URL de la temporada (solo para los mensajes de log).
+
+        Return:
+            List[Team] | None: Equipos agregados o None si no se encontró la tabla.
+        """
+        team_table = ParsedDocument.parse(content, targets=("items",)).table
+
+        if not team_table:
+            logging.warning(f"No se encontró la tabla de equipos en la liga: {season_url}")
+            return None
+
+        # Llamamos a get_team_data en el objeto correcto (TeamManager)
+        teams = team_manager.get_team_data(
+            table=team_table,
+            min_columns=5,
+            region=region,
+            league=league
+        )
+
+        # Agregamos los equipos a la temporada correspondiente
+        for team in teams:
+            league.add_team_to_season(
+                season_key=season_key,
+                team=team
+            )
+
+        return teams
 
 
     def get_league_data(
@@ -261,37 +358,32 @@ class LeagueManager:
         """
 
         # Extraemos los encabezados de la tabla:
+        table = ParsedTable.of(table)
         headers = self.scraping_engine.get_table_headers(table)
         if not headers:
             logging.error("No se encontraron encabezados en la tabla.")
             return []
 
         # Extraemos las filas de la tabla:
-        rows = table.find("tbody").find_all("tr")
+        rows = table.rows
         if not rows:
             logging.warning("No se encontraron filas en la tabla.")
             return []
 
-        leagues = []
-        for row in rows:
-            col = row.find_all("td")
-            if not col or len(col) < min_columns:
-                continue
+        # Plan de extracción compilado una vez por estructura de encabezados (compartido entre tablas idénticas)
+        plan = self.scraping_engine.get_table_plan(
+            table, "league",
+            lambda headers: ExtractionPlan.compile(headers, self.league_field_config)
+        )
 
-            try:
-                # Extraer valores dinámicamente usando el diccionario de configuración
-                extracted_values = {
-                    field: self.extract_cell_value(
-                        headers=headers,
-                        col=col,
-                        key=config["key"],
-                        offset=config.get("offset", 0),
-                        default=config.get("default", None),
-                        transform=config["transform"]
-                    )
-                    for field, config in self.league_field_config.items()
-                }
+        # Extraemos los valores de las filas con el plan compilado (o de la caché de parseo si la tabla no ha cambiado)
+        records = self.scraping_engine.get_table_records(
+            "league", table, min_columns, lambda: plan.extract_rows(table.cells, min_columns)
+        )
 
+        leagues = []
+        for extracted_values in records:
+            try:
                 # Instancia de LeagueStats
                 league_stats = LeagueStats(
                     fk_league=extracted_values["competition_url"].split("/")[-1] if extracted_values["competition_url"] else None,
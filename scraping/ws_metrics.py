@@ -0,0 +1,365 @@
+import os
+import re
+import threading
+from time import time
+from collections import defaultdict
+from config.exceptions import logging
+
+# Patrones de URL con los que se agrupan las métricas. Se aplica el primero que coincida.
+DEFAULT_URL_PATTERNS = [
+    ("region", r"/wettbewerbe/[^/]+/wettbewerbe"),  # Listados de regiones
+    ("squad", r"/kader/verein/"),                     # Plantillas de equipos
+    ("league_season", r"/plus/\?saison_id="),         # Tablas de equipos por temporada
+    ("league", r"/wettbewerb/"),                      # Páginas de ligas
+]
+
+# Límites superiores (segundos) de los buckets del histograma de latencias
+DEFAULT_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CACHE_RESULTS = ("hit", "revalidated", "miss")
+
+
+class Histogram:
+    """
+    Histograma acumulativo con buckets fijos, al estilo de Prometheus.
+    """
+    def __init__(self, buckets):
+        """
+        Inicializa el histograma vacío.
+
+        Args:
+            buckets (Iterable[float]): Límites superiores de los buckets, en orden creciente.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1) # El último bucket es +Inf
+        self.total = 0.0
+        self.count = 0
+
+
+    def observe(self, value: float) -> None:
+        """
+        Registra una observación.
+
+        Args:
+            value (float): Valor observado.
+        """
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+
+        self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+    def cumulative(self) -> list:
+        """
+        Devuelve los recuentos acumulados por bucket.
+
+        Return:
+            list: Lista de (límite, recuento acumulado), terminando en "+Inf".
+        """
+        result = []
+        running = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            running += count
+            result.append((bound, running))
+
+        return result
+
+
+class HTTPMetrics:
+    """
+    Métricas de las solicitudes HTTP agrupadas por patrón de URL: histogramas de latencia,
+    códigos de estado, errores de red, reintentos, bytes descargados y aciertos de caché.
+    Se consultan con `snapshot()` o se exportan en formato de texto de Prometheus,
+    bajo demanda (`write_prometheus`) o periódicamente (`start_exporter`).
+    """
+    def __init__(self, url_patterns = None, buckets = None, prefix: str = "transfermarkt"):
+        """
+        Inicializa los contadores vacíos.
+
+        Args:
+            url_patterns (list, opcional): Lista de (nombre, regex) evaluada en orden.
+            buckets (Iterable[float], opcional): Límites de los buckets de latencia en segundos.
+            prefix (str, opcional): Prefijo de los nombres de las métricas exportadas.
+        """
+        self.url_patterns = [
+            (name, re.compile(pattern))
+            for name, pattern in (DEFAULT_URL_PATTERNS if url_patterns is None else url_patterns)
+        ]
+        self.buckets = tuple(DEFAULT_LATENCY_BUCKETS if buckets is None else buckets)
+        self.prefix = prefix
+        self.lock = threading.Lock()
+
+        self.latency = {}                   # {patrón: Histogram}
+        self.statuses = defaultdict(int)    # {(patrón, código): recuento}
+        self.errors = defaultdict(int)      # {(patrón, tipo): recuento}
+        self.retries = defaultdict(int)     # {patrón: recuento}
+        self.bytes = defaultdict(int)       # {patrón: bytes}
+        self.cache = defaultdict(int)       # {(patrón, resultado): recuento}
+        self.gauges = {}                    # {nombre: valor}
+
+        self.exporter = None
+        self.exporter_stop = threading.Event()
+
+
+    def get_pattern(self, url: str) -> str:
+        """
+        Devuelve el nombre del patrón al que pertenece una URL.
+
+        Args:
+            url (str): URL de la solicitud.
+
+        Return:
+            str: Nombre del patrón u "other" si no coincide ninguno.
+        """
+        for name, pattern in self.url_patterns:
+            if pattern.search(url):
+                return name
+
+        return "other"
+
+
+    def observe_response(self, url: str, status_code: int, seconds: float, size: int) -> None:
+        """
+        Registra un intento que obtuvo respuesta del servidor.
+
+        Args:
+            url (str): URL de la solicitud.
+            status_code (int): Código de estado.
+            seconds (float): Duración del intento.
+            size (int): Tamaño del cuerpo en bytes.
+        """
+        pattern = self.get_pattern(url)
+
+        with self.lock:
+            if pattern not in self.latency:
+                self.latency[pattern] = Histogram(self.buckets)
+
+            self.latency[pattern].observe(seconds)
+            self.statuses[(pattern, status_code)] += 1
+            self.bytes[pattern] += size
+
+
+    def observe_error(self, url: str, kind: str, seconds: float) -> None:
+        """
+        Registra un intento sin respuesta (timeout o error de conexión).
+
+        Args:
+            url (str): URL de la solicitud.
+            kind (str): Tipo de error, p. ej. "timeout" o "connection".
+            seconds (float): Duración del intento.
+        """
+        pattern = self.get_pattern(url)
+
+        with self.lock:
+            if pattern not in self.latency:
+                self.latency[pattern] = Histogram(self.buckets)
+
+            self.latency[pattern].observe(seconds)
+            self.errors[(pattern, kind)] += 1
+
+
+    def observe_retry(self, url: str) -> None:
+        """
+        Registra un reintento.
+
+        Args:
+            url (str): URL de la solicitud.
+        """
+        pattern = self.get_pattern(url)
+
+        with self.lock:
+            self.retries[pattern] += 1
+
+
+    def observe_cache(self, url: str, result: str) -> None:
+        """
+        Registra el resultado de una consulta a la caché.
+
+        Args:
+            url (str): URL de la solicitud.
+            result (str): "hit" (fresca), "revalidated" (304) o "miss" (descargada).
+        """
+        if result not in CACHE_RESULTS:
+            raise ValueError(f"Resultado de caché no válido: {result}")
+
+        pattern = self.get_pattern(url)
+
+        with self.lock:
+            self.cache[(pattern, result)] += 1
+
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """
+        Fija el valor de un indicador, p. ej. la concurrencia actual del crawl.
+
+        Args:
+            name (str): Nombre del indicador.
+            value (float): Valor actual.
+        """
+        with self.lock:
+            self.gauges[name] = value
+
+
+    def snapshot(self) -> dict:
+        """
+        Devuelve una copia de todas las métricas agrupadas por patrón de URL.
+
+        Return:
+            dict: {"patterns": {patrón: {...}}, "gauges": {...}}
+        """
+        with self.lock:
+            patterns = set(self.latency) | set(self.retries) | set(self.bytes)
+            patterns |= {pattern for pattern, _ in self.cache}
+
+            result = {}
+            for pattern in sorted(patterns):
+                histogram = self.latency.get(pattern)
+                cache = {res: self.cache.get((pattern, res), 0) for res in CACHE_RESULTS}
+                lookups = sum(cache.values())
+
+                result[pattern] = {
+                    "requests": histogram.count if histogram else 0,
+                    "latency_sum": round(histogram.total, 6) if histogram else 0.0,
+                    "latency_avg": round(histogram.total / histogram.count, 6) if histogram and histogram.count else 0.0,
+                    "latency_buckets": dict(histogram.cumulative()) if histogram else {},
+                    "statuses": {
+                        status: count for (pat, status), count in sorted(self.statuses.items()) if pat == pattern
+                    },
+                    "errors": {
+                        kind: count for (pat, kind), count in sorted(self.errors.items()) if pat == pattern
+                    },
+                    "retries": self.retries.get(pattern, 0),
+                    "bytes": self.bytes.get(pattern, 0),
+                    "cache": cache,
+                    "cache_hit_ratio": round((cache["hit"] + cache["revalidated"]) / lookups, 4) if lookups else 0.0,
+                }
+
+            return {"patterns": result, "gauges": dict(self.gauges)}
+
+
+    def to_prometheus(self) -> str:
+        """
+        Serializa las métricas en el formato de texto de Prometheus.
+
+        Return:
+            str: Métricas en formato de exposición de Prometheus.
+        """
+        p = self.prefix
+        snapshot = self.snapshot()
+        lines = []
+
+        lines.append(f"# HELP {p}_http_request_duration_seconds Duración de cada intento HTTP.")
+        lines.append(f"# TYPE {p}_http_request_duration_seconds histogram")
+        for pattern, data in snapshot["patterns"].items():
+            for bound, count in data["latency_buckets"].items():
+                lines.append(f'{p}_http_request_duration_seconds_bucket{{pattern="{pattern}",le="{bound}"}} {count}')
+
+            if data["latency_buckets"]:
+                lines.append(f'{p}_http_request_duration_seconds_sum{{pattern="{pattern}"}} {data["latency_sum"]}')
+                lines.append(f'{p}_http_request_duration_seconds_count{{pattern="{pattern}"}} {data["requests"]}')
+
+        lines.append(f"# HELP {p}_http_responses_total Respuestas recibidas por código de estado.")
+        lines.append(f"# TYPE {p}_http_responses_total counter")
+        for pattern, data in snapshot["patterns"].items():
+            for status, count in data["statuses"].items():
+                lines.append(f'{p}_http_responses_total{{pattern="{pattern}",status="{status}"}} {count}')
+
+        lines.append(f"# HELP {p}_http_errors_total Intentos sin respuesta (timeout o conexión).")
+        lines.append(f"# TYPE {p}_http_errors_total counter")
+        for pattern, data in snapshot["patterns"].items():
+            for kind, count in data["errors"].items():
+                lines.append(f'{p}_http_errors_total{{pattern="{pattern}",kind="{kind}"}} {count}')
+
+        lines.append(f"# HELP {p}_http_retries_total Reintentos realizados.")
+        lines.append(f"# TYPE {p}_http_retries_total counter")
+        for pattern, data in snapshot["patterns"].items():
+            lines.append(f'{p}_http_retries_total{{pattern="{pattern}"}} {data["retries"]}')
+
+        lines.append(f"# HELP {p}_http_response_bytes_total Bytes descargados.")
+        lines.append(f"# TYPE {p}_http_response_bytes_total counter")
+        for pattern, data in snapshot["patterns"].items():
+            lines.append(f'{p}_http_response_bytes_total{{pattern="{pattern}"}} {data["bytes"]}')
+
+        lines.append(f"# HELP {p}_http_cache_lookups_total Consultas a la caché por resultado.")
+        lines.append(f"# TYPE {p}_http_cache_lookups_total counter")
+        for pattern, data in snapshot["patterns"].items():
+            for result, count in data["cache"].items():
+                lines.append(f'{p}_http_cache_lookups_total{{pattern="{pattern}",result="{result}"}} {count}')
+
+        lines.append(f"# HELP {p}_http_cache_hit_ratio Proporción de consultas servidas desde la caché.")
+        lines.append(f"# TYPE {p}_http_cache_hit_ratio gauge")
+        for pattern, data in snapshot["patterns"].items():
+            lines.append(f'{p}_http_cache_hit_ratio{{pattern="{pattern}"}} {data["cache_hit_ratio"]}')
+
+        for name, value in sorted(snapshot["gauges"].items()):
+            lines.append(f"# TYPE {p}_{name} gauge")
+            lines.append(f"{p}_{name} {value}")
+
+        lines.append(f"{p}_metrics_generated_timestamp_seconds {round(time(), 3)}")
+        return "\n".join(lines) + "\n"
+
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Escribe las métricas en un fichero de texto de Prometheus (p. ej. para el textfile collector).
+        La escritura es atómica: nunca se lee un fichero a medias.
+
+        Args:
+            path (str): Ruta del fichero.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+
+        os.replace(tmp_path, path)
+
+
+    def start_exporter(self, path: str, interval: float = 30.0) -> None:
+        """
+        Arranca un hilo que escribe las métricas en `path` cada `interval` segundos.
+
+        Args:
+            path (str): Ruta del fichero de métricas.
+            interval (float, opcional): Segundos entre escrituras.
+        """
+        if self.exporter is not None:
+            return
+
+        self.exporter_stop.clear()
+
+        def export_loop():
+            while not self.exporter_stop.wait(interval):
+                try:
+                    self.write_prometheus(path)
+
+                except OSError as e:
+                    logging.error(f"Error al escribir las métricas en {path}: {e}")
+
+            # Última escritura al detener el exportador
+            try:
+                self.write_prometheus(path)
+
+            except OSError as e:
+                logging.error(f"Error al escribir las métricas en {path}: {e}")
+
+        self.exporter = threading.Thread(target=export_loop, name="metrics-exporter", daemon=True)
+        self.exporter.start()
+
+
+    def stop_exporter(self) -> None:
+        """
+        Detiene el hilo exportador tras una última escritura.
+        """
+        if self.exporter is None:
+            return
+
+        self.exporter_stop.set()
+        self.exporter.join()
+        self.exporter = None
@@ -0,0 +1,227 @@
+import os
+import json
+import zlib
+import sqlite3
+import hashlib
+import threading
+from time import time
+from typing import Callable, List
+from scraping.ws_document import ParsedTable
+from scraping.ws_parser import get_parser_backend
+from config.exceptions import logging
+
+# Versión de la extracción de tablas. Se incrementa a mano ante cambios que no estén en el código
+# de los módulos de PARSER_MODULES (p. ej. un cambio de formato de los registros).
+PARSER_VERSION = 1
+
+# Módulos cuyo código determina los registros extraídos: cualquier cambio en ellos invalida la caché
+PARSER_MODULES = (
+    "ws_leagues.py",
+    "ws_teams.py",
+    "ws_players.py",
+    "ws_extraction.py",
+    "ws_engine.py",
+    "ws_values.py",
+    "ws_document.py",
+    "ws_parser.py",
+    "ws_fastSquad.py",
+)
+
+
+def parser_fingerprint() -> str:
+    """
+    Versión efectiva de la extracción: PARSER_VERSION, el backend de parseo activo
+    y un hash del código de PARSER_MODULES.
+
+    Return:
+        str: Versión con la que se etiquetan las entradas de la caché.
+    """
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    for module in PARSER_MODULES:
+        with open(os.path.join(directory, module), "rb") as file:
+            digest.update(file.read())
+
+    return f"{PARSER_VERSION}:{get_parser_backend().name}:{digest.hexdigest()[:16]}"
+
+
+class ParseCache:
+    """
+    Caché persistente en disco (SQLite) de los registros extraídos de tablas de ligas, equipos y jugadores.
+    La clave es el sha256 del HTML original de la tabla (`table.items`, tal como llegó en la respuesta)
+    y el número mínimo de columnas, de modo que una tabla idéntica byte a byte entre ejecuciones no se
+    vuelve a recorrer, la extraiga el parser HTML o el camino rápido de plantillas. Cada entrada guarda la versión
+    del parser con la que se extrajo; las de otra versión se eliminan al abrir la caché.
+    """
+    def __init__(self, path: str = None, version: str = None):
+        """
+        Inicializa la caché, creando la base de datos si no existe y purgando las entradas obsoletas.
+
+        Args:
+            path (str, opcional): Ruta del fichero SQLite. Por defecto `cache/parse_cache.sqlite`.
+            version (str, opcional): Versión del parser. Por defecto `parser_fingerprint()`.
+        """
+        if path is None:
+            path = os.path.join(os.getcwd(), "cache", "parse_cache.sqlite")
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.path = path
+        self.version = version or parser_fingerprint()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS parsed_tables (
+                kind TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                version TEXT NOT NULL,
+                records BLOB NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (kind, digest)
+            )
+            """
+        )
+
+        # Las entradas de otra versión del parser ya no son válidas
+        purged = self.conn.execute("DELETE FROM parsed_tables WHERE version != ?", (self.version,)).rowcount
+        self.conn.commit()
+
+        if purged:
+            logging.info(f"Caché de parseo: {purged} entradas obsoletas eliminadas (versión {self.version}).")
+
+
+    @staticmethod
+    def table_digest(table, min_columns: int) -> str:
+        """
+        Hash del HTML original de la tabla y del número mínimo de columnas.
+
+        Args:
+            table (ParsedTable | Tag | bytes): Tabla HTML o su HTML original (ver `table_source`).
+            min_columns (int): Número mínimo de columnas requeridas por fila.
+
+        Return:
+            str: Digest sha256 en hexadecimal.
+        """
+        if isinstance(table, (bytes, str)):
+            source = table
+
+        else:
+            # Sin el HTML de la página (tablas sueltas) solo queda serializar la etiqueta
+            source = table.source if isinstance(table, ParsedTable) else None
+            if source is None:
+                source = str(getattr(table, "tag", table))
+
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+
+        return hashlib.sha256(f"{min_columns}:".encode("utf-8") + source).hexdigest()
+
+
+    def get(self, kind: str, digest: str) -> List[dict] | None:
+        """
+        Devuelve los registros memorizados de una tabla.
+
+        Args:
+            kind (str): Tipo de tabla ("league", "team" o "player").
+            digest (str): Hash de la tabla (ver `table_digest`).
+
+        Return:
+            list[dict] | None: Registros o None si no están en la caché.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT records FROM parsed_tables WHERE kind = ? AND digest = ? AND version = ?",
+                (kind, digest, self.version)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+        return json.loads(zlib.decompress(row[0]))
+
+
+    def set(self, kind: str, digest: str, records: List[dict]) -> None:
+        """
+        Guarda los registros extraídos de una tabla.
+
+        Args:
+            kind (str): Tipo de tabla ("league", "team" o "player").
+            digest (str): Hash de la tabla (ver `table_digest`).
+            records (list[dict]): Registros extraídos.
+        """
+        payload = zlib.compress(json.dumps(records, ensure_ascii=False).encode("utf-8"))
+
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO parsed_tables (kind, digest, version, records, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, digest, self.version, payload, time())
+            )
+            self.conn.commit()
+
+
+    def get_or_extract(self, kind: str, table, min_columns: int, extract: Callable[[], List[dict]]) -> List[dict]:
+        """
+        Devuelve los registros memorizados de la tabla o los extrae y los guarda.
+
+        Args:
+            kind (str): Tipo de tabla ("league", "team" o "player").
+            table (ParsedTable | Tag | bytes): Tabla HTML o su HTML original.
+            min_columns (int): Número mínimo de columnas requeridas por fila.
+            extract (Callable): Función sin argumentos que extrae los registros de la tabla.
+
+        Return:
+            list[dict]: Registros de la tabla.
+        """
+        digest = self.table_digest(table, min_columns)
+
+        records = self.get(kind, digest)
+        if records is None:
+            records = extract()
+            self.set(kind, digest, records)
+
+        return records
+
+
+    def stats(self) -> dict:
+        """
+        Devuelve las entradas, los aciertos, los fallos y el ratio de aciertos de la caché.
+
+        Return:
+            dict: Estadísticas de la caché.
+        """
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM parsed_tables").fetchone()[0]
+            total = self.hits + self.misses
+
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "version": self.version,
+            }
+
+
+    def clear(self) -> None:
+        """
+        Elimina todas las entradas de la caché.
+        """
+        with self.lock:
+            self.conn.execute("DELETE FROM parsed_tables")
+            self.conn.commit()
+
+
+    def close(self) -> None:
+        """
+        Cierra la conexión con la base de datos.
+        """
+        with self.lock:
+            self.conn.close()
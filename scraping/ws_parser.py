@@ -0,0 +1,583 @@
+import os
+import threading
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import ParserRejectedMarkup
+from config.exceptions import logging
+
+try:
+    import lxml # noqa: F401 (solo comprobamos que está instalado)
+    LXML_AVAILABLE = True
+
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+
+except ImportError:
+    LexborHTMLParser = None
+    SELECTOLAX_AVAILABLE = False
+
+# Variable de entorno con la que se elige el backend ("lxml", "html.parser" o "selectolax").
+# Por defecto se mantiene html.parser; lxml y selectolax son opcionales.
+PARSER_ENV_VAR = "TM_HTML_PARSER"
+DEFAULT_BACKEND = "html.parser"
+
+# Etiquetas cuyo texto no forma parte de get_text(), igual que en BeautifulSoup
+NON_TEXT_TAGS = frozenset({"script", "style", "template"})
+
+# Nodos que necesita cada consumidor, como (etiqueta, atributo, valor). Con parseo parcial
+# solo se materializan estos nodos (y sus descendientes); el resto de la página se descarta.
+PARSE_TARGETS = {
+    # Tabla principal: get_league_data, get_team_data y get_player_data
+    "items": (("table", "class", "items"),),
+    # Paginación: get_total_pages
+    "pagination": (
+        ("ul", "class", "tm-pagination"),
+        ("div", "class", "pagination"),
+        ("ul", "class", "pagination"),
+        ("nav", "role", "navigation"),
+    ),
+    # Selector de temporadas: get_seasons
+    "seasons": (("select", "name", "saison_id"),),
+}
+
+
+class TargetStrainer(SoupStrainer):
+    """
+    SoupStrainer que conserva solo las etiquetas con un atributo concreto, p. ej. <table class="items">.
+    Implementa la interfaz de filtrado de bs4 4.12 (search_tag) y la de bs4 >= 4.13 (allow_tag_creation).
+    """
+    def __init__(self, rules: dict):
+        """
+        Inicializa el filtro.
+
+        Args:
+            rules (dict): {etiqueta: [(atributo, valor), ...]}
+        """
+        super().__init__(name=sorted(rules))
+        self.rules = rules
+
+
+    def match_tag(self, name: str, attrs: dict) -> bool:
+        """
+        Indica si una etiqueta de primer nivel debe construirse.
+
+        Args:
+            name (str): Nombre de la etiqueta.
+            attrs (dict): Atributos de la etiqueta.
+
+        Return:
+            bool: True si coincide con algún objetivo.
+        """
+        for attr, value in self.rules.get(name, ()):
+            attr_value = attrs.get(attr)
+            if attr_value is None:
+                continue
+
+            if attr == "class":
+                tokens = attr_value if isinstance(attr_value, list) else attr_value.split()
+                if value in tokens:
+                    return True
+
+            elif attr_value == value:
+                return True
+
+        return False
+
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return self.match_tag(name, attrs or {})
+
+
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        name = getattr(markup_name, "name", markup_name)
+        attrs = getattr(markup_name, "attrs", markup_attrs) or {}
+        return markup_name if self.match_tag(name, attrs) else None
+
+
+def build_strainer(targets) -> TargetStrainer:
+    """
+    Construye el filtro que conserva solo los nodos de los objetivos indicados.
+
+    Args:
+        targets (Iterable[str]): Claves de PARSE_TARGETS.
+
+    Return:
+        TargetStrainer: Filtro para el parámetro `parse_only` de BeautifulSoup.
+    """
+    rules = {}
+    for target in targets:
+        if target not in PARSE_TARGETS:
+            raise ValueError(f"Objetivo de parseo no válido: {target}. Opciones: {', '.join(PARSE_TARGETS)}")
+
+        for tag, attr, value in PARSE_TARGETS[target]:
+            rules.setdefault(tag, []).append((attr, value))
+
+    return TargetStrainer(rules)
+
+
+class BeautifulSoupBackend:
+    """
+    Backend basado en BeautifulSoup con el parser indicado ("lxml" o "html.parser").
+    """
+    def __init__(self, features: str):
+        """
+        Inicializa el backend.
+
+        Args:
+            features (str): Parser de BeautifulSoup a utilizar.
+        """
+        self.name = features
+        self.features = features
+
+
+    def parse(self, content, targets = None):
+        """
+        Parsea un documento HTML.
+
+        Args:
+            content (bytes | str): HTML a parsear.
+            targets (tuple[str], opcional): Objetivos de PARSE_TARGETS; si se indican, solo se construyen esos nodos.
+
+        Return:
+            BeautifulSoup: Documento parseado.
+        """
+        if targets:
+            return BeautifulSoup(content, self.features, parse_only=build_strainer(targets))
+
+        return BeautifulSoup(content, self.features)
+
+
+class SelectolaxBackend:
+    """
+    Backend basado en selectolax (motor lexbor). Devuelve nodos `SelectolaxNode`,
+    que implementan el subconjunto de la API de BeautifulSoup que usan los gestores.
+    """
+    name = "selectolax"
+
+    def parse(self, content, targets = None):
+        """
+        Parsea un documento HTML. El parseo parcial (`targets`) solo se aplica a los backends de
+        BeautifulSoup: lexbor construye siempre el árbol completo en C, sin objetos Python por nodo
+        (los adaptadores se crean solo al consultarlos), y no tiene un equivalente de SoupStrainer.
+
+        Args:
+            content (bytes | str): HTML a parsear.
+            targets (tuple[str], opcional): Objetivos de PARSE_TARGETS (se ignoran en este backend).
+
+        Return:
+            SelectolaxNode: Nodo raíz del documento.
+        """
+        return SelectolaxNode(LexborHTMLParser(content).root)
+
+
+class SelectolaxNode:
+    """
+    Adaptador de un nodo de selectolax con la API de BeautifulSoup usada en el proyecto:
+    find, find_all, select_one, select, get, [], attrs, get_text, parent, name y string.
+    """
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        """
+        Envuelve un nodo de selectolax.
+
+        Args:
+            node (LexborNode): Nodo a envolver.
+        """
+        self.node = node
+
+
+    @property
+    def name(self) -> str:
+        return self.node.tag
+
+
+    @property
+    def attrs(self) -> dict:
+        """
+        Atributos del nodo. Como en BeautifulSoup, "class" se devuelve como lista.
+        """
+        attrs = {key: value if value is not None else "" for key, value in self.node.attributes.items()}
+        if "class" in attrs:
+            attrs["class"] = attrs["class"].split()
+
+        return attrs
+
+
+    @property
+    def parent(self):
+        parent = self.node.parent
+        return SelectolaxNode(parent) if parent is not None else None
+
+
+    @property
+    def string(self) -> str | None:
+        """
+        Como en BeautifulSoup: el texto del único hijo (bajando por los hijos únicos) o None
+        si el nodo tiene varios hijos o ninguno.
+        """
+        return self.node_string(self.node)
+
+
+    @staticmethod
+    def node_string(node) -> str | None:
+        while True:
+            children = list(node.iter(include_text=True))
+            if len(children) != 1:
+                return None
+
+            node = children[0]
+            if node.is_text_node:
+                return node.text_content
+
+            if node.is_comment_node:
+                return node.comment_content
+
+
+    @string.setter
+    def string(self, value: str) -> None:
+        # Igual que en BeautifulSoup: el contenido del nodo se sustituye por el texto
+        child = self.node.child
+        while child is not None:
+            next_child = child.next
+            child.decompose()
+            child = next_child
+
+        self.node.insert_child(value)
+
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+
+    def get(self, key: str, default=None):
+        """
+        Devuelve el valor de un atributo o `default` si no existe.
+        """
+        return self.attrs.get(key, default)
+
+
+    def __getitem__(self, key: str):
+        return self.attrs[key]
+
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.node.attributes
+
+
+    def __bool__(self) -> bool:
+        return True
+
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SelectolaxNode) and self.node.mem_id == other.node.mem_id
+
+
+    def __hash__(self) -> int:
+        return self.node.mem_id
+
+
+    def __str__(self) -> str:
+        return self.node.html or ""
+
+
+    __repr__ = __str__
+
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        """
+        Devuelve el texto de todos los descendientes, excluyendo scripts y estilos.
+
+        Args:
+            separator (str, opcional): Separador entre fragmentos de texto.
+            strip (bool, opcional): Si se eliminan los espacios de cada fragmento (y se descartan los vacíos).
+
+        Return:
+            str: Texto del nodo.
+        """
+        # Camino rápido: sin scripts ni estilos dentro, el texto de lexbor coincide con el de BeautifulSoup
+        if self.node.css_first("script, style, template") is None:
+            return self.node.text(deep=True, separator=separator, strip=strip)
+
+        parts = []
+        for node in self.node.traverse(include_text=True):
+            if not node.is_text_node or node.parent.tag in NON_TEXT_TAGS:
+                continue
+
+            text = node.text_content or ""
+            if strip:
+                text = text.strip()
+                if not text:
+                    continue
+
+            parts.append(text)
+
+        return separator.join(parts)
+
+
+    def find(self, name=None, attrs=None, recursive: bool = True, **kwargs):
+        """
+        Devuelve el primer descendiente que coincide, como `Tag.find` de BeautifulSoup.
+
+        Return:
+            SelectolaxNode | str | None: Nodo encontrado (o texto, si solo se filtra por `string`) o None.
+        """
+        for match in self.find_all(name, attrs, recursive, limit=1, **kwargs):
+            return match
+
+        return None
+
+
+    def find_all(self, name=None, attrs=None, recursive: bool = True, limit: int = None, **kwargs) -> list:
+        """
+        Devuelve todos los descendientes que coinciden, en orden de documento, como `Tag.find_all`.
+        Como en BeautifulSoup, `string=` (o `text=`) sin nombre ni atributos busca textos, no etiquetas.
+
+        Return:
+            list[SelectolaxNode | str]: Nodos (o textos) encontrados.
+        """
+        kwargs = dict(kwargs)
+        string = kwargs.pop("string", kwargs.pop("text", None))
+
+        if string is not None and not name and not attrs and not kwargs:
+            matches = (
+                node.text_content for node in self.iter_text_nodes(recursive)
+                if self.match_string(node.text_content, string)
+            )
+
+        else:
+            matches = (
+                SelectolaxNode(node) for node in self.iter_matches(name, attrs, recursive, kwargs)
+                if string is None or self.match_string(self.node_string(node), string)
+            )
+
+        result = []
+        for match in matches:
+            result.append(match)
+            if limit and len(result) >= limit:
+                break
+
+        return result
+
+
+    def iter_text_nodes(self, recursive: bool):
+        """
+        Recorre los nodos de texto descendientes (o hijos directos), incluidos los de scripts y estilos como en `find_all(string=...)`.
+        """
+        nodes = self.node.traverse(include_text=True) if recursive else self.node.iter(include_text=True)
+        for node in nodes:
+            if node.is_text_node:
+                yield node
+
+
+    @staticmethod
+    def match_string(value: str | None, expected) -> bool:
+        """
+        Comprueba un texto con la semántica de `string=` de BeautifulSoup: True exige texto,
+        un str exige igualdad, un patrón (`re.compile`) se busca y una lista acepta cualquiera de sus valores.
+        """
+        if expected is True:
+            return value is not None
+
+        if value is None:
+            return False
+
+        if isinstance(expected, str):
+            return value == expected
+
+        if hasattr(expected, "search"):
+            return expected.search(value) is not None
+
+        if callable(expected):
+            return bool(expected(value))
+
+        return value in expected
+
+
+    def select_one(self, selector: str):
+        """
+        Devuelve el primer descendiente que coincide con un selector CSS.
+        """
+        for node in self.node.css(selector):
+            if node.mem_id != self.node.mem_id:
+                return SelectolaxNode(node)
+
+        return None
+
+
+    def select(self, selector: str) -> list:
+        """
+        Devuelve los descendientes que coinciden con un selector CSS.
+        """
+        return [SelectolaxNode(node) for node in self.node.css(selector) if node.mem_id != self.node.mem_id]
+
+
+    def iter_matches(self, name, attrs, recursive: bool, kwargs: dict):
+        """
+        Recorre los descendientes (o hijos directos) que coinciden con el nombre y los atributos.
+        """
+        attrs = dict(attrs or {})
+        if "class_" in kwargs:
+            attrs["class"] = kwargs.pop("class_")
+
+        attrs.update(kwargs)
+        names = {name} if isinstance(name, str) else set(name) if name else None
+
+        if recursive and names is not None and len(names) == 1:
+            # Una sola etiqueta: lexbor filtra por nombre en C (el resultado incluye el propio nodo)
+            self_id = self.node.mem_id
+            candidates = (node for node in self.node.css(next(iter(names))) if node.mem_id != self_id)
+
+        elif recursive:
+            candidates = self.node.traverse(include_text=False)
+            next(candidates, None) # El propio nodo no cuenta
+
+        else:
+            candidates = self.node.iter(include_text=False)
+
+        for node in candidates:
+            if names is not None and node.tag not in names:
+                continue
+
+            if attrs and not self.match_attrs(node.attributes, attrs):
+                continue
+
+            yield node
+
+
+    @staticmethod
+    def match_attrs(node_attrs: dict, attrs: dict) -> bool:
+        """
+        Comprueba los atributos con la semántica de BeautifulSoup: True exige el atributo,
+        None exige su ausencia y, para "class", basta con que coincida una clase o el valor completo.
+        """
+        for key, expected in attrs.items():
+            value = node_attrs.get(key)
+            if value is None and key in node_attrs:
+                value = "" # Atributo sin valor, p. ej. <td title>
+
+            if expected is True:
+                if key not in node_attrs:
+                    return False
+
+            elif expected is None or expected is False:
+                if key in node_attrs:
+                    return False
+
+            elif value is None:
+                return False
+
+            elif key == "class":
+                expected_values = [expected] if isinstance(expected, str) else list(expected)
+                tokens = value.split()
+                if not any(item in tokens or item == " ".join(tokens) for item in expected_values):
+                    return False
+
+            elif isinstance(expected, str):
+                if value != expected:
+                    return False
+
+            elif value not in expected:
+                return False
+
+        return True
+
+
+# Backends disponibles
+BACKENDS = {
+    "lxml": lambda: BeautifulSoupBackend("lxml"),
+    "html.parser": lambda: BeautifulSoupBackend("html.parser"),
+    "selectolax": SelectolaxBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(name: str):
+    """
+    Crea el backend indicado. Si su librería no está instalada se recurre
+    a lxml y, en último caso, a html.parser.
+
+    Args:
+        name (str): Nombre del backend.
+
+    Return:
+        Backend de parseo.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de parseo no válido: {name}. Opciones: {', '.join(BACKENDS)}")
+
+    if name == "selectolax" and not SELECTOLAX_AVAILABLE:
+        logging.warning("selectolax no está instalado: se usa lxml.")
+        name = "lxml"
+
+    if name == "lxml" and not LXML_AVAILABLE:
+        logging.warning("lxml no está instalado: se usa html.parser.")
+        name = "html.parser"
+
+    return BACKENDS[name]()
+
+
+def set_parser_backend(name: str) -> None:
+    """
+    Selecciona el backend de parseo de todo el proyecto.
+
+    Args:
+        name (str): "lxml", "html.parser" o "selectolax".
+    """
+    global _backend
+    backend = create_backend(name)
+
+    with _backend_lock:
+        _backend = backend
+
+    logging.info(f"Backend de parseo HTML: {backend.name}")
+
+
+def get_parser_backend():
+    """
+    Devuelve el backend de parseo activo. La primera vez se elige según la variable
+    de entorno TM_HTML_PARSER (por defecto "html.parser").
+
+    Return:
+        Backend de parseo activo.
+    """
+    global _backend
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend((os.getenv(PARSER_ENV_VAR) or DEFAULT_BACKEND).strip().lower())
+
+    return _backend
+
+
+def parse_html(content, targets = None):
+    """
+    Parsea un documento HTML con el backend configurado.
+
+    Args:
+        content (bytes | str): HTML a parsear.
+        targets (tuple[str], opcional): Parseo parcial: solo se materializan los nodos de estos
+            objetivos de PARSE_TARGETS ("items", "pagination", "seasons").
+
+    Return:
+        BeautifulSoup | SelectolaxNode: Documento parseado.
+    """
+    backend = get_parser_backend()
+
+    try:
+        return backend.parse(content, targets)
+
+    except ParserRejectedMarkup as e:
+        logging.warning(f"El backend {backend.name} rechazó el HTML ({e}): se reintenta con html.parser.")
+        return BeautifulSoup(content, "html.parser")
@@ -0,0 +1,524 @@
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from scraping.ws_engine import ScrapingEngine
+from scraping.ws_entities import Region, League, Team
+from scraping.ws_leagues import LeagueManager
+from scraping.ws_parser import get_parser_backend, set_parser_backend
+from scraping.ws_records import NUMPY_AVAILABLE, SharedBatch, discard, pack, unpack
+from scraping.ws_region import RegionManager
+from scraping.ws_teams import TeamManager
+from typing import Any, Dict, List
+
+# Formas de devolver los resultados de los trabajadores al proceso principal
+TRANSPORTS = ("shared_memory", "pickle")
+
+# Gestores del proceso trabajador. Se crean una vez por proceso en `init_worker`.
+worker_region_manager: RegionManager = None
+worker_transport: str = "pickle"
+
+
+def init_worker(parser_backend: str, transport: str = "pickle") -> None:
+    """
+    Inicializa un proceso trabajador: mismo backend de parseo que el proceso principal
+    y gestores sin cliente HTTP (los trabajadores nunca acceden a la red).
+
+    Args:
+        parser_backend (str): Nombre del backend de parseo del proceso principal.
+        transport (str, opcional): "shared_memory" (lotes columnar de ws_records) o "pickle".
+    """
+    global worker_region_manager, worker_transport
+
+    set_parser_backend(parser_backend)
+    worker_transport = transport
+
+    scraping_engine = ScrapingEngine(http_client=None)
+    worker_region_manager = RegionManager(
+        http_client=None,
+        league_manager=LeagueManager(scraping_engine, data_manager=None),
+        team_manager=TeamManager(scraping_engine, data_manager=None)
+    )
+
+
+def parse_region_page(content: bytes, url: str, region_id: str) -> Dict[str, list] | None:
+    """
+    Extrae los países y las ligas (con su tier) de una página de la región.
+
+    Args:
+        content (bytes): HTML de la página.
+        url (str): URL de la página.
+        region_id (str): ID de la región.
+
+    Return:
+        dict | None: {"countries": [Country], "leagues": [(tier, League)]} o None si la página no tiene tabla.
+    """
+    table = worker_region_manager.extract_region_table(content, url)
+    if not table:
+        return None
+
+    # Región auxiliar: solo recoge lo extraído de esta página
+    region = Region(id_region=region_id, region_name=None, url_region=url, stats=None)
+    leagues = worker_region_manager.add_region_leagues(region, table) or []
+
+    return {
+        "countries": list(region.countries.values()),
+        "leagues": encode("league", [(RegionManager.get_league_tier(region, league), league) for league in leagues])
+    }
+
+
+def parse_league_seasons(content: bytes, url: str) -> List[int]:
+    """
+    Extrae las temporadas disponibles de la página de una liga.
+
+    Args:
+        content (bytes): HTML de la página.
+        url (str): URL de la liga.
+
+    Return:
+        list[int]: Temporadas disponibles.
+    """
+    return worker_region_manager.league_manager.scraping_engine.parse_seasons(content, url)
+
+
+def parse_season_page(content: bytes, url: str, region_id: str, league: League, season: int) -> List[Team] | None:
+    """
+    Extrae los equipos de la tabla de una temporada.
+
+    Args:
+        content (bytes): HTML de la página.
+        url (str): URL de la temporada.
+        region_id (str): ID de la región.
+        league (League): Copia de la liga (solo se usan su ID y la temporada).
+        season (int): Año de inicio de la temporada.
+
+    Return:
+        List[Team] | None: Equipos o None si no se encontró la tabla.
+    """
+    league.season = season
+    region = Region(id_region=region_id, region_name=None, url_region=None, stats=None)
+
+    teams = worker_region_manager.league_manager.add_season_teams(
+        league, region, worker_region_manager.team_manager, f"{season}/{season + 1}", content, url
+    )
+
+    return encode("team", teams) if teams is not None else None
+
+
+def parse_squad_page(content: bytes, url: str, team: Team) -> List:
+    """
+    Extrae los jugadores de la plantilla de un equipo.
+
+    Args:
+        content (bytes): HTML de la plantilla.
+        url (str): URL de la plantilla.
+        team (Team): Copia del equipo (sin jugadores).
+
+    Return:
+        List[Player]: Jugadores de la plantilla.
+    """
+    worker_region_manager.team_manager.add_players_from_content(team, content)
+    return encode("player", list(team.players.values()))
+
+
+def encode(record_type: str, items: list):
+    """
+    Prepara las entidades de un trabajador para devolverlas al proceso principal.
+
+    Args:
+        record_type (str): "league", "team" o "player".
+        items (list): Entidades extraídas.
+
+    Return:
+        SharedBatch | list: Lote en memoria compartida o las entidades (se envían por pickle).
+    """
+    return pack(record_type, items) if worker_transport == "shared_memory" else items
+
+
+class ParsePipeline:
+    """
+    Crawl en dos etapas desacopladas: los hilos de `HTTPClient` solo descargan bytes y los entregan
+    a un ProcessPoolExecutor de parsers. Los trabajadores extraen las tablas de ligas, equipos y
+    jugadores y devuelven las entidades; el proceso principal las ensambla en el árbol de la región.
+
+    El parseo es CPU y retiene el GIL, así que con hilos no escala más allá de un núcleo; aquí cada
+    trabajador parsea en su propio proceso mientras la descarga de las siguientes páginas continúa.
+    Cada nivel (páginas de región, ligas, temporadas, plantillas) se lanza completo y se ensambla en
+    el orden original, por lo que el resultado es idéntico al del crawl secuencial.
+
+    Con NumPy instalado, los trabajadores devuelven ligas, equipos y jugadores como lotes columnar en
+    memoria compartida (ws_records) en lugar de serializar cada entidad con pickle. Los lotes recibidos
+    y aún no leídos se registran en `unread`: si el crawl se interrumpe (error, Ctrl-C, cierre con
+    trabajos pendientes) se borran en `close` para no dejar bloques huérfanos en /dev/shm.
+    """
+    def __init__(
+            self,
+            region_manager: RegionManager,
+            parse_workers: int = None,
+            fetch_workers: int = 8,
+            transport: str = None
+        ):
+        """
+        Inicializa el pipeline.
+
+        Args:
+            region_manager (RegionManager): Gestor de regiones del proceso principal (cliente HTTP y estadísticas).
+            parse_workers (int, opcional): Procesos de parseo (por defecto, uno por núcleo).
+            fetch_workers (int, opcional): Hilos de descarga.
+            transport (str, opcional): "shared_memory" o "pickle" (por defecto, memoria compartida si NumPy está instalado).
+        """
+        if transport is None:
+            transport = "shared_memory" if NUMPY_AVAILABLE else "pickle"
+
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Transporte no válido: {transport}. Opciones: {', '.join(TRANSPORTS)}")
+
+        if transport == "shared_memory" and not NUMPY_AVAILABLE:
+            logging.warning("NumPy no está instalado: los resultados se envían por pickle.")
+            transport = "pickle"
+
+        self.region_manager = region_manager
+        self.http_client = region_manager.http_client
+        self.transport = transport
+
+        # Lotes en memoria compartida recibidos de los trabajadores y aún sin leer, por nombre de bloque
+        self.unread: Dict[str, SharedBatch] = {}
+        self.unread_lock = threading.Lock()
+
+        self.fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="pipeline-fetch")
+        self.parse_pool = ProcessPoolExecutor(
+            max_workers=parse_workers,
+            initializer=init_worker,
+            initargs=(get_parser_backend().name, transport)
+        )
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def close(self) -> None:
+        """
+        Detiene los hilos de descarga y los procesos de parseo y borra los lotes que no se llegaron a leer.
+        Los trabajos aún no iniciados se cancelan.
+        """
+        self.fetch_pool.shutdown(wait=True, cancel_futures=True)
+        self.parse_pool.shutdown(wait=True, cancel_futures=True)
+
+        # Tras el shutdown ya se han entregado todos los resultados de los trabajos en curso
+        self.discard_unread()
+
+
+    def track(self, result) -> None:
+        """
+        Registra los lotes en memoria compartida de un resultado recién recibido.
+
+        Args:
+            result (Any): Resultado de un parser (un lote, una lista, un dict de página o None).
+        """
+        batches = result.values() if isinstance(result, dict) else (result,)
+
+        with self.unread_lock:
+            for batch in batches:
+                if isinstance(batch, SharedBatch):
+                    self.unread[batch.name] = batch
+
+
+    def read(self, record_type: str, result) -> List[Any] | None:
+        """
+        Reconstruye las entidades de un resultado (ver `unpack`) y lo retira de los lotes sin leer.
+
+        Args:
+            record_type (str): "league", "team" o "player".
+            result (SharedBatch | list | None): Resultado del trabajador.
+
+        Return:
+            list | None: Entidades reconstruidas.
+        """
+        # Si la lectura falla, el lote sigue registrado y se borra con el resto
+        items = unpack(record_type, result)
+        self.untrack(result)
+        return items
+
+
+    def drop(self, result) -> None:
+        """
+        Libera un resultado que no se va a leer (ver `discard`) y lo retira de los lotes sin leer.
+
+        Args:
+            result (SharedBatch | list | None): Resultado del trabajador.
+        """
+        self.untrack(result)
+        discard(result)
+
+
+    def untrack(self, result) -> None:
+        """
+        Retira un lote de los pendientes de leer.
+
+        Args:
+            result (SharedBatch | list | None): Resultado del trabajador.
+        """
+        if isinstance(result, SharedBatch):
+            with self.unread_lock:
+                self.unread.pop(result.name, None)
+
+
+    def discard_unread(self) -> None:
+        """
+        Borra todos los lotes recibidos que no se han leído.
+        """
+        with self.unread_lock:
+            batches = list(self.unread.values())
+            self.unread.clear()
+
+        for batch in batches:
+            discard(batch)
+
+        if batches:
+            logging.info(f"Se liberaron {len(batches)} lotes de memoria compartida sin leer.")
+
+
+    def fetch(self, url: str) -> bytes | None:
+        """
+        Descarga una página (solo red, sin parseo).
+
+        Args:
+            url (str): URL de la página.
+
+        Return:
+            bytes | None: Contenido de la respuesta o None si no hubo respuesta.
+        """
+        response = self.http_client.make_request(url)
+        return response.content if response else None
+
+
+    def submit(self, url: str, parser, *args) -> Future:
+        """
+        Descarga la URL en un hilo y, en cuanto llegan los bytes, encola su parseo en el pool de procesos.
+        El hilo de descarga queda libre para la siguiente URL sin esperar al parseo.
+
+        Args:
+            url (str): URL de la página.
+            parser (Callable): Función de parseo de este módulo (se ejecuta en un proceso trabajador).
+            *args: Argumentos adicionales del parser.
+
+        Return:
+            Future: Resultado del parser (None si no se pudo descargar la página).
+        """
+        result = Future()
+
+        def forward(parse_future: Future) -> None:
+            try:
+                value = parse_future.result()
+
+            except BaseException as e:
+                # Incluye CancelledError (trabajos cancelados en `close`)
+                result.set_exception(e)
+                return
+
+            # Se registra antes de entregarlo: si nadie llega a leerlo, `close` lo borra
+            self.track(value)
+            result.set_result(value)
+
+        def on_fetched(fetch_future: Future) -> None:
+            try:
+                content = fetch_future.result()
+
+            except Exception as e:
+                result.set_exception(e)
+                return
+
+            if content is None:
+                logging.warning(f"No se pudo obtener el HTML de la URL: {url}")
+                result.set_result(None)
+                return
+
+            # Un pool roto (BrokenProcessPool) o cerrado lanza aquí; concurrent.futures se traga las
+            # excepciones de los callbacks y `gather` esperaría para siempre
+            try:
+                self.parse_pool.submit(parser, content, url, *args).add_done_callback(forward)
+
+            except Exception as e:
+                result.set_exception(e)
+
+        self.fetch_pool.submit(self.fetch, url).add_done_callback(on_fetched)
+        return result
+
+
+    @staticmethod
+    def gather(futures: List[Future], urls: List[str]) -> List[Any]:
+        """
+        Espera los resultados en el orden de envío. Un error en una página se registra y su resultado es None.
+
+        Args:
+            futures (list[Future]): Futuros devueltos por `submit`.
+            urls (list[str]): URL de cada futuro (para los mensajes de log).
+
+        Return:
+            list: Resultados en el mismo orden.
+        """
+        results = []
+        for future, url in zip(futures, urls):
+            try:
+                results.append(future.result())
+
+            except Exception as e:
+                logging.error(f"Error al procesar la URL: {url}. \nDetalle: {e}")
+                results.append(None)
+
+        return results
+
+
+    def process_region(self, region: Region, region_data: Dict[str, Any]) -> None:
+        """
+        Procesa una región completa: páginas de la región, temporadas de cada liga,
+        equipos de cada temporada y jugadores de cada equipo.
+        Si algo falla a mitad, se borran los lotes recibidos que quedaron sin leer.
+
+        Args:
+            region (Region): Instancia de la región a procesar.
+            region_data (dict): Diccionario con los datos de la región.
+        """
+        try:
+            leagues, finished = self.process_region_pages(region, region_data["url_region"])
+            season_jobs = self.collect_seasons(leagues)
+            teams = self.process_seasons(region, season_jobs)
+            self.process_squads(teams)
+
+        except BaseException:
+            self.discard_unread()
+            raise
+
+        # Como en RegionManager.process_region, una región terminada por una página vacía no calcula estadísticas
+        if finished:
+            return
+
+        self.region_manager.calculate_region_stats(region)
+
+
+    def process_region_pages(self, region: Region, urls: List[str]) -> tuple:
+        """
+        Extrae los países y las ligas de todas las páginas de la región y los agrega a la región.
+
+        Args:
+            region (Region): Instancia de la región.
+            urls (list[str]): URLs de las páginas de la región.
+
+        Return:
+            tuple: Ligas agregadas, en el orden de las páginas, y si una página sin ligas terminó la región.
+        """
+        pages = self.gather([self.submit(url, parse_region_page, region.id_region) for url in urls], urls)
+
+        leagues = []
+        finished = False
+        for page_number, page in enumerate(pages, start=1):
+            if page is None:
+                continue
+
+            # Las páginas posteriores al final de la región se descartan (liberando su memoria compartida)
+            if finished:
+                self.drop(page["leagues"])
+                continue
+
+            for country in page["countries"]:
+                region.add_country(country)
+
+            # Una página sin ligas marca el final de la región (igual que process_region)
+            page_leagues = self.read("league", page["leagues"])
+            if not page_leagues:
+                finished = True
+                continue
+
+            for tier, league in page_leagues:
+                # El trabajador solo conocía los países de su página
+                league.add_country(region.countries)
+                region.add_league(tier, league)
+                leagues.append(league)
+
+            logging.info(f"Página {page_number} de {len(urls)}: {len(page_leagues)} ligas extraídas.")
+
+        return leagues, finished
+
+
+    def collect_seasons(self, leagues: List[League]) -> List[tuple]:
+        """
+        Obtiene las temporadas a procesar de cada liga.
+
+        Args:
+            leagues (List[League]): Ligas de la región.
+
+        Return:
+            list[tuple]: Pares (liga, temporada).
+        """
+        urls = [league.url_league for league in leagues]
+        season_lists = self.gather([self.submit(url, parse_league_seasons) for url in urls], urls)
+
+        season_jobs = []
+        for league, seasons in zip(leagues, season_lists):
+            if not seasons:
+                logging.warning(f"No se encontraron temporadas para la liga: {league.competition}")
+                continue
+
+            # Filtro TEMPORAL para solo procesar la temporada 2024
+            season_jobs.extend((league, season) for season in seasons if season == 2024)
+
+        return season_jobs
+
+
+    def process_seasons(self, region: Region, season_jobs: List[tuple]) -> List[Team]:
+        """
+        Extrae los equipos de cada temporada y los agrega a su liga.
+
+        Args:
+            region (Region): Instancia de la región.
+            season_jobs (list[tuple]): Pares (liga, temporada).
+
+        Return:
+            List[Team]: Equipos agregados.
+        """
+        league_manager = self.region_manager.league_manager
+        urls = [league_manager.build_season_url(league, season) for league, season in season_jobs]
+
+        team_lists = self.gather([
+            self.submit(url, parse_season_page, region.id_region, league, season)
+            for url, (league, season) in zip(urls, season_jobs)
+        ], urls)
+
+        teams = []
+        for (league, season), season_teams in zip(season_jobs, team_lists):
+            season_teams = self.read("team", season_teams)
+            if season_teams is None:
+                continue
+
+            season_key = f"{season}/{season + 1}"
+            league.season = season
+
+            for team in season_teams:
+                league.add_team_to_season(season_key=season_key, team=team)
+
+            teams.extend(season_teams)
+            logging.info(f"Se procesaron {len(season_teams)} equipos para la temporada: {season_key}")
+
+        return teams
+
+
+    def process_squads(self, teams: List[Team]) -> None:
+        """
+        Extrae los jugadores de la plantilla de cada equipo y los agrega al equipo.
+
+        Args:
+            teams (List[Team]): Equipos a procesar.
+        """
+        urls = [team.url_team for team in teams]
+        player_lists = self.gather([
+            self.submit(url, parse_squad_page, team)
+            for url, team in zip(urls, teams)
+        ], urls)
+
+        for team, players in zip(teams, player_lists):
+            for player in self.read("player", players) or []:
+                team.add_player(player)
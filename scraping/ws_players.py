@@ -1,13 +1,21 @@
-import re
 import json
 import logging
 from bs4 import BeautifulSoup
 from datetime import datetime
 from scraping.ws_engine import ScrapingEngine
-from scraping.ws_entities import Team, TeamStats, League, Region, Player, PlayerStats
-from scraping.ws_dataManager import DataManager
+from scraping.ws_entities import Team, Player, PlayerStats
+from scraping.ws_document import ParsedTable
+from scraping.ws_fastSquad import FastSquadExtractor
+from scraping.ws_values import PLAYER_ID_PATTERN, parse_date_string
+from scraping.ws_extraction import (
+    ExtractionPlan,
+    cell_link_text,
+    cell_parent_title,
+    cell_nested_text,
+    cell_text_or_none,
+    cell_currency
+)
 from typing import List
-from pprint import pprint
 
 
 class PlayerManager:
@@ -23,168 +31,148 @@ class PlayerManager:
         "transform": lambda x: x
     }
 
-    def __init__(self, scraping_engine: ScrapingEngine):
+    # Campos que se obtienen de la fila completa y no de una columna concreta
+    ROW_FIELDS = ("player_name", "general_position", "url_player")
+
+    def __init__(self, scraping_engine: ScrapingEngine, fast_squad: bool = None):
         """
         Inicializa el PlayerManager con el motor de scraping.
 
         Args:
             scraping_engine (ScrapingEngine): Motor de scraping.
+            fast_squad (bool, opcional): Si se extraen las plantillas de los bytes sin construir el DOM.
+                Por defecto se activa con la variable de entorno TM_FAST_SQUAD=1.
         """
 
         self.scraping_engine = scraping_engine
+        if fast_squad is None:
+            fast_squad = FastSquadExtractor.enabled()
+
+        self.fast_squad = FastSquadExtractor(self) if fast_squad else None
 
+        # Configuración de campos para extraer datos de la tabla. Se compila a un ExtractionPlan por tabla.
         self.player_field_config = {
             "player_name": {
                 **self.base_config,
                 "key": "player",
-                "transform": lambda x: x.find("a").get_text(strip=True)
-                if x and x.find("a") else None
+                "transform": cell_link_text
             },
             "general_position": {
                 **self.base_config,
                 "key": "position",
-                "transform": lambda x: x.parent["title"]
-                if x and x.parent
-                and "title" in x.parent.attrs else None
+                "transform": cell_parent_title
             },
             "player_position": {
                 **self.base_config,
                 "key": "player",
-                "transform": lambda x: (
-                    x.find("table").find_all("tr")[1].find_all("td")[0].get_text(strip=True)
-
-                    if x
-                    and x.find("table")
-                    and len(x.find("table").find_all("tr")) > 1
-                    and len(x.find("table").find_all("tr")[1].find_all("td")) > 0
-                    else None
-                ),
+                "transform": cell_nested_text(1, 0)
             },
             "birth_date": {
                 **self.base_config,
                 "key": "date_of_birth/age",
                 "offset": 3,
-                "transform": lambda x: (
-                    self.scraping_engine.get_date(x).strftime("%Y-%m-%d")
-                    if x and self.scraping_engine.get_date(x) else None
-                )
-            },
-            "player_age": {
-                **self.base_config,
-                "key": "date_of_birth/age",
-                "offset": 3,
-                "transform": lambda x: (
-                    (datetime.now().year - self.scraping_engine.get_date(x).year) -
-                    (
-                        (datetime.now().month, datetime.now().day) <
-                        (self.scraping_engine.get_date(x).month, self.scraping_engine.get_date(x).day)
-                    )
-                    if x and self.scraping_engine.get_date(x) else None
-                )
+                "transform": self.cell_date
             },
             "fk_country": {
                 **self.base_config,
                 "key": "nat",
                 "offset": 3,
-                "transform": lambda x: (
-                    self.scraping_engine.get_nationality_id(x) if x else None
-                )
+                "transform": self.scraping_engine.get_nationality_id
             },
             "player_height": {
                 **self.base_config,
                 "key": "height",
                 "offset": 3,
-                "transform": lambda x: (
-                    self.scraping_engine.get_player_height(x) if x else None
-                )
+                "transform": self.scraping_engine.get_player_height
             },
             "player_foot": {
                 **self.base_config,
                 "key": "foot",
                 "offset": 3,
-                "transform": lambda x: x.get_text(strip=True)
-                if x and x.get_text(strip=True) else None,
+                "transform": cell_text_or_none
             },
             "player_joined": {
                 **self.base_config,
                 "key": "joined",
                 "offset": 3,
-                "transform": lambda x: (
-                    self.scraping_engine.get_date(x).strftime("%Y-%m-%d")
-                    if x and self.scraping_engine.get_date(x) else None
-                )
+                "transform": self.cell_date
             },
             "player_contract": {
                 **self.base_config,
                 "key": "contract",
                 "offset": 3,
-                "transform": lambda x: (
-                    self.scraping_engine.get_date(x).strftime("%Y-%m-%d")
-                    if x and self.scraping_engine.get_date(x) else None
-                )
+                "transform": self.cell_date
             },
             "fk_team_signed_from": {
                 **self.base_config,
                 "key": "signed_from",
                 "offset": 3,
-                "transform": lambda x: (
-                    self.scraping_engine.get_team_signed_from_id(x) if x else None
-                )
+                "transform": self.scraping_engine.get_team_signed_from_id
             },
             "market_value": {
                 **self.base_config,
                 "key": "market_value",
                 "offset": 3,
-                "transform": lambda x: ScrapingEngine.parse_currency_to_float(
-                    x.get_text(strip=True)
-                    )
-                    if x else 0.0
+                "transform": cell_currency
             },
             "url_player": {
                 **self.base_config,
                 "key": "player",
-                "transform": lambda x: (
-                    PlayerManager.base_url + x.find("a")["href"].replace("startseite", "kader")
-                    if x and x.find("a") and "href" in x.find("a").attrs
-                    else None
-                )
+                "transform": self.cell_player_url
             },
         }
 
 
-    def extract_cell_value(
-            self,
-            headers,
-            col,
-            key,
-            offset: int = 0,
-            default=None,
-            transform=lambda x: x
-        ):
+    def cell_date(self, cell) -> str | None:
         """
-        Extrae y transforma el valor de una celda de la tabla según la configuración.
+        Fecha de la celda en formato "YYYY-MM-DD".
 
         Args:
-            headers (dict): Diccionario de encabezados de la tabla.
-            col (list): Lista de celdas de la fila.
-            key (str): Clave del encabezado.
-            offset (int): Desplazamiento para la columna.
-            default: Valor por defecto si falla la extracción.
-            transform (callable): Función de transformación para el valor.
+            cell (Tag): Celda con la fecha.
 
         Return:
-            Valor extraído y transformado, o el valor por defecto.
+            str | None: Fecha formateada o None si no se reconoce.
         """
+        value = self.scraping_engine.get_date(cell)
+        return value.strftime("%Y-%m-%d") if value else None
+
 
-        try:
-            index = headers[key] + offset if headers.get(key) is not None else None
-            cell = col[index] if index is not None and index < len(col) else None
+    @staticmethod
+    def get_age(birth_date: str | None) -> int | None:
+        """
+        Edad actual calculada a partir de la fecha de nacimiento. No se extrae de la tabla
+        (depende del día de hoy), así que los registros memorizados siguen siendo válidos.
 
-            return transform(cell) if cell else default
+        Args:
+            birth_date (str | None): Fecha de nacimiento en formato "YYYY-MM-DD".
+
+        Return:
+            int | None: Edad o None si no hay fecha.
+        """
+        birth = parse_date_string(birth_date) if birth_date else None
+        if not birth:
+            return None
+
+        today = datetime.now()
+        return (today.year - birth.year) - ((today.month, today.day) < (birth.month, birth.day))
+
+
+    def cell_player_url(self, cell) -> str | None:
+        """
+        URL de la plantilla del jugador a partir del enlace de la celda.
+
+        Args:
+            cell (Tag): Celda con el enlace del jugador.
+
+        Return:
+            str | None: URL completa o None si no hay enlace.
+        """
+        link = cell.find("a")
+        if link is None or "href" not in link.attrs:
+            return None
+
+        return PlayerManager.base_url + link["href"].replace("startseite", "kader")
 
-        except (IndexError, AttributeError) as e:
-            logging.warning(f"Error al extraer el valor de la celda: {e}")
-            return default
 
     def get_player_data(
             self,
@@ -209,64 +197,94 @@ class PlayerManager:
             List[Player]: Lista de objetos Player extraídos de la tabla.
         """
 
-        player_img_info_dict = self.scraping_engine.get_player_img_info(table)
+        table = ParsedTable.of(table)
 
         headers = self.scraping_engine.get_table_headers(table)
         if not headers:
             logging.error("No se encontraron encabezados en la tabla.")
             return []
 
-        rows = table.find("tbody").find_all("tr")
+        rows = table.rows
         if not rows:
             logging.warning("No se encontraron filas en la tabla.")
             return []
 
-        players = []
-        for row in rows:
-            col = row.find_all("td")
+        # Plan compilado una vez por estructura de encabezados. El nombre, la URL y la posición
+        # general se extraen de la fila completa más abajo, así que no se calculan por columna.
+        plan = self.scraping_engine.get_table_plan(table, "player", self.compile_plan)
 
-            if not col or len(col) < min_columns:
-                continue
+        # Valores de las filas (de la caché de parseo si la tabla no ha cambiado)
+        records = self.scraping_engine.get_table_records(
+            "player", table, min_columns, lambda: self.extract_player_records(table, plan, min_columns)
+        )
 
-            try:
-                extracted_values = {
-                    field: self.extract_cell_value(
-                        headers=headers,
-                        col=col,
-                        key=config["key"],
-                        offset=config.get("offset", 0),
-                        default=config.get("default", None),
-                        transform=config["transform"]
-                    )
-                    for field, config in self.player_field_config.items()
-                }
+        return self.build_players(records, fk_region, fk_league, team)
 
-                general_position = row.find("td", {"title": True})
-                extracted_values["general_position"] = general_position["title"] if general_position else None
 
-                player_url_cell = row.find("td", {"class": "hauptlink"})
-                extracted_values["url_player"] = (
-                    self.base_url + player_url_cell.find("a")["href"]
-                    if player_url_cell and player_url_cell.find("a")
-                    else None
-                )
+    def get_player_data_from_content(
+            self,
+            content: bytes,
+            min_columns: int,
+            fk_region: str,
+            fk_league: str,
+            team: Team,
 
-                extracted_values["player_name"] = (
-                    player_url_cell.find("a").get_text(strip=True)
-                    if player_url_cell and player_url_cell.find("a")
-                    else None
-                )
+    ) -> List[Player] | None:
+        """
+        Extrae los jugadores de los bytes de una página de plantilla con el camino rápido (`FastSquadExtractor`).
 
-                id_player = (
-                    re.search(r"spieler/(\d+)", extracted_values["url_player"]).group(1)
-                    if extracted_values["url_player"] and re.search(r"spieler/(\d+)", extracted_values["url_player"])
-                    else None
-                )
+        Args:
+            content (bytes): Contenido HTML de la página de la plantilla.
+            min_columns (int): Número mínimo de columnas requeridas por fila.
+            fk_region (str): ID de la región.
+            fk_league (str): ID de la liga.
+            team (Team): Equipo al que pertenecen los jugadores.
+
+        Return:
+            List[Player] | None: Jugadores, o None si el camino rápido está desactivado o no es aplicable a la página.
+        """
+        if self.fast_squad is None:
+            return None
+
+        records = self.fast_squad.extract(content, min_columns)
+        return self.build_players(records, fk_region, fk_league, team) if records is not None else None
+
+
+    def compile_plan(self, headers: dict) -> ExtractionPlan:
+        """
+        Compila el plan de extracción de una tabla de plantilla.
+
+        Args:
+            headers (dict): Encabezados de la tabla y su índice.
+
+        Return:
+            ExtractionPlan: Plan compilado.
+        """
+        return ExtractionPlan.compile(headers, self.player_field_config, skip=self.ROW_FIELDS)
+
+
+    def build_players(self, records: List[dict], fk_region: str, fk_league: str, team: Team) -> List[Player]:
+        """
+        Construye los jugadores a partir de los registros extraídos de la tabla.
+
+        Args:
+            records (list[dict]): Registros de `extract_player_records` (o del camino rápido).
+            fk_region (str): ID de la región.
+            fk_league (str): ID de la liga.
+            team (Team): Equipo al que pertenecen los jugadores.
+
+        Return:
+            List[Player]: Lista de objetos Player.
+        """
+        players = []
+        for extracted_values in records:
+            try:
+                id_player = extracted_values["id_player"]
 
                 player_stats = PlayerStats(
                     player_position=extracted_values["player_position"],
                     player_foot=extracted_values["player_foot"],
-                    player_age=extracted_values["player_age"],
+                    player_age=self.get_age(extracted_values["birth_date"]),
                     player_height=extracted_values["player_height"],
                     general_position=extracted_values["general_position"],
                     birth_date=extracted_values["birth_date"],
@@ -289,10 +307,9 @@ class PlayerManager:
                     stats=player_stats,
                 )
 
-                img_info = self.scraping_engine.get_player_img_info(table)
+                img_info = extracted_values["img_info"]
 
-                if id_player in player_img_info_dict:
-                    img_info = player_img_info_dict[id_player]
+                if img_info:
                     player.add_player_img_info(img_info=img_info)
 
                 else:
@@ -307,3 +324,50 @@ class PlayerManager:
 
         # pprint(players, indent=4)
         return players
+
+
+    def extract_player_records(self, table: ParsedTable, plan: ExtractionPlan, min_columns: int) -> List[dict]:
+        """
+        Extrae los valores de cada jugador de la tabla en una sola pasada por las filas: de cada una salen
+        los campos del plan, el nombre, la URL, la posición general y la información de imagen,
+        sin volver a recorrer la tabla.
+
+        Args:
+            table (ParsedTable): Tabla HTML con los datos de los jugadores.
+            plan (ExtractionPlan): Plan de extracción compilado de la tabla.
+            min_columns (int): Número mínimo de columnas requeridas por fila.
+
+        Return:
+            List[dict]: Valores extraídos de cada fila válida, en orden.
+        """
+        records = []
+        for row, col in zip(table.rows, table.cells):
+
+            if not col or len(col) < min_columns:
+                continue
+
+            try:
+                extracted_values = plan.extract(col)
+
+                general_position = row.find("td", {"title": True})
+                extracted_values["general_position"] = general_position["title"] if general_position else None
+
+                player_url_cell = row.find("td", {"class": "hauptlink"})
+                player_link = player_url_cell.find("a") if player_url_cell else None
+
+                extracted_values["url_player"] = self.base_url + player_link["href"] if player_link else None
+                extracted_values["player_name"] = player_link.get_text(strip=True) if player_link else None
+
+                id_match = PLAYER_ID_PATTERN.search(extracted_values["url_player"]) if player_link else None
+                extracted_values["id_player"] = id_match.group(1) if id_match else None
+
+                extracted_values["img_info"] = (
+                    self.scraping_engine.get_row_img_info(row) if extracted_values["id_player"] else None
+                )
+                records.append(extracted_values)
+
+            except Exception as e:
+                logging.warning(f"No se ha podido extraer los campos de la fila: {e}")
+                continue
+
+        return records
@@ -0,0 +1,90 @@
+import threading
+from time import monotonic, sleep
+
+
+class TokenBucket:
+    """
+    Limitador de tasa tipo token bucket.
+    Permite un ritmo sostenido de solicitudes por segundo con ráfagas de hasta `burst` solicitudes.
+    Es seguro entre hilos, por lo que una misma instancia puede compartirse entre todos los
+    hilos (y las corrutinas de AsyncHTTPClient) que usan el cliente HTTP.
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Inicializa el limitador con el bucket lleno.
+
+        Args:
+            rate (float): Tokens (solicitudes) repuestos por segundo.
+            burst (int, opcional): Capacidad máxima del bucket.
+        """
+        if rate <= 0:
+            raise ValueError("La tasa del limitador debe ser mayor que cero.")
+
+        if burst < 1:
+            raise ValueError("El tamaño de ráfaga debe ser al menos 1.")
+
+        self.rate = float(rate)
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = monotonic()
+        self.lock = threading.Lock()
+
+
+    def refill(self) -> None:
+        """
+        Repone los tokens acumulados desde la última actualización. Debe llamarse con el lock adquirido.
+        """
+        now = monotonic()
+        elapsed = now - self.updated_at
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """
+        Intenta consumir tokens sin bloquear.
+
+        Args:
+            tokens (int, opcional): Número de tokens a consumir.
+
+        Return:
+            bool: True si se consumieron, False si no había suficientes.
+        """
+        with self.lock:
+            self.refill()
+
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+
+            return False
+
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Consume tokens, esperando lo necesario hasta que estén disponibles.
+
+        Args:
+            tokens (int, opcional): Número de tokens a consumir.
+
+        Return:
+            float: Segundos esperados.
+        """
+        if tokens > self.burst:
+            raise ValueError(f"No se pueden consumir {tokens} tokens con una ráfaga máxima de {self.burst}.")
+
+        waited = 0.0
+        while True:
+            with self.lock:
+                self.refill()
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+
+                # Tiempo hasta que se repongan los tokens que faltan
+                wait = (tokens - self.tokens) / self.rate
+
+            # Esperamos fuera del lock para no bloquear al resto de hilos
+            sleep(wait)
+            waited += wait
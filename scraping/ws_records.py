@@ -0,0 +1,493 @@
+import logging
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from scraping.ws_entities import League, LeagueStats, Team, TeamStats, Player, PlayerStats
+from typing import Any, Dict, List
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Tipos de columna y su dtype de NumPy. Las cadenas se guardan como offsets + bytes UTF-8 (como Arrow).
+COLUMN_DTYPES = {
+    "int": "<i8",
+    "float": "<f8",
+}
+
+# Alineación de cada bloque dentro de la memoria compartida
+ALIGNMENT = 8
+
+
+def align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class SharedBatch:
+    """
+    Lote columnar de registros escrito en un bloque de memoria compartida (multiprocessing.shared_memory).
+    Solo este descriptor (nombre del bloque y posición de cada columna) viaja por pickle entre procesos;
+    las columnas se leen en el proceso principal directamente del bloque con NumPy, sin copiar ni
+    deserializar objeto a objeto. Cada columna tiene una máscara de validez para representar None.
+    """
+    def __init__(self, name: str, length: int, layout: Dict[str, dict]):
+        """
+        Inicializa el descriptor.
+
+        Args:
+            name (str): Nombre del bloque de memoria compartida.
+            length (int): Número de registros.
+            layout (dict): Tipo y posición de los bloques de cada columna.
+        """
+        self.name = name
+        self.length = length
+        self.layout = layout
+
+
+    @classmethod
+    def write(cls, schema: tuple, rows: List[tuple]) -> "SharedBatch":
+        """
+        Escribe los registros en un bloque nuevo de memoria compartida (en el proceso trabajador).
+
+        Args:
+            schema (tuple): Pares (columna, tipo) con tipo "str", "int" o "float".
+            rows (list[tuple]): Registros con los valores en el orden del esquema.
+
+        Return:
+            SharedBatch: Descriptor del lote.
+        """
+        length = len(rows)
+        columns = list(zip(*rows)) if rows else [()] * len(schema)
+
+        # Calculamos la posición de cada bloque antes de reservar la memoria
+        layout = {}
+        encoded = {}
+        size = 0
+        for (column, kind), values in zip(schema, columns):
+            entry = {"kind": kind}
+
+            if kind == "str":
+                parts = [value.encode("utf-8") if value is not None else b"" for value in values]
+                encoded[column] = parts
+
+                entry["offsets"] = size
+                size = align(size + (length + 1) * 8)
+                entry["blob"] = size
+                entry["blob_size"] = sum(len(part) for part in parts)
+                size = align(size + entry["blob_size"])
+
+            else:
+                entry["values"] = size
+                size = align(size + length * 8)
+
+            entry["valid"] = size
+            size = align(size + length)
+            layout[column] = entry
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        # El bloque pasa a ser del proceso principal, que lo borra al leerlo o, si no llega a leerlo, en ParsePipeline.close
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+        try:
+            for (column, kind), values in zip(schema, columns):
+                cls.write_column(shm.buf, layout[column], length, values, encoded.get(column))
+
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+
+        shm.close()
+        return cls(shm.name, length, layout)
+
+
+    @staticmethod
+    def write_column(buf, entry: dict, length: int, values: tuple, parts: list = None) -> None:
+        """
+        Escribe una columna y su máscara de validez en el bloque.
+
+        Args:
+            buf (memoryview): Memoria del bloque.
+            entry (dict): Posición de los bloques de la columna.
+            length (int): Número de registros.
+            values (tuple): Valores de la columna.
+            parts (list, opcional): Cadenas ya codificadas en UTF-8 (columnas "str").
+        """
+        valid = np.ndarray((length,), dtype=np.uint8, buffer=buf, offset=entry["valid"])
+        valid[:] = [value is not None for value in values]
+
+        if entry["kind"] == "str":
+            offsets = np.ndarray((length + 1,), dtype="<i8", buffer=buf, offset=entry["offsets"])
+            offsets[0] = 0
+            offsets[1:] = np.cumsum([len(part) for part in parts], dtype="<i8")
+            buf[entry["blob"]:entry["blob"] + entry["blob_size"]] = b"".join(parts)
+
+        else:
+            array = np.ndarray((length,), dtype=COLUMN_DTYPES[entry["kind"]], buffer=buf, offset=entry["values"])
+            array[:] = [value if value is not None else 0 for value in values]
+
+
+    @contextmanager
+    def columns(self, unlink: bool = False):
+        """
+        Abre el bloque y devuelve las columnas como vistas de NumPy sobre la memoria compartida (sin copia).
+        Las vistas solo son válidas dentro del bloque `with`.
+
+        Args:
+            unlink (bool, opcional): Si se borra el bloque al salir.
+
+        Return:
+            dict: Por columna, (valores, máscara de validez). Las cadenas son (offsets, bytes, máscara).
+        """
+        shm = shared_memory.SharedMemory(name=self.name)
+
+        views = {}
+        try:
+            for column, entry in self.layout.items():
+                valid = np.ndarray((self.length,), dtype=np.uint8, buffer=shm.buf, offset=entry["valid"])
+
+                if entry["kind"] == "str":
+                    offsets = np.ndarray((self.length + 1,), dtype="<i8", buffer=shm.buf, offset=entry["offsets"])
+                    blob = shm.buf[entry["blob"]:entry["blob"] + entry["blob_size"]]
+                    views[column] = (offsets, blob, valid)
+
+                else:
+                    values = np.ndarray((self.length,), dtype=COLUMN_DTYPES[entry["kind"]], buffer=shm.buf, offset=entry["values"])
+                    views[column] = (values, valid)
+
+            # Las vistas locales deben soltarse antes de cerrar el bloque
+            valid = offsets = blob = values = None
+            yield views
+
+        finally:
+            for view in views.values():
+                for part in view:
+                    if isinstance(part, memoryview):
+                        part.release()
+
+            views.clear()
+            shm.close()
+
+            if unlink:
+                shm.unlink()
+
+            else:
+                # Al abrir un bloque existente Python lo registra de nuevo; no es nuestro
+                resource_tracker.unregister(shm._name, "shared_memory")
+
+
+    @staticmethod
+    def decode_column(kind: str, view: tuple) -> list:
+        """
+        Convierte una columna a una lista de valores de Python (None donde la máscara es 0).
+
+        Args:
+            kind (str): Tipo de la columna.
+            view (tuple): Vistas de la columna devueltas por `columns`.
+
+        Return:
+            list: Valores de la columna.
+        """
+        if kind == "str":
+            offsets, blob, valid = view
+            data = bytes(blob)
+            text = data.decode("utf-8")
+            bounds = offsets.tolist()
+
+            # Si todo es ASCII, los offsets en bytes coinciden con los de caracteres: un solo decode
+            source, decode = (text, False) if len(text) == len(data) else (data, True)
+            return [
+                (source[bounds[i]:bounds[i + 1]].decode("utf-8") if decode else source[bounds[i]:bounds[i + 1]])
+                if is_valid else None
+                for i, is_valid in enumerate(valid.tolist())
+            ]
+
+        array, valid = view
+        return [value if is_valid else None for value, is_valid in zip(array.tolist(), valid.tolist())]
+
+
+    def read(self) -> List[tuple]:
+        """
+        Lee todos los registros y borra el bloque de memoria compartida.
+
+        Return:
+            list[tuple]: Registros con valores de Python, en el orden de columnas del esquema.
+        """
+        with self.columns(unlink=True) as views:
+            values = [self.decode_column(entry["kind"], views[column]) for column, entry in self.layout.items()]
+
+        return list(zip(*values))
+
+
+    def release(self) -> None:
+        """
+        Borra el bloque de memoria compartida.
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=self.name)
+            shm.close()
+            shm.unlink()
+
+        except FileNotFoundError:
+            pass
+
+
+# Esquemas columnar de cada tipo de registro: (columna, tipo)
+LEAGUE_SCHEMA = (
+    ("tier", "str"), ("id_league", "str"), ("competition", "str"), ("season", "int"),
+    ("fk_country", "str"), ("country", "str"), ("url_league", "str"),
+    ("fk_region", "str"), ("stats_season", "int"), ("total_clubs", "int"), ("total_players", "int"),
+    ("avg_age", "float"), ("foreigners", "float"), ("game_ratio_of_foreign_players", "float"),
+    ("goals_per_match", "float"), ("avg_market_value", "float"), ("total_value", "float"),
+)
+
+TEAM_SCHEMA = (
+    ("id_team", "str"), ("fk_region", "str"), ("fk_league", "str"), ("season", "int"),
+    ("team_name", "str"), ("url_team", "str"),
+    ("fk_team", "str"), ("total_players", "int"), ("avg_age", "float"), ("foreigners", "int"),
+    ("avg_market_value", "float"), ("total_market_value", "float"),
+)
+
+PLAYER_SCHEMA = (
+    ("id_player", "str"), ("fk_region", "str"), ("fk_league", "str"), ("fk_country", "str"),
+    ("player_name", "str"), ("season", "int"), ("player_joined", "str"), ("player_contract", "str"),
+    ("fk_team_signed_from", "str"), ("url_player", "str"),
+    ("has_img_info", "int"), ("img_fk_player", "str"), ("id_img", "str"), ("img_player", "str"),
+    ("birth_date", "str"), ("player_age", "int"), ("player_height", "float"), ("general_position", "str"),
+    ("player_position", "str"), ("player_foot", "str"), ("market_value", "float"),
+)
+
+
+def league_to_row(item: tuple) -> tuple:
+    tier, league = item
+    stats = league.stats
+    return (
+        tier, league.id_league, league.competition, league.season,
+        league.fk_country, league.country, league.url_league,
+        stats.fk_region, stats.season, stats.total_clubs, stats.total_players,
+        stats.avg_age, stats.foreigners, stats.game_ratio_of_foreign_players,
+        stats.goals_per_match, stats.avg_market_value, stats.total_value,
+    )
+
+
+def league_from_row(row: tuple) -> tuple:
+    (
+        tier, id_league, competition, season, fk_country, country, url_league,
+        fk_region, stats_season, total_clubs, total_players, avg_age, foreigners,
+        game_ratio_of_foreign_players, goals_per_match, avg_market_value, total_value
+    ) = row
+
+    league_stats = LeagueStats(
+        fk_league=id_league,
+        fk_region=fk_region,
+        season=stats_season,
+        total_clubs=total_clubs,
+        total_players=total_players,
+        avg_age=avg_age,
+        foreigners=foreigners,
+        game_ratio_of_foreign_players=game_ratio_of_foreign_players,
+        goals_per_match=goals_per_match,
+        avg_market_value=avg_market_value,
+        total_value=total_value
+    )
+
+    league = League(
+        id_league=id_league,
+        competition=competition,
+        season=season,
+        fk_country=fk_country,
+        country=country,
+        url_league=url_league,
+        stats=league_stats,
+        teams={
+            "fk_region": fk_region,
+            "fk_league": id_league,
+            "url_league": url_league
+        }
+    )
+
+    return tier, league
+
+
+def team_to_row(team: Team) -> tuple:
+    stats = team.stats
+    return (
+        team.id_team, team.fk_region, team.fk_league, team.season,
+        team.team_name, team.url_team,
+        stats.fk_team, stats.total_players, stats.avg_age, stats.foreigners,
+        stats.avg_market_value, stats.total_market_value,
+    )
+
+
+def team_from_row(row: tuple) -> Team:
+    (
+        id_team, fk_region, fk_league, season, team_name, url_team,
+        fk_team, total_players, avg_age, foreigners, avg_market_value, total_market_value
+    ) = row
+
+    team_stats = TeamStats(
+        fk_team=fk_team,
+        fk_region=fk_region,
+        fk_league=fk_league,
+        season=season,
+        total_players=total_players,
+        avg_age=avg_age,
+        foreigners=foreigners,
+        avg_market_value=avg_market_value,
+        total_market_value=total_market_value
+    )
+
+    return Team(
+        id_team=id_team,
+        fk_region=fk_region,
+        fk_league=fk_league,
+        season=season,
+        team_name=team_name,
+        url_team=url_team,
+        stats=team_stats
+    )
+
+
+def player_to_row(player: Player) -> tuple:
+    stats = player.stats
+    img_info = player.player_img_info or {}
+    return (
+        player.id_player, player.fk_region, player.fk_league, player.fk_country,
+        player.player_name, player.season, player.player_joined, player.player_contract,
+        player.fk_team_signed_from, player.url_player,
+        1 if img_info else 0, img_info.get("fk_player"), img_info.get("id_img"), img_info.get("img_player"),
+        stats.birth_date, stats.player_age, stats.player_height, stats.general_position,
+        stats.player_position, stats.player_foot, stats.market_value,
+    )
+
+
+def player_from_row(row: tuple) -> Player:
+    (
+        id_player, fk_region, fk_league, fk_country, player_name, season, player_joined, player_contract,
+        fk_team_signed_from, url_player, has_img_info, img_fk_player, id_img, img_player,
+        birth_date, player_age, player_height, general_position, player_position, player_foot, market_value
+    ) = row
+
+    player_stats = PlayerStats(
+        birth_date=birth_date,
+        player_age=player_age,
+        player_height=player_height,
+        general_position=general_position,
+        player_position=player_position,
+        player_foot=player_foot,
+        market_value=market_value
+    )
+
+    player = Player(
+        fk_region=fk_region,
+        fk_league=fk_league,
+        id_player=id_player,
+        fk_country=fk_country,
+        player_name=player_name,
+        season=season,
+        player_joined=player_joined,
+        player_contract=player_contract,
+        fk_team_signed_from=fk_team_signed_from,
+        url_player=url_player,
+        stats=player_stats
+    )
+
+    if has_img_info:
+        player.player_img_info = {
+            "fk_player": img_fk_player,
+            "id_img": id_img,
+            "img_player": img_player
+        }
+
+    return player
+
+
+# Tipos de registro: esquema, conversión a fila y reconstrucción de la entidad
+RECORD_TYPES: Dict[str, tuple] = {
+    "league": (LEAGUE_SCHEMA, league_to_row, league_from_row),
+    "team": (TEAM_SCHEMA, team_to_row, team_from_row),
+    "player": (PLAYER_SCHEMA, player_to_row, player_from_row),
+}
+
+# Tipos de Python exactos admitidos por cada tipo de columna
+PYTHON_TYPES = {
+    "str": str,
+    "int": int,
+    "float": float,
+}
+
+
+def matches_schema(schema: tuple, rows: List[tuple]) -> bool:
+    """
+    Comprueba que todos los valores tienen exactamente el tipo de su columna (o son None),
+    para que la reconstrucción sea idéntica a la entidad original.
+    """
+    for row in rows:
+        for (column, kind), value in zip(schema, row):
+            if value is not None and type(value) is not PYTHON_TYPES[kind]:
+                logging.debug(f"Columna '{column}' con tipo inesperado {type(value).__name__}: se envía por pickle.")
+                return False
+
+    return True
+
+
+def pack(record_type: str, items: List[Any]):
+    """
+    Convierte las entidades de un trabajador en un lote de memoria compartida.
+    Si NumPy no está instalado o algún valor no encaja en el esquema, se devuelven las entidades tal cual.
+
+    Args:
+        record_type (str): "league", "team" o "player".
+        items (list): Entidades (para "league", pares (tier, League)).
+
+    Return:
+        SharedBatch | list: Lote columnar o la lista original.
+    """
+    if not NUMPY_AVAILABLE or not items:
+        return items
+
+    schema, to_row, _ = RECORD_TYPES[record_type]
+
+    try:
+        rows = [to_row(item) for item in items]
+
+    except AttributeError as e:
+        logging.debug(f"No se pudo convertir el registro '{record_type}' a columnas: {e}")
+        return items
+
+    if not matches_schema(schema, rows):
+        return items
+
+    return SharedBatch.write(schema, rows)
+
+
+def unpack(record_type: str, result) -> List[Any]:
+    """
+    Reconstruye las entidades a partir de lo devuelto por `pack`.
+
+    Args:
+        record_type (str): "league", "team" o "player".
+        result (SharedBatch | list | None): Resultado del trabajador.
+
+    Return:
+        list | None: Entidades reconstruidas (None si el resultado era None).
+    """
+    if not isinstance(result, SharedBatch):
+        return result
+
+    _, _, from_row = RECORD_TYPES[record_type]
+    return [from_row(row) for row in result.read()]
+
+
+def discard(result) -> None:
+    """
+    Libera un resultado de `pack` que no se va a leer.
+
+    Args:
+        result (SharedBatch | list | None): Resultado del trabajador.
+    """
+    if isinstance(result, SharedBatch):
+        result.release()
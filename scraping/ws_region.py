@@ -1,8 +1,10 @@
 import logging
+import asyncio
 from scraping.ws_entities import Region, RegionStats, Country, League, LeagueStats
 from scraping.ws_engine import ScrapingEngine
-from bs4 import BeautifulSoup
-from typing import Dict, Any
+from scraping.ws_scheduler import CrawlScheduler
+from scraping.ws_document import ParsedDocument
+from typing import Dict, Any, List
 
 class RegionManager:
     """
@@ -55,80 +57,278 @@ class RegionManager:
             stats=region_stats
         )
 
-    def process_region(self, region: Region, region_data: Dict[str, Any]) -> None:
+    def process_region(self, region: Region, region_data: Dict[str, Any], scheduler: CrawlScheduler = None) -> None:
         """
         Procesa una región extrayendo países, ligas y calculando estadísticas agregadas.
+        Si se indica un planificador, las páginas se envían como tareas y el llamador debe ejecutar `scheduler.run()`.
 
         Args:
             region (Region): Instancia de la región a procesar.
             region_data (dict): Diccionario con los datos de la región.
+            scheduler (CrawlScheduler, opcional): Planificador del crawl.
         """
+        urls = region_data["url_region"]
 
-        for page_number, url in enumerate(region_data["url_region"], start=1):
-            response = self.http_client.make_request(url)
+        if scheduler is not None:
+            # Las páginas se encadenan: cada una envía la siguiente solo si encontró ligas
+            self.schedule_region_page(region, urls, 1, scheduler)
+            return
 
+        for page_number, url in enumerate(urls, start=1):
+            if not self.process_region_page(region, url, page_number, len(urls)):
+                return
+
+        self.calculate_region_stats(region)
+
+
+    def schedule_region_page(self, region: Region, urls: List[str], page_number: int, scheduler: CrawlScheduler) -> None:
+        """
+        Envía una página de la región al planificador o, si ya no quedan páginas, el cálculo de estadísticas.
+
+        Args:
+            region (Region): Instancia de la región.
+            urls (list[str]): URLs de las páginas de la región.
+            page_number (int): Número de la página a enviar.
+            scheduler (CrawlScheduler): Planificador del crawl.
+        """
+        if page_number > len(urls):
+            # Las estadísticas se calculan cuando ya no quedan ligas ni equipos por procesar (ni aparcados)
+            scheduler.submit(
+                self.calculate_region_stats,
+                region,
+                final=True,
+                name=f"{region.id_region} estadísticas"
+            )
+            return
+
+        scheduler.submit(
+            self.process_scheduled_region_page,
+            region, urls, page_number, scheduler,
+            priority=CrawlScheduler.REGION_PRIORITY,
+            name=f"{region.id_region} página {page_number}"
+        )
+
+
+    def process_scheduled_region_page(self, region: Region, urls: List[str], page_number: int, scheduler: CrawlScheduler) -> None:
+        """
+        Tarea del planificador para una página de la región. Igual que en el flujo secuencial, una página
+        sin ligas termina la región sin calcular sus estadísticas; si no, se envía la página siguiente.
+
+        Args:
+            region (Region): Instancia de la región.
+            urls (list[str]): URLs de las páginas de la región.
+            page_number (int): Número de la página.
+            scheduler (CrawlScheduler): Planificador del crawl.
+        """
+        if self.process_region_page(region, urls[page_number - 1], page_number, len(urls), scheduler):
+            self.schedule_region_page(region, urls, page_number + 1, scheduler)
+
+
+    def process_region_page(
+            self,
+            region: Region,
+            url: str,
+            page_number: int,
+            total_pages: int,
+            scheduler: CrawlScheduler = None
+
+        ) -> bool:
+        """
+        Procesa una página del listado de la región: extrae sus ligas y procesa sus temporadas.
+
+        Args:
+            region (Region): Instancia de la región.
+            url (str): URL de la página.
+            page_number (int): Número de la página.
+            total_pages (int): Número total de páginas de la región.
+            scheduler (CrawlScheduler, opcional): Planificador al que se envían las ligas como tareas.
+
+        Return:
+            bool: False si no se encontraron ligas y se debe dejar de procesar la región.
+        """
+        response = self.http_client.make_request(url)
+
+        if not response:
+            logging.warning(f"No se pudo obtener el HTML de la URL: {url}")
+            return True
+
+        table = self.extract_region_table(response.content, url)
+        if not table:
+            return True
+
+        leagues = self.add_region_leagues(region, table)
+        if not leagues:
+            return False
+
+        # Procesamos las temporadas y equipos de cada liga
+        for league in leagues:
+            if scheduler is not None:
+                tier = self.get_league_tier(region, league)
+                scheduler.submit(
+                    self.league_manager.process_league_season,
+                    league, region, self.team_manager, scheduler, tier,
+                    priority=scheduler.get_priority(tier),
+                    name=league.competition
+                )
+
+            else:
+                self.league_manager.process_league_season(league, region, self.team_manager)
+
+        logging.info(f"Página {page_number} de {total_pages}: {len(leagues)} ligas extraídas.")
+        return True
+
+
+    @staticmethod
+    def get_league_tier(region: Region, league: League) -> str | None:
+        """
+        Devuelve el tier en el que se agregó una liga a la región.
+
+        Args:
+            region (Region): Instancia de la región.
+            league (League): Liga buscada.
+
+        Return:
+            str | None: Tier de la liga o None si no está en la región.
+        """
+        for tier, leagues_in_tier in region.leagues.items():
+            if leagues_in_tier.get(league.id_league) is league:
+                return tier
+
+        return None
+
+
+    async def process_region_async(self, region: Region, region_data: Dict[str, Any], async_client) -> None:
+        """
+        Versión asíncrona de process_region: descarga las páginas de la región y
+        procesa todas sus ligas de forma concurrente con AsyncHTTPClient.
+
+        Args:
+            region (Region): Instancia de la región a procesar.
+            region_data (dict): Diccionario con los datos de la región.
+            async_client (AsyncHTTPClient): Cliente HTTP asíncrono.
+        """
+        urls = region_data["url_region"]
+        responses = await asyncio.gather(*(async_client.make_request(url) for url in urls))
+
+        region_leagues = []
+        finished = False
+        for page_number, (url, response) in enumerate(zip(urls, responses), start=1):
             if not response:
                 logging.warning(f"No se pudo obtener el HTML de la URL: {url}")
                 continue
 
-            soup = BeautifulSoup(response.content, "html.parser")
-            table = soup.find("table", {"class": "items"})
-
+            table = self.extract_region_table(response.content, url)
             if not table:
-                logging.warning(f"No se encontró la tabla de ligas en la URL: {url}")
                 continue
 
-            # Extraemos la info de los paises:
-            try:
-                country_info = self.league_manager.scraping_engine.get_country_info(table)
+            # Una página sin ligas termina la región (igual que process_region)
+            leagues = self.add_region_leagues(region, table)
+            if not leagues:
+                finished = True
+                break
 
-                for country_id, country_data in country_info.items():
-                    country = Country(
-                        id_country=country_id,
-                        country_name=country_data["country_name"],
-                        country_flag=country_data["country_flag"]
-                    )
-                    region.add_country(country)
+            region_leagues.extend(leagues)
+            logging.info(f"Página {page_number} de {len(urls)}: {len(leagues)} ligas extraídas.")
+
+        # Procesamos las temporadas y equipos de todas las ligas a la vez
+        await asyncio.gather(*(
+            self.league_manager.process_league_season_async(league, region, self.team_manager, async_client)
+            for league in region_leagues
+        ))
+
+        # Como en process_region, una región terminada por una página vacía no calcula estadísticas
+        if finished:
+            return
+
+        self.calculate_region_stats(region)
+
+
+    def extract_region_table(self, content: bytes, url: str):
+        """
+        Parsea una página de la región y devuelve su tabla de ligas.
+
+        Args:
+            content (bytes): Contenido HTML de la página.
+            url (str): URL de la página (solo para los mensajes de log).
+
+        Return:
+            ParsedTable | None: Tabla de ligas o None si no existe.
+        """
+        table = ParsedDocument.parse(content, targets=("items",)).table
 
-            except Exception as e:
-                logging.error(f"Error al extraer información de países para la región {region.id_region}: {e}")
+        if not table:
+            logging.warning(f"No se encontró la tabla de ligas en la URL: {url}")
 
+        return table
 
-            # Obtenemos el diccionario provisional de competition -> tier
-            competition_to_tier = self.league_manager.scraping_engine.get_league_tier(table)
 
-            # Usa LeagueManager para extraer las ligas
-            try:
-                leagues = self.league_manager.get_league_data(
-                    table,
-                    min_columns=5,
-                    region_id=region.id_region,
-                    region_countries=region.countries
+    def add_region_leagues(self, region: Region, table) -> List[League] | None:
+        """
+        Extrae los países y las ligas de una tabla de la región y los agrega a la región.
+
+        Args:
+            region (Region): Instancia de la región.
+            table (ParsedTable): Tabla de ligas de la página (compartida por todos los extractores).
+
+        Return:
+            List[League] | None: Ligas agregadas o None si no se pudieron extraer.
+        """
+
+        # Extraemos la info de los paises:
+        try:
+            country_info = self.league_manager.scraping_engine.get_country_info(table)
+
+            for country_id, country_data in country_info.items():
+                country = Country(
+                    id_country=country_id,
+                    country_name=country_data["country_name"],
+                    country_flag=country_data["country_flag"]
                 )
+                region.add_country(country)
 
-            except Exception as e:
-                logging.error(f"Error al obtener las ligas para la región {region.id_region}: {e}")
-                return
+        except Exception as e:
+            logging.error(f"Error al extraer información de países para la región {region.id_region}: {e}")
 
-            # Validar que leagues sea una lista válida
-            if not leagues:
-                logging.warning(f"No se encontraron ligas en la tabla para la región {region.id_region}.")
-                return
 
-            # Asignar el tier correcto a cada liga y agregarla a la región
-            for league in leagues:
-                if not isinstance(league, League):
-                    raise TypeError(f"Se esperaba una instancia de League, pero se recibió {type(league)}")
+        # Obtenemos el diccionario provisional de competition -> tier
+        competition_to_tier = self.league_manager.scraping_engine.get_league_tier(table)
 
-                tier = competition_to_tier.get(league.competition, "Unknown Tier")
-                region.add_league(tier, league)
+        # Usa LeagueManager para extraer las ligas
+        try:
+            leagues = self.league_manager.get_league_data(
+                table,
+                min_columns=5,
+                region_id=region.id_region,
+                region_countries=region.countries
+            )
 
-                # Procesamos las temporadas y equipos de cada liga
-                self.league_manager.process_league_season(league, region, self.team_manager)
+        except Exception as e:
+            logging.error(f"Error al obtener las ligas para la región {region.id_region}: {e}")
+            return None
+
+        # Validar que leagues sea una lista válida
+        if not leagues:
+            logging.warning(f"No se encontraron ligas en la tabla para la región {region.id_region}.")
+            return None
+
+        # Asignar el tier correcto a cada liga y agregarla a la región
+        for league in leagues:
+            if not isinstance(league, League):
+                raise TypeError(f"Se esperaba una instancia de League, pero se recibió {type(league)}")
+
+            tier = competition_to_tier.get(league.competition, "Unknown Tier")
+            region.add_league(tier, league)
 
-            logging.info(f"Página {page_number} de {len(region_data['url_region'])}: {len(leagues)} ligas extraídas.")
+        return leagues
 
-        # Calculamos las estadísticas de la región
+
+    def calculate_region_stats(self, region: Region) -> None:
+        """
+        Calcula las estadísticas agregadas de la región a partir de sus ligas.
+
+        Args:
+            region (Region): Instancia de la región.
+        """
         if region.leagues:
             stats_to_calculate = ["average_market_value", "total_value"]
 
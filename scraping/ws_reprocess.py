@@ -0,0 +1,162 @@
+"""
+Modo de reprocesado offline: regenera el JSON de TransferMarket a partir del HTML archivado
+(`PageArchive`) sin tocar la red, repartiendo el parseo entre todos los núcleos con `ParsePipeline`.
+
+Uso:
+    python -m scraping.ws_reprocess [--archive cache/archive] [--regions EUR1 AME1] [--output transfermarkt_reprocess.json]
+                                    [--workers N] [--sequential]
+
+Con `--sequential` se recorre el mismo flujo que el crawl en vivo (`RegionManager.process_region`,
+`LeagueManager.process_league_season` y `TeamManager.process_team_players`) en un solo proceso.
+"""
+import os
+import argparse
+from time import perf_counter
+from typing import List
+from scraping.ws_archive import PageArchive
+from scraping.ws_cache import ResponseCache
+from scraping.ws_httpClient import HTTPClient
+from scraping.ws_engine import ScrapingEngine
+from scraping.ws_urls import TransfermarktURLManager
+from scraping.ws_dataManager import DataManager
+from scraping.ws_leagues import LeagueManager
+from scraping.ws_teams import TeamManager
+from scraping.ws_region import RegionManager
+from scraping.ws_pipeline import ParsePipeline
+from config.exceptions import logging, HTTPResponseError
+
+
+class ArchiveHTTPClient(HTTPClient):
+    """
+    Cliente HTTP que sirve las páginas desde un `PageArchive` en lugar de la red.
+    Los gestores lo usan igual que un `HTTPClient`: una URL archivada devuelve su última descarga
+    como una respuesta 200 y una URL que no está en el archivo se comporta como un 404.
+    """
+    def __init__(self, archive: PageArchive, **kwargs):
+        """
+        Inicializa el cliente.
+
+        Args:
+            archive (PageArchive): Archivo del que se leen las páginas.
+            **kwargs: Argumentos adicionales para HTTPClient.
+        """
+        # Sin reintentos ni pausas: leer del archivo no falla de forma transitoria
+        kwargs.setdefault("retries", 1)
+        kwargs.setdefault("delay", 0)
+        super().__init__(**kwargs)
+        self.page_archive = archive
+
+
+    def fetch(self, url, method="GET", extra_headers=None, **kwargs):
+        """
+        Lee la última descarga archivada de la URL.
+
+        Args:
+            url (str): URL solicitada.
+            method (str): Método HTTP (por defecto "GET").
+            extra_headers (dict, opcional): Se ignoran.
+            **kwargs: Se ignoran.
+
+        Return:
+            Response: Respuesta reconstruida con el contenido archivado.
+        """
+        entry = self.page_archive.latest(url)
+        if entry is None:
+            logging.warning(f"URL no archivada: {url}")
+            raise HTTPResponseError(404, f"Error: la URL {url} no está en el archivo.")
+
+        return ResponseCache.build_response(
+            url, 200, {"Content-Type": "text/html; charset=utf-8"}, self.page_archive.read(entry)
+        )
+
+
+def archived_regions(archive: PageArchive) -> List[str]:
+    """
+    Regiones cuya primera página está en el archivo.
+
+    Args:
+        archive (PageArchive): Archivo de páginas.
+
+    Return:
+        list[str]: Claves de las regiones archivadas.
+    """
+    return [
+        key for key, region in TransfermarktURLManager.REGIONS.items()
+        if archive.latest(TransfermarktURLManager.BASE_URL.format(region=region, page=1)) is not None
+    ]
+
+
+def reprocess(
+        archive: PageArchive,
+        regions: List[str] = None,
+        parse_workers: int = None,
+        sequential: bool = False
+    ) -> DataManager:
+    """
+    Regenera los datos de TransferMarket desde el archivo.
+
+    Args:
+        archive (PageArchive): Archivo de páginas.
+        regions (list[str], opcional): Claves de las regiones (por defecto, las archivadas).
+        parse_workers (int, opcional): Procesos de parseo (por defecto, uno por núcleo).
+        sequential (bool, opcional): Si se usa el flujo secuencial de los gestores en lugar de `ParsePipeline`.
+
+    Return:
+        DataManager: Gestor de datos con las regiones procesadas.
+    """
+    if regions is None:
+        regions = archived_regions(archive)
+
+    http_client = ArchiveHTTPClient(archive, coalesce_window=None)
+    scraping_engine = ScrapingEngine(http_client)
+    url_manager = TransfermarktURLManager(http_client, scraping_engine, regions=regions)
+
+    data_manager = DataManager(http_client)
+    region_manager = RegionManager(
+        http_client,
+        LeagueManager(scraping_engine, data_manager),
+        TeamManager(scraping_engine, data_manager)
+    )
+
+    if sequential:
+        for key in url_manager.regions:
+            region_data = url_manager.urls[key]
+            region = region_manager.create_region(key, region_data)
+            region_manager.process_region(region, region_data)
+            data_manager.add_region(region)
+
+    else:
+        # Leer del archivo es inmediato: basta con pocos hilos para alimentar a los procesos de parseo
+        with ParsePipeline(region_manager, parse_workers=parse_workers, fetch_workers=4) as pipeline:
+            for key in url_manager.regions:
+                region_data = url_manager.urls[key]
+                region = region_manager.create_region(key, region_data)
+                pipeline.process_region(region, region_data)
+                data_manager.add_region(region)
+
+    http_client.close()
+    return data_manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenera el JSON de TransferMarket desde el HTML archivado.")
+    parser.add_argument("--archive", default=os.path.join(os.getcwd(), "cache", "archive"), help="Directorio del archivo.")
+    parser.add_argument("--regions", nargs="+", default=None, help="Regiones a procesar (por defecto, las archivadas).")
+    parser.add_argument("--output", default="transfermarkt_reprocess.json", help="Fichero JSON de salida (en 'Data output').")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos de parseo (por defecto, uno por núcleo).")
+    parser.add_argument("--sequential", action="store_true", help="Usa el flujo secuencial de los gestores.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.archive):
+        parser.error(f"No existe el archivo: {args.archive}")
+
+    started = perf_counter()
+    with PageArchive(args.archive) as archive:
+        data_manager = reprocess(archive, args.regions, args.workers, args.sequential)
+
+    data_manager.to_json(args.output)
+    logging.info(f"Reprocesado completado en {perf_counter() - started:.1f} s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class RetryBudget:
+    """
+    Presupuesto global de reintentos para todo un crawl.
+    Se comparte entre hilos para que un periodo inestable no multiplique el tiempo total de ejecución.
+    """
+    def __init__(self, max_retries: int):
+        """
+        Inicializa el presupuesto.
+
+        Args:
+            max_retries (int): Número máximo de reintentos permitidos en todo el crawl.
+        """
+        if max_retries < 0:
+            raise ValueError("El presupuesto de reintentos no puede ser negativo.")
+
+        self.max_retries = max_retries
+        self.used = 0
+        self.lock = threading.Lock()
+
+
+    @property
+    def remaining(self) -> int:
+        """
+        Reintentos que quedan disponibles.
+        """
+        return max(0, self.max_retries - self.used)
+
+
+    def try_spend(self) -> bool:
+        """
+        Consume un reintento del presupuesto si queda alguno.
+
+        Return:
+            bool: True si se pudo consumir, False si el presupuesto está agotado.
+        """
+        with self.lock:
+            if self.used >= self.max_retries:
+                return False
+
+            self.used += 1
+            return True
+
+
+    def reset(self) -> None:
+        """
+        Restablece el presupuesto para un nuevo crawl.
+        """
+        with self.lock:
+            self.used = 0
+
+
+class RetryPolicy:
+    """
+    Política de reintentos para HTTPClient.
+    Clasifica los códigos de estado, calcula esperas con backoff exponencial y jitter,
+    respeta la cabecera Retry-After y descuenta cada reintento del presupuesto global.
+    """
+
+    # Códigos transitorios. Transfermarkt devuelve 403 cuando limita el ritmo de peticiones.
+    RETRYABLE_STATUSES = frozenset({403, 408, 425, 429, 500, 502, 503, 504})
+
+    def __init__(
+            self,
+            max_attempts: int = 10,
+            base_delay: float = 1.0,
+            max_delay: float = 60.0,
+            retryable_statuses = None,
+            budget: RetryBudget = None,
+            respect_retry_after: bool = True,
+            max_retry_after: float = 300.0
+        ):
+        """
+        Inicializa la política de reintentos.
+
+        Args:
+            max_attempts (int, opcional): Intentos máximos por URL (incluido el primero).
+            base_delay (float, opcional): Espera base en segundos del backoff exponencial.
+            max_delay (float, opcional): Espera máxima del backoff.
+            retryable_statuses (Iterable[int], opcional): Códigos HTTP que se reintentan.
+            budget (RetryBudget, opcional): Presupuesto global de reintentos.
+            respect_retry_after (bool, opcional): Si se usa la cabecera Retry-After del servidor.
+            max_retry_after (float, opcional): Límite superior para la espera indicada en Retry-After.
+        """
+        if max_attempts < 1:
+            raise ValueError("Se necesita al menos un intento.")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable_statuses = frozenset(retryable_statuses) if retryable_statuses is not None else self.RETRYABLE_STATUSES
+        self.budget = budget
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """
+        Indica si un código de estado HTTP merece un reintento.
+
+        Args:
+            status_code (int): Código de estado de la respuesta.
+
+        Return:
+            bool: True si es transitorio, False si es permanente (p. ej. 404 o 410).
+        """
+        return status_code in self.retryable_statuses
+
+
+    def can_retry(self, attempt: int) -> bool:
+        """
+        Indica si se puede lanzar otro intento tras el intento `attempt` (empezando en 0).
+        Si hay presupuesto global, consume un reintento de él.
+
+        Args:
+            attempt (int): Índice del intento que acaba de fallar.
+
+        Return:
+            bool: True si se puede reintentar.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return False
+
+        if self.budget is not None and not self.budget.try_spend():
+            return False
+
+        return True
+
+
+    def get_delay(self, attempt: int, response = None) -> float:
+        """
+        Calcula la espera antes del siguiente intento.
+
+        Args:
+            attempt (int): Índice del intento que acaba de fallar (empezando en 0).
+            response (Response, opcional): Respuesta fallida, para leer Retry-After.
+
+        Return:
+            float: Segundos a esperar.
+        """
+        if self.respect_retry_after and response is not None:
+            retry_after = self.parse_retry_after(response.headers.get("Retry-After"))
+
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+
+        # Backoff exponencial con "full jitter"
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+    @staticmethod
+    def parse_retry_after(value: str) -> float | None:
+        """
+        Convierte el valor de la cabecera Retry-After (segundos o fecha HTTP) a segundos.
+
+        Args:
+            value (str): Valor de la cabecera.
+
+        Return:
+            float | None: Segundos a esperar o None si no es válido.
+        """
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+
+        except (TypeError, ValueError):
+            return None
+
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,189 @@
+import heapq
+import itertools
+from time import time, sleep
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict
+from config.exceptions import logging, HTTPCircuitOpenError
+
+
+@dataclass(order=True)
+class CrawlTask:
+    """
+    Tarea de la frontera del crawl. Se ordena por prioridad y, a igual prioridad, por orden de llegada.
+    """
+    priority: tuple
+    sequence: int
+    func: Callable = field(compare=False)
+    args: tuple = field(default=(), compare=False)
+    kwargs: Dict[str, Any] = field(default_factory=dict, compare=False)
+    name: str = field(default="", compare=False)
+    not_before: float = field(default=0.0, compare=False)
+
+
+class CrawlScheduler:
+    """
+    Planificador del crawl: mantiene la frontera de tareas y las ejecuta por prioridad.
+    Por defecto procesa primero las páginas de región, después las ligas de primer nivel antes
+    que las de niveles inferiores y, dentro de cada nivel, la temporada actual antes que las históricas.
+    RegionManager, LeagueManager y TeamManager envían sus tareas hijas al planificador en lugar de recorrerlas en cascada.
+    """
+
+    # Rango de cada tier de Transfermarkt (menor = más prioritario)
+    DEFAULT_TIER_PRIORITY = {
+        "First Tier": 0,
+        "Second Tier": 1,
+        "Third Tier": 2,
+        "Fourth Tier": 3,
+        "Fifth Tier": 4,
+        "Sixth Tier": 5,
+        "Domestic Cup": 6,
+        "Domestic Super Cup": 7,
+        "Youth league": 8,
+    }
+
+    # Prioridad de las tareas de región (antes que cualquier liga)
+    REGION_PRIORITY = (-1, 0, 0)
+
+    def __init__(self, tier_priority: Dict[str, int] = None, current_season_first: bool = True):
+        """
+        Inicializa el planificador con la frontera vacía.
+
+        Args:
+            tier_priority (dict, opcional): Rango de cada tier; los tiers desconocidos van al final.
+            current_season_first (bool, opcional): Si las temporadas más recientes se procesan antes.
+        """
+        self.tier_priority = self.DEFAULT_TIER_PRIORITY if tier_priority is None else tier_priority
+        self.current_season_first = current_season_first
+        self.queue = []
+        self.parked = []
+        # Tareas finales (p. ej. estadísticas de región): se ejecutan cuando no queda nada más, ni aparcado
+        self.final = []
+        self.counter = itertools.count()
+        self.completed = 0
+        self.failed = 0
+
+
+    def tier_rank(self, tier: str | None) -> int:
+        """
+        Devuelve el rango de un tier.
+
+        Args:
+            tier (str | None): Nombre del tier (p. ej. "First Tier").
+
+        Return:
+            int: Rango del tier; los desconocidos después de todos los configurados.
+        """
+        return self.tier_priority.get(tier, len(self.tier_priority))
+
+
+    def get_priority(self, tier: str | None = None, season: int | None = None, depth: int = 0) -> tuple:
+        """
+        Calcula la prioridad de una tarea de liga, temporada o equipo.
+
+        Args:
+            tier (str | None): Tier de la liga.
+            season (int | None): Temporada; None para la tarea que obtiene la lista de temporadas.
+            depth (int, opcional): Nivel de la tarea (0 liga, 1 temporada, 2 equipo).
+
+        Return:
+            tuple: Prioridad (menor = antes).
+        """
+        if season is None:
+            season_rank = float("-inf")
+
+        else:
+            season_rank = -season if self.current_season_first else season
+
+        return (self.tier_rank(tier), season_rank, depth)
+
+
+    def submit(
+            self,
+            func: Callable,
+            *args,
+            priority: tuple = (),
+            name: str = None,
+            final: bool = False,
+            **kwargs
+
+        ) -> None:
+        """
+        Añade una tarea a la frontera.
+
+        Args:
+            func (Callable): Función a ejecutar.
+            *args: Argumentos posicionales.
+            priority (tuple, opcional): Prioridad de la tarea.
+            name (str, opcional): Nombre descriptivo para los logs.
+            final (bool, opcional): Si la tarea espera a que terminen todas las demás, incluidas las aparcadas.
+            **kwargs: Argumentos con nombre.
+        """
+        task = CrawlTask(
+            priority=priority,
+            sequence=next(self.counter),
+            func=func,
+            args=args,
+            kwargs=kwargs,
+            name=name or getattr(func, "__name__", "task"),
+        )
+
+        if final:
+            self.final.append(task)
+
+        else:
+            heapq.heappush(self.queue, task)
+
+
+    @property
+    def pending(self) -> int:
+        """
+        Número de tareas pendientes (incluidas las aparcadas y las finales).
+        """
+        return len(self.queue) + len(self.parked) + len(self.final)
+
+
+    def release_parked(self) -> None:
+        """
+        Devuelve a la frontera las tareas aparcadas cuyo tiempo de espera ya ha pasado.
+        """
+        now = time()
+        ready = [task for task in self.parked if task.not_before <= now]
+
+        if ready:
+            self.parked = [task for task in self.parked if task.not_before > now]
+            for task in ready:
+                heapq.heappush(self.queue, task)
+
+
+    def run(self) -> None:
+        """
+        Ejecuta las tareas por orden de prioridad hasta vaciar la frontera.
+        Las tareas cuyo host tiene el circuito abierto se aparcan y se reintentan cuando se cierre.
+        Las tareas finales se ejecutan, por orden de llegada, cuando ya no quedan tareas en cola ni aparcadas.
+        """
+        while self.pending:
+            self.release_parked()
+
+            if self.queue:
+                task = heapq.heappop(self.queue)
+
+            elif self.parked:
+                # Solo quedan tareas aparcadas (y finales): esperamos a la primera que esté lista
+                sleep(max(0.0, min(task.not_before for task in self.parked) - time()))
+                continue
+
+            else:
+                task = self.final.pop(0)
+
+            try:
+                task.func(*task.args, **task.kwargs)
+                self.completed += 1
+
+            except HTTPCircuitOpenError as e:
+                logging.warning(f"Tarea '{task.name}' aparcada: circuito abierto para {e.host}.")
+                task.not_before = e.retry_at
+                self.parked.append(task)
+
+            except Exception as e:
+                logging.error(f"Error al ejecutar la tarea '{task.name}': {e}")
+                self.failed += 1
@@ -1,11 +1,15 @@
 import re
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
+from scraping.ws_document import ParsedDocument, ParsedTable
+from scraping.ws_extraction import ExtractionPlan, cell_text, cell_link, cell_int, cell_float, cell_currency
 from scraping.ws_engine import ScrapingEngine
 from scraping.ws_entities import Team, TeamStats, League, Region, Player
 from scraping.ws_players import PlayerManager
 from scraping.ws_dataManager import DataManager
+from config.exceptions import HTTPCircuitOpenError
 from typing import List
 
 
@@ -23,63 +27,42 @@ class TeamManager:
         "transform": lambda x: x
     }
 
+    # Configuración de campos para extraer datos de la tabla. Se compila a un ExtractionPlan por tabla.
     team_field_config = {
         "name": {
             **base_config,
             "key": "name",
-            "transform": lambda x: x.get_text(strip=True) if x else None
+            "transform": cell_text
         },
         "url_team": {
             **base_config,
             "key": "squad",
-            "transform": lambda x: (
-                TeamManager.base_url + x.find("a")["href"] + TeamManager.url_plus
-                if x and x.find("a") and "href" in x.find("a").attrs
-                else None
-            )
+            "transform": cell_link(base_url, url_plus)
         },
         "squad": {
             **base_config,
             "key": "squad",
-            "transform": lambda x: ScrapingEngine.int_validation(
-                x.get_text(strip=True).replace(".", ""),
-                default=0
-                )
-                if x else 0
+            "transform": cell_int(".")
         },
         "avg_age": {
             **base_config,
             "key": "avg_age",
-            "transform": lambda x: ScrapingEngine.float_validation(
-                x.get_text(strip=True)
-                .replace(",", ".")
-                )
-                if x else 0.0
+            "transform": cell_float()
         },
         "foreigners": {
             **base_config,
             "key": "foreigners",
-            "transform": lambda x: ScrapingEngine.int_validation(
-                x.get_text(strip=True).replace(".", ""),
-                default=0
-                )
-                if x else 0.0
+            "transform": cell_int(".")
         },
         "avg_market_value": {
             **base_config,
             "key": "avg_market_value",
-            "transform": lambda x: ScrapingEngine.parse_currency_to_float(
-                x.get_text(strip=True)
-                )
-                if x else 0.0
+            "transform": cell_currency
         },
         "total_market_value": {
             **base_config,
             "key": "total_market_value",
-            "transform": lambda x: ScrapingEngine.parse_currency_to_float(
-                x.get_text(strip=True)
-                )
-                if x else 0.0
+            "transform": cell_currency
         }
     }
 
@@ -109,60 +92,125 @@ class TeamManager:
             team (Team): Instancia del equipo a procesar.
         """
 
+        for player in self.fetch_team_players(team):
+            team.add_player(player)
+
+
+    def fetch_team_players(self, team: Team) -> List[Player]:
+        """
+        Descarga y parsea la plantilla de un equipo sin agregar los jugadores al equipo.
+
+        Args:
+            team (Team): Instancia del equipo.
+
+        Return:
+            List[Player]: Jugadores de la plantilla (vacía si no se pudo obtener).
+        """
         response = self.scraping_engine.http_client.make_request(team.url_team)
         if not response:
             logging.error(f"No se pudo obtener el HTML del equipo: {team.url_team}")
+            return []
+
+        return self.get_players_from_content(team, response.content)
+
+
+    def process_teams_players(self, teams: List[Team], workers: int) -> None:
+        """
+        Procesa las plantillas de varios equipos con un pool de hilos acotado.
+        Las plantillas se descargan y parsean a la vez, pero los jugadores se agregan al terminar
+        y en el orden de `teams`, de modo que el resultado es el mismo que procesándolas una a una.
+
+        Args:
+            teams (List[Team]): Equipos a procesar.
+            workers (int): Número máximo de plantillas simultáneas.
+        """
+        if not teams:
             return
 
-        soup = BeautifulSoup(response.content, "html.parser")
-        table = soup.find("table", {"class": "items"})
-        if not table:
-            logging.warning(f"No se encontró la tabla de jugadores en el equipo: {team.url_team}")
+        with ThreadPoolExecutor(max_workers=min(workers, len(teams)), thread_name_prefix="squad-fetch") as pool:
+            futures = [pool.submit(self.fetch_team_players, team) for team in teams]
+
+        for team, future in zip(teams, futures):
+            try:
+                players = future.result()
+
+            except HTTPCircuitOpenError:
+                # El circuito abierto se propaga como en el procesamiento secuencial
+                raise
+
+            except Exception as e:
+                logging.error(f"Error al procesar la plantilla del equipo {team.url_team}: {e}")
+                continue
+
+            for player in players:
+                team.add_player(player)
+
+
+    async def process_team_players_async(self, team: Team, async_client) -> None:
+        """
+        Versión asíncrona de process_team_players: descarga la plantilla con AsyncHTTPClient.
+
+        Args:
+            team (Team): Instancia del equipo a procesar.
+            async_client (AsyncHTTPClient): Cliente HTTP asíncrono.
+        """
+        try:
+            response = await async_client.make_request(team.url_team)
+
+        except Exception as e:
+            logging.error(f"No se pudo obtener el HTML del equipo: {team.url_team}. \nDetalle: {e}")
             return
 
-        players = self.player_manager.get_player_data(
-            table,
-            min_columns=5,
-            fk_region=team.fk_region,
-            fk_league=team.fk_league,
-            team=team,
-        )
+        self.add_players_from_content(team, response.content)
+
 
-        for player in players:
+    def add_players_from_content(self, team: Team, content: bytes) -> None:
+        """
+        Parsea el HTML de la plantilla de un equipo y agrega sus jugadores.
+
+        Args:
+            team (Team): Instancia del equipo.
+            content (bytes): Contenido HTML de la página de la plantilla.
+        """
+        for player in self.get_players_from_content(team, content):
             team.add_player(player)
 
 
-    def extract_cell_value(
-            self,
-            headers,
-            col,
-            key,
-            offset: int = 1,
-            default=None,
-            transform=lambda x: x
-        ):
+    def get_players_from_content(self, team: Team, content: bytes) -> List[Player]:
         """
-        Extrae y transforma el valor de una celda de la tabla según la configuración.
+        Parsea el HTML de la plantilla de un equipo y devuelve sus jugadores.
 
         Args:
-            headers (dict): Diccionario de encabezados de la tabla.
-            col (list): Lista de celdas de la fila.
-            key (str): Clave del encabezado.
-            offset (int): Desplazamiento para la columna.
-            default: Valor por defecto si falla la extracción.
-            transform (callable): Función de transformación para el valor.
+            team (Team): Instancia del equipo.
+            content (bytes): Contenido HTML de la página de la plantilla.
 
         Return:
-            Valor extraído y transformado, o el valor por defecto.
+            List[Player]: Jugadores de la plantilla (vacía si no se encontró la tabla).
         """
+        # Camino rápido (opcional): extracción de los bytes sin construir el DOM
+        players = self.player_manager.get_player_data_from_content(
+            content,
+            min_columns=5,
+            fk_region=team.fk_region,
+            fk_league=team.fk_league,
+            team=team,
+        )
 
-        try:
-            cell = col[headers[key] + offset] if headers.get(key) is not None else None
-            return transform(cell) if cell else default
+        if players is None:
+            table = ParsedDocument.parse(content, targets=("items",)).table
+            if not table:
+                logging.warning(f"No se encontró la tabla de jugadores en el equipo: {team.url_team}")
+                return []
+
+            players = self.player_manager.get_player_data(
+                table,
+                min_columns=5,
+                fk_region=team.fk_region,
+                fk_league=team.fk_league,
+                team=team,
+            )
 
-        except (IndexError, AttributeError) as e:
-            logging.warning(f"Error al extraer el valor de la celda: {e}")
-            return default
+        return players
 
 
     def get_team_data(
@@ -186,35 +234,31 @@ class TeamManager:
             List[Team]: Lista de objetos Team extraídos de la tabla.
         """
 
+        table = ParsedTable.of(table)
         headers = self.scraping_engine.get_table_headers(table)
         if not headers:
             logging.error("No se encontraron encabezados en la tabla.")
             return []
 
-        rows = table.find("tbody").find_all("tr")
+        rows = table.rows
         if not rows:
             logging.warning("No se encontraron filas en la tabla.")
             return []
 
-        teams = []
-        for row in rows:
-            col = row.find_all("td")
-            if not col or len(col) < min_columns:
-                continue
+        # Plan de extracción compilado una vez por estructura de encabezados (compartido entre tablas idénticas)
+        plan = self.scraping_engine.get_table_plan(
+            table, "team",
+            lambda headers: ExtractionPlan.compile(headers, self.team_field_config)
+        )
 
-            try:
-                extracted_values = {
-                    field: self.extract_cell_value(
-                        headers=headers,
-                        col=col,
-                        key=config["key"],
-                        offset=config.get("offset", 0),
-                        default=config.get("default", None),
-                        transform=config["transform"]
-                    )
-                    for field, config in self.team_field_config.items()
-                }
+        # Valores de las filas (de la caché de parseo si la tabla no ha cambiado)
+        records = self.scraping_engine.get_table_records(
+            "team", table, min_columns, lambda: plan.extract_rows(table.cells, min_columns)
+        )
 
+        teams = []
+        for extracted_values in records:
+            try:
                 # Propagar valores desde la liga
                 extracted_values["fk_region"] = region.id_region
                 extracted_values["fk_league"] = league.id_league
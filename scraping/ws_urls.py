@@ -2,6 +2,8 @@ from scraping.ws_httpClient import HTTPClient
 from scraping.ws_engine import ScrapingEngine
 from config.exceptions import logging, HTTPClientError
 from bs4 import BeautifulSoup
+from scraping.ws_parser import parse_html
+from scraping.ws_document import ParsedDocument
 import validators
 
 
@@ -48,21 +50,28 @@ class TransfermarktURLManager(URLManager):
     Gestor especializado para las URLs de Transfermarkt.
     Genera y valida URLs para regiones, maneja paginación y encabezados de tablas.
     """
-    def __init__(self, http_client: HTTPClient, scraping_engine: ScrapingEngine):
+    BASE_URL = "https://www.transfermarkt.com/wettbewerbe/{region}/wettbewerbe?ajax=yw1&plus=22&page={page}"
+    REGIONS = {
+        "EUR1": "europa",
+        "AME1": "amerika",
+        "ASI1": "asien",
+        "AFR1": "afrika",
+    }
+
+    def __init__(self, http_client: HTTPClient, scraping_engine: ScrapingEngine, regions: list = None):
         """
         Inicializa el TransfermarktURLManager con cliente HTTP y motor de scraping.
 
         Args:
             http_client (HTTPClient): Cliente HTTP para las peticiones web.
             scraping_engine (ScrapingEngine): Motor de scraping.
+            regions (list, opcional): Claves de las regiones a inicializar (por defecto, todas).
         """
         super().__init__(http_client, scraping_engine)
-        self.base_url = "https://www.transfermarkt.com/wettbewerbe/{region}/wettbewerbe?ajax=yw1&plus=22&page={page}"
+        self.base_url = self.BASE_URL
         self.regions = {
-            "EUR1": "europa",
-            "AME1": "amerika",
-            "ASI1": "asien",
-            "AFR1": "afrika",
+            key: region for key, region in self.REGIONS.items()
+            if regions is None or key in regions
         }
         self.initialize_urls()
 
@@ -75,7 +84,7 @@ class TransfermarktURLManager(URLManager):
         for key, region in self.regions.items():
             region_name = self.format_region_name(region)
             url_region = self.build_url(region, page=1)
-            response = self.fetch_html(url_region)
+            response = self.fetch_html(url_region, targets=("items", "pagination"))
 
             if not response:
                 self.handle_failed_region(key)
@@ -111,12 +120,13 @@ class TransfermarktURLManager(URLManager):
         return self.base_url.format(region=region, page=page)
 
 
-    def fetch_html(self, url: str) -> BeautifulSoup:
+    def fetch_html(self, url: str, targets: tuple = None) -> BeautifulSoup:
         """
         Realiza una petición HTTP y devuelve el HTML parseado con BeautifulSoup.
 
         Args:
             url (str): URL a solicitar.
+            targets (tuple, opcional): Nodos a materializar (parseo parcial), p. ej. ("items", "pagination").
 
         Return:
             BeautifulSoup | None: Objeto BeautifulSoup o None si falla.
@@ -126,7 +136,7 @@ class TransfermarktURLManager(URLManager):
             logging.warning(f"No se pudo obtener el HTML de la URL: {url}")
             return None
 
-        return BeautifulSoup(response.content, "html.parser")
+        return parse_html(response.content, targets=targets)
 
 
     def region_warnings(self, key: str):
@@ -157,8 +167,9 @@ class TransfermarktURLManager(URLManager):
             region_name (str): Nombre formateado de la región.
             html (BeautifulSoup): HTML de la página de la región.
         """
-        table_header = self.extract_table_header(html)
-        end_page = self.extract_total_pages(html, region)
+        document = ParsedDocument.of(html)
+        table_header = self.extract_table_header(document)
+        end_page = self.extract_total_pages(document, region)
         urls = self.generate_urls(region, end_page)
 
         self.urls[key] = {
@@ -181,7 +192,7 @@ class TransfermarktURLManager(URLManager):
         Return:
             dict | None: Diccionario de encabezados o None si no se encuentra la tabla.
         """
-        table = html.find("table", {"class": "items"})
+        table = ParsedDocument.of(html).table
         if not table:
             logging.warning("No se encontró ninguna tabla en la página.")
             return None
@@ -200,7 +211,7 @@ class TransfermarktURLManager(URLManager):
         Return:
             int: Número total de páginas.
         """
-        return self.scraping_engine.get_total_pages(self.build_url(region, page=1))
+        return self.scraping_engine.parse_total_pages(html, self.build_url(region, page=1))
 
 
     def generate_urls(self, region: str, end_page: int) -> list:
@@ -0,0 +1,156 @@
+import re
+import logging
+from datetime import date, datetime
+from functools import lru_cache
+
+# Tamaño máximo de cada caché de valores (fechas, alturas y monedas)
+CACHE_SIZE = 4096
+
+# Patrones precompilados
+DATE_PATTERN = re.compile(r"([A-Za-z]+\s\d{1,2},\s\d{4})|(\d{1,2}\s[A-Za-z]+\s\d{4})")
+US_DATE_PATTERN = re.compile(r"([A-Za-z]{3}) (\d{1,2}), (\d{4})")
+EU_DATE_PATTERN = re.compile(r"(\d{1,2}) ([A-Za-z]{3}) (\d{4})")
+ISO_DATE_PATTERN = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+HEIGHT_PATTERN = re.compile(r"(\d{1,2},\d{1,2})\s*m")
+IMG_ID_PATTERN = re.compile(r"verysmall/(\d+)")
+PLAYER_ID_PATTERN = re.compile(r"spieler/(\d+)")
+PORTRAIT_ID_PATTERN = re.compile(r"/medium/(\d+-\d+)")
+
+# Formatos aceptados por `parse_date_string` (en el orden en que se prueban)
+DATE_FORMATS = ("%b %d, %Y", "%d %b %Y", "%Y-%m-%d")
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+# Sufijos de moneda de Transfermarkt y su multiplicador
+CURRENCY_MULTIPLIERS = (("bn", 1e9), ("m", 1e6), ("k", 1e3))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_date_string(date_str: str) -> date | None:
+    """
+    Convierte una fecha de Transfermarkt ("Jan 5, 2024", "5 Jan 2024" o "2024-01-05") a date.
+    Los formatos habituales se resuelven con un patrón precompilado; el resto se delega en strptime.
+
+    Args:
+        date_str (str): Fecha en formato string.
+
+    Return:
+        date | None: Fecha o None si no se reconoce.
+    """
+    try:
+        match = US_DATE_PATTERN.fullmatch(date_str)
+        if match and match.group(1).lower() in MONTHS:
+            return date(int(match.group(3)), MONTHS[match.group(1).lower()], int(match.group(2)))
+
+        match = EU_DATE_PATTERN.fullmatch(date_str)
+        if match and match.group(2).lower() in MONTHS:
+            return date(int(match.group(3)), MONTHS[match.group(2).lower()], int(match.group(1)))
+
+        match = ISO_DATE_PATTERN.fullmatch(date_str)
+        if match:
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+
+    except ValueError:
+        # Fecha imposible (p. ej. 30 de febrero): strptime decidirá igual que antes
+        pass
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+
+        except ValueError:
+            continue
+
+    return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_date(text: str) -> date | None:
+    """
+    Extrae la fecha de un texto de celda (p. ej. "Jan 5, 2000 (24)") y la convierte a date.
+
+    Args:
+        text (str): Texto de la celda.
+
+    Return:
+        date | None: Fecha o None si el texto no contiene una fecha.
+    """
+    # Extraemos solo la fecha antes del paréntesis
+    match = DATE_PATTERN.search(text)
+    return parse_date_string(match.group(0)) if match else None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_height(text: str) -> float:
+    """
+    Convierte la altura de un jugador ("1,85m") a metros.
+
+    Args:
+        text (str): Texto de la celda.
+
+    Return:
+        float: Altura en metros o 0.0 si no se reconoce.
+    """
+    match = HEIGHT_PATTERN.search(text)
+    if not match:
+        return 0.0
+
+    try:
+        return float(match.group(1).replace(",", "."))
+
+    except ValueError:
+        return 0.0
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_currency(value: str) -> float:
+    """
+    Convierte un valor de moneda de Transfermarkt ("€1.50m", "€800k", "€1.20bn", "-") a float.
+
+    Args:
+        value (str): Valor de moneda a convertir.
+
+    Return:
+        float: Valor numérico o 0.0 si no se reconoce.
+    """
+    text = value.replace("€", "").replace(" ", "").strip().lower()
+    if text == "-":
+        return 0.0
+
+    multiplier = 1
+    for suffix, factor in CURRENCY_MULTIPLIERS:
+        if text.endswith(suffix):
+            text = text.replace(suffix, "")
+            multiplier = factor
+            break
+
+    try:
+        return float(text.replace(".", "").replace(",", ".")) * multiplier
+
+    except ValueError:
+        logging.warning(f"No se pudo convertir el valor: {text}")
+        return 0.0
+
+
+def cache_stats() -> dict:
+    """
+    Devuelve los aciertos y fallos de cada caché de valores.
+
+    Return:
+        dict: Estadísticas de `lru_cache` por función.
+    """
+    return {
+        func.__name__: func.cache_info()._asdict()
+        for func in (parse_date_string, parse_date, parse_height, parse_currency)
+    }
+
+
+def clear_caches() -> None:
+    """
+    Vacía las cachés de valores.
+    """
+    for func in (parse_date_string, parse_date, parse_height, parse_currency):
+        func.cache_clear()